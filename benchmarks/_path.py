@@ -0,0 +1,12 @@
+"""
+Puts the repository root on sys.path, so the benchmarks import the roblox_studio package next to them without it
+being installed. Each benchmark imports this before roblox_studio, and is run directly, like
+"python benchmarks/dump_parse.py".
+"""
+
+import sys
+from pathlib import Path
+
+root_path = str(Path(__file__).resolve().parent.parent)
+if root_path not in sys.path:
+    sys.path.insert(0, root_path)
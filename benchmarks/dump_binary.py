@@ -0,0 +1,78 @@
+"""
+Compares the size and load time of a synthetic API dump stored as JSON, as a pickle and in the compact binary format,
+and checks that the binary format round-trips.
+"""
+
+import gzip
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import orjson
+
+import _path  # noqa: F401 (puts the repository root on sys.path)
+
+from roblox_studio.dump import APIDump, construct_api_dump
+from roblox_studio.dump_binary import BinaryAPIDump, decode_api_dump, encode_api_dump
+from roblox_studio.utilities import paused_gc
+
+from dump_data import generate_dump
+
+
+def decode_paused(dump_binary: bytes):
+    with paused_gc():
+        return decode_api_dump(dump_binary)
+
+
+def time_function(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    dump_json = orjson.dumps(generate_dump())
+    dump = APIDump(**orjson.loads(dump_json))
+    dump_pickle = pickle.dumps(dump, protocol=pickle.HIGHEST_PROTOCOL)
+    dump_binary, encode_time = time_function(lambda: encode_api_dump(dump))
+
+    assert decode_api_dump(dump_binary) == dump
+    assert encode_api_dump(decode_api_dump(dump_binary)) == dump_binary
+
+    print("Size:")
+    for name, data in [("JSON", dump_json), ("Pickle", dump_pickle), ("Binary", dump_binary)]:
+        print(f"  {name:<7} {len(data) / 1024:>8.1f} KiB, gzipped {len(gzip.compress(data)) / 1024:>7.1f} KiB")
+
+    print(f"Encode binary: {encode_time:.3f}s")
+    print("Load:")
+    for name, function in [
+        ("JSON, validated", lambda: APIDump(**orjson.loads(dump_json))),
+        ("JSON, without validation", lambda: construct_api_dump(orjson.loads(dump_json))),
+        ("Pickle", lambda: pickle.loads(dump_pickle)),
+        ("Binary", lambda: decode_api_dump(dump_binary)),
+        ("Binary, GC paused", lambda: decode_paused(dump_binary))
+    ]:
+        _, elapsed = time_function(function)
+        print(f"  {name:<25} {elapsed:.3f}s")
+
+    file_descriptor, path = tempfile.mkstemp(suffix=".rbxd")
+    path = Path(path)
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(dump_binary)
+
+        def load_one_class():
+            with BinaryAPIDump.from_file(path) as binary_dump:
+                return binary_dump.get_class(dump.classes[len(dump.classes) // 2].name)
+
+        dump_class, elapsed = time_function(load_one_class)
+        assert dump_class == dump.classes[len(dump.classes) // 2]
+        print(f"  {'Binary, one class (mmap)':<25} {elapsed * 1000:.2f}ms")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Generates synthetic API dumps for the dump benchmarks. The dumps have the shape of real ones, but random contents.
+"""
+
+import random
+
+security_level_names = ["None", "PluginSecurity", "RobloxScriptSecurity", "LocalUserSecurity"]
+thread_safety_names = ["ReadSafe", "Unsafe", "Safe"]
+value_types = [
+    ("Primitive", "bool"),
+    ("Primitive", "float"),
+    ("Primitive", "string"),
+    ("DataType", "Vector3"),
+    ("Class", "Instance"),
+    ("Enum", "Material")
+]
+member_type_names = ["Property", "Function", "Event", "Callback"]
+
+
+def generate_member(rng: random.Random, name: str) -> dict:
+    member_type = rng.choice(member_type_names)
+
+    if member_type == "Property":
+        category, value_type_name = rng.choice(value_types)
+        return {
+            "MemberType": "Property",
+            "Name": name,
+            "Category": "Data",
+            "Security": {
+                "Read": rng.choice(security_level_names),
+                "Write": rng.choice(security_level_names)
+            },
+            "Serialization": {
+                "CanLoad": True,
+                "CanSave": rng.random() < 0.5
+            },
+            "ThreadSafety": rng.choice(thread_safety_names),
+            "ValueType": {
+                "Category": category,
+                "Name": value_type_name
+            }
+        }
+
+    member = {
+        "MemberType": member_type,
+        "Name": name,
+        "Parameters": [
+            {
+                "Name": f"argument{index}",
+                "Type": {
+                    "Category": "Primitive",
+                    "Name": "int"
+                }
+            }
+            for index in range(rng.randint(0, 3))
+        ],
+        "Security": rng.choice(security_level_names),
+        "ThreadSafety": rng.choice(thread_safety_names)
+    }
+    if member_type in {"Function", "Callback"}:
+        member["ReturnType"] = {
+            "Category": "Primitive",
+            "Name": "void"
+        }
+    return member
+
+
+def generate_dump(class_count: int = 800, enum_count: int = 300, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+
+    classes = []
+    for index in range(class_count):
+        if index == 0:
+            name, superclass = "Instance", "<<<ROOT>>>"
+        else:
+            superclass_index = rng.randrange(index)
+            name, superclass = f"Class{index}", f"Class{superclass_index}" if superclass_index else "Instance"
+
+        dump_class = {
+            "Members": [generate_member(rng, f"Member{member_index}") for member_index in range(rng.randint(5, 40))],
+            "Superclass": superclass,
+            "Name": name,
+            "MemoryCategory": "Instances"
+        }
+        if rng.random() < 0.3:
+            dump_class["Tags"] = ["NotCreatable"]
+        classes.append(dump_class)
+
+    enums = [
+        {
+            "Name": f"Enum{index}",
+            "Items": [{"Name": f"Item{item_index}", "Value": item_index} for item_index in range(rng.randint(2, 20))]
+        }
+        for index in range(enum_count)
+    ]
+
+    return {
+        "Classes": classes,
+        "Enums": enums,
+        "Version": 1
+    }
@@ -0,0 +1,50 @@
+"""
+Compares parsing a synthetic API dump with validation, without validation, and lazily without validation, along with
+the time it takes to then look at a handful of classes' members.
+"""
+
+import time
+
+import orjson
+
+import _path  # noqa: F401 (puts the repository root on sys.path)
+
+from roblox_studio.dump import APIDump, construct_api_dump
+from roblox_studio.utilities import paused_gc
+
+from dump_data import generate_dump
+
+touched_class_count = 10
+
+
+def time_parse(name: str, function, dump_json: bytes):
+    data = orjson.loads(dump_json)
+    start = time.perf_counter()
+    dump = function(data)
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for dump_class in dump.classes[:touched_class_count]:
+        for member in dump_class.members:
+            member.name
+    touch_time = time.perf_counter() - start
+
+    print(f"{name:<31} parse {parse_time:.3f}s, touch {touched_class_count} classes {touch_time:.4f}s")
+    return dump
+
+
+def main():
+    dump_json = orjson.dumps(generate_dump())
+    print(f"Dump of {len(dump_json) / 1024 / 1024:.1f} MiB")
+
+    validated_dump = time_parse("Validated", lambda data: APIDump(**data), dump_json)
+    constructed_dump = time_parse("Without validation", construct_api_dump, dump_json)
+    lazy_dump = time_parse("Lazy", lambda data: construct_api_dump(data, lazy=True), dump_json)
+    with paused_gc():
+        paused_dump = time_parse("Without validation, GC paused", construct_api_dump, dump_json)
+
+    assert validated_dump == constructed_dump == lazy_dump == paused_dump
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares the peak memory and time of parsing a synthetic API dump file all at once against streaming it one class or
+enum at a time, when all that's kept is the names of the classes that have tags.
+"""
+
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import orjson
+
+import _path  # noqa: F401 (puts the repository root on sys.path)
+
+from roblox_studio.dump import APIDump, APIDumpClass
+from roblox_studio.dump_stream import iter_api_dump_file
+
+from dump_data import generate_dump
+
+
+def parse_all_at_once(path: Path):
+    with open(path, "rb") as file:
+        dump = APIDump(**orjson.loads(file.read()))
+    return [dump_class.name for dump_class in dump.classes if dump_class.tags]
+
+
+def parse_streaming(path: Path):
+    return [item.name for item in iter_api_dump_file(path) if isinstance(item, APIDumpClass) and item.tags]
+
+
+def measure(function, path: Path):
+    start = time.perf_counter()
+    result = function(path)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    function(path)
+    _, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed, peak_size
+
+
+def main():
+    file_descriptor, path = tempfile.mkstemp(suffix=".json")
+    path = Path(path)
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(orjson.dumps(generate_dump()))
+        print(f"Dump of {path.stat().st_size / 1024 / 1024:.1f} MiB")
+
+        all_at_once_names, all_at_once_time, all_at_once_peak = measure(parse_all_at_once, path)
+        streaming_names, streaming_time, streaming_peak = measure(parse_streaming, path)
+        assert all_at_once_names == streaming_names
+
+        print(f"All at once: {all_at_once_time:.3f}s, peak {all_at_once_peak / 1024 / 1024:.1f} MiB")
+        print(f"Streaming:   {streaming_time:.3f}s, peak {streaming_peak / 1024 / 1024:.1f} MiB "
+              f"({all_at_once_peak / streaming_peak:.1f}x smaller)")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
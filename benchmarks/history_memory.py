@@ -0,0 +1,56 @@
+"""
+Compares the memory used by a deployment history held as a list of objects against the same history held as a
+DeploymentTable, on a synthetic history of 100,000 lines.
+"""
+
+import gc
+import tracemalloc
+
+import _path  # noqa: F401 (puts the repository root on sys.path)
+
+from roblox_studio.branches import RobloxBranch
+from roblox_studio.deployments import DeploymentHistory, OperatingSystem
+
+from history_parse import generate_history_lines, line_count
+
+
+def measure(function):
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    history_data = "\r\n".join(f"{line} ... Done!" for line in generate_history_lines(line_count))
+
+    def make_history():
+        return DeploymentHistory(
+            client=None,
+            branch=RobloxBranch.production,
+            operating_system=OperatingSystem.windows,
+            history_data=history_data
+        )
+
+    history, history_size = measure(make_history)
+    table, table_size = measure(history.to_table)
+    lazy_history, lazy_size = measure(lambda: DeploymentHistory(
+        client=None,
+        branch=RobloxBranch.production,
+        operating_system=OperatingSystem.windows,
+        history_data=history_data,
+        lazy=True
+    ))
+
+    print(f"Entries: {len(history.history)}")
+    print(f"DeploymentHistory.history: {history_size / 1024 / 1024:.1f} MiB")
+    print(f"DeploymentTable:           {table_size / 1024 / 1024:.1f} MiB "
+          f"({history_size / table_size:.1f}x smaller)")
+    print(f"Lazy DeploymentHistory:    {lazy_size / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
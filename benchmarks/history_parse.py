@@ -0,0 +1,96 @@
+"""
+Compares the single-pass deployment history parser against a reference parser, on a synthetic history of 100,000
+lines. The reference parser is defined here and works the way "New" lines were parsed before the single-pass parser
+was added: a regex search picked by the line's contents, then dateutil for the timestamp. The two are checked to
+give the same results before they are timed.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from dateutil.parser import parse
+
+import _path  # noqa: F401 (puts the repository root on sys.path)
+
+from roblox_studio.branches import RobloxBranch
+from roblox_studio.deployments import DeploymentHistory, OperatingSystem, fallback_pattern, file_version_pattern, \
+    git_hash_pattern, parse_deployment_line
+
+line_count = 100_000
+deployment_type_names = ["Studio", "Studio64", "Client", "WindowsPlayer", "RccService"]
+
+
+def generate_history_lines(count: int):
+    rng = random.Random(0)
+    timestamp = datetime(2012, 1, 1)
+    lines = []
+    for index in range(count):
+        timestamp += timedelta(seconds=rng.randint(1, 3600))
+        hour = timestamp.hour % 12 or 12
+        meridiem = "AM" if timestamp.hour < 12 else "PM"
+        lines.append(
+            f"New {rng.choice(deployment_type_names)} version-{index:016x} at "
+            f"{timestamp.month}/{timestamp.day}/{timestamp.year} {hour}:{timestamp.minute:02}:{timestamp.second:02} "
+            f"{meridiem}, file version: 0, {index // 1000}, 0, {index}, git hash: {rng.getrandbits(40):010x}"
+        )
+    return lines
+
+
+def reference_parse_deployment_line(history_line: str):
+    version_string = ""
+    version_number = None
+    git_hash = None
+
+    if "git hash" in history_line:
+        match = git_hash_pattern.search(history_line)
+        version_string = match.group(5).strip()
+        git_hash = match.group(6)
+    elif "file version" in history_line or "file verion" in history_line:
+        match = file_version_pattern.search(history_line)
+        version_string = match.group(5).strip()
+    else:
+        match = fallback_pattern.search(history_line)
+
+    if version_string:
+        version_number = tuple(int(piece.strip()) for piece in version_string.split(","))
+        if version_number[0] >= 2000:
+            version_number = None
+
+    timestamp = parse(f"{match.group(3)} {match.group(4)}")
+    return match.group(1), match.group(2), timestamp, version_number, git_hash
+
+
+def time_function(function, lines):
+    start = time.perf_counter()
+    for line in lines:
+        function(line)
+    return time.perf_counter() - start
+
+
+def main():
+    lines = generate_history_lines(line_count)
+
+    for line in lines[:1000]:
+        _, *reference_fields = reference_parse_deployment_line(line)
+        _, *fields = parse_deployment_line(line)
+        assert fields == reference_fields, line
+
+    slow_time = time_function(reference_parse_deployment_line, lines)
+    fast_time = time_function(parse_deployment_line, lines)
+    print(f"Regex + dateutil parser: {slow_time:.3f}s")
+    print(f"Single-pass parser:      {fast_time:.3f}s ({slow_time / fast_time:.1f}x faster)")
+
+    history_data = "\r\n".join(f"{line} ... Done!" for line in lines)
+    start = time.perf_counter()
+    history = DeploymentHistory(
+        client=None,
+        branch=RobloxBranch.production,
+        operating_system=OperatingSystem.windows,
+        history_data=history_data
+    )
+    print(f"DeploymentHistory of {len(history.history)} entries: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import asyncio
+from pathlib import Path
+
+from roblox_studio.api_history import APIHistoryIndex, get_member_symbol
+from roblox_studio.branches import RobloxBranch
+from roblox_studio.deployments import DeploymentClient, DeploymentType, OperatingSystem
+from roblox_studio.dump_cache import APIDumpCache
+
+index_path = Path("api_history.json")
+
+
+async def main():
+    if index_path.exists():
+        index = APIHistoryIndex.load(index_path)
+    else:
+        index = APIHistoryIndex(DeploymentType.studio_64)
+
+    async with DeploymentClient() as deployment_client:
+        history = await deployment_client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+        added_versions = await index.update(history, cache=APIDumpCache(Path("dumps")), concurrency=4)
+        print(f"Indexed {len(added_versions)} new versions")
+
+    index.save(index_path)
+
+    symbol = get_member_symbol("Workspace", "StreamingEnabled")
+    for version_range in index.get_ranges(symbol):
+        print(f"{symbol} existed from {version_range.first.version_hash} ({version_range.first.timestamp})")
+        if version_range.removed_in:
+            print(f"\tuntil {version_range.removed_in.version_hash} ({version_range.removed_in.timestamp})")
+
+
+asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,31 @@
+from typing import Optional
+from pathlib import Path
+import os
+
+from roblox_studio import StudioClient
+from roblox_studio.rbxm import RbxmIndex
+
+
+def main():
+    studio_client = StudioClient()
+
+    version_path: Optional[Path] = None
+    if os.name == "nt":
+        version_path = Path(os.getenv("LocalAppData")) / "Roblox" / "Versions" / "version-HASH"
+    elif os.name == "posix":
+        version_path = Path("/Applications/RobloxStudio.app")
+
+    studio_version = studio_client.get_version(version_path)
+    plugin_index = RbxmIndex(cache_path=Path("plugins.json"))
+
+    for plugin in studio_version.get_built_in_plugins(plugin_index):
+        if not plugin.is_binary:
+            print(f"{plugin.path.name}: XML model")
+            continue
+        chunk_counts = plugin.get_chunk_counts()
+        print(f"{plugin.path.name}: {plugin.instance_count} instances of {plugin.class_count} classes, "
+              f"{chunk_counts.get('PROP', 0)} property chunks, {plugin.size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import asyncio
+
+from roblox_studio.deployments import DeploymentClient, DeploymentType
+
+
+async def main():
+    async with DeploymentClient() as deployment_client:
+        async for branch, operating_system, deployments in deployment_client.iter_all_deployments(concurrency=4):
+            deployment = deployments.get_latest_deployment(DeploymentType.studio_64)
+            print(f"{branch.value} ({operating_system.value})")
+            if deployment:
+                print(f"\tVersion: {deployment.version_hash}")
+                print(f"\tTimestamp: {deployment.timestamp}")
+
+
+asyncio.get_event_loop().run_until_complete(main())
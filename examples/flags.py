@@ -15,9 +15,7 @@ def main():
         version_path = Path("/Applications/RobloxStudio.app")
 
     studio_version = studio_client.get_version(version_path)
-    fflag_overrides = studio_version.get_fflag_overrides()
-    fflag_overrides["FFlagDebugDisplayFPS"] = True
-    studio_version.set_fflag_overrides(fflag_overrides)
+    studio_version.patch_fflag_overrides({"FFlagDebugDisplayFPS": True})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+import asyncio
+import os
+from pathlib import Path
+from typing import Optional
+
+from roblox_studio import StudioClient
+from roblox_studio.processes import StudioProcessManager
+
+
+async def main():
+    studio_client = StudioClient()
+
+    version_path: Optional[Path] = None
+    if os.name == "nt":
+        version_path = Path(os.getenv("LocalAppData")) / "Roblox" / "Versions" / "version-HASH"
+    elif os.name == "posix":
+        version_path = Path("/Applications/RobloxStudio.app")
+
+    studio_version = studio_client.get_version(version_path)
+
+    async with StudioProcessManager(timeout=60) as process_manager:
+        process = await process_manager.launch(studio_version, disable_user_plugins=True)
+        print(f"🚀 Launched Roblox Studio with process ID {process.pid}")
+
+        async for line in process.iter_output():
+            print(f"[{line.stream.value}] {line.text}")
+
+        print(f"Studio closed with exit code {process.return_code} after {process.run_time:.1f}s.")
+        if process.peak_memory is not None:
+            print(f"Peak memory: {process.peak_memory / 1024 / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,27 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from roblox_studio import StudioClient
+from roblox_studio.logs import LogIndex, LogTailer
+
+
+async def main():
+    studio_client = StudioClient()
+
+    with LogIndex(Path("logs.sqlite3")) as log_index:
+        indexed_count = log_index.update(studio_client.logs_folder_path)
+        print(f"Indexed {indexed_count} log files")
+
+        print("Errors from the last day:")
+        start = datetime.now(timezone.utc) - timedelta(days=1)
+        for record in log_index.search(start=start, channels=["FLog::Error"], limit=20):
+            print(f"\t{record.timestamp} {record.message}")
+
+    print("Following new log output...")
+    log_tailer = LogTailer(studio_client.logs_folder_path, start_at_end=True)
+    async for record in log_tailer.follow():
+        print(f"[{record.channel}] {record.message}")
+
+
+asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+import orjson
+from aiohttp import ClientResponseError
+
+from .deployments import Deployment, DeploymentHistory, DeploymentType
+from .dump import APIDump
+from .dump_cache import APIDumpCache
+from .utilities import write_file_atomic
+
+_format_version = 1
+
+# statuses the CDN answers with for deployments that never had an API dump
+_missing_dump_statuses = {403, 404}
+
+
+def get_member_symbol(class_name: str, member_name: str) -> str:
+    return f"{class_name}.{member_name}"
+
+
+def get_enum_symbol(enum_name: str) -> str:
+    return f"Enum.{enum_name}"
+
+
+def get_enum_item_symbol(enum_name: str, item_name: str) -> str:
+    return f"Enum.{enum_name}.{item_name}"
+
+
+def _iter_symbols(dump: APIDump) -> Iterator[str]:
+    for dump_class in dump.classes:
+        yield dump_class.name
+        for member in dump_class.members:
+            yield get_member_symbol(dump_class.name, member.name)
+    for dump_enum in dump.enums:
+        yield get_enum_symbol(dump_enum.name)
+        for item in dump_enum.items:
+            yield get_enum_item_symbol(dump_enum.name, item.name)
+
+
+class APIHistoryVersion:
+    __slots__ = ("version_hash", "timestamp")
+
+    def __init__(self, version_hash: str, timestamp: datetime):
+        self.version_hash: str = version_hash
+        self.timestamp: datetime = timestamp
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.version_hash} at {self.timestamp}>"
+
+
+class APIHistoryRange:
+    """
+    A run of consecutive indexed versions that something existed in.
+    """
+
+    def __init__(self, first: APIHistoryVersion, last: APIHistoryVersion, removed_in: Optional[APIHistoryVersion]):
+        """
+        Arguments:
+            first: The first version it existed in.
+            last: The last version it existed in.
+            removed_in: The version after last, which it didn't exist in, or None if last is the latest indexed version.
+        """
+        self.first: APIHistoryVersion = first
+        self.last: APIHistoryVersion = last
+        self.removed_in: Optional[APIHistoryVersion] = removed_in
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.first.version_hash} to {self.last.version_hash}>"
+
+
+class APIHistoryIndex:
+    """
+    Records which versions of a deployment type each class, member, enum and enum item existed in.
+    Things are identified by symbols: "Workspace" for a class, "Workspace.StreamingEnabled" for a member,
+    "Enum.Material" for an enum and "Enum.Material.Plastic" for an enum item. The get_*_symbol functions in this module
+    build them.
+    Versions must be added in the order they were deployed.
+    """
+
+    def __init__(self, deployment_type: DeploymentType):
+        self.deployment_type: DeploymentType = deployment_type
+        self.versions: List[APIHistoryVersion] = []
+
+        self._version_positions: Dict[str, int] = {}
+        # version hashes of deployments that have no API dump, so they aren't requested again
+        self._skipped_version_hashes: Set[str] = set()
+        # the positions in self.versions where each symbol existed, as flat [start, end, start, end, ...] lists where
+        # each end is exclusive
+        self._ranges: Dict[str, List[int]] = {}
+
+    def add_dump(self, version_hash: str, timestamp: datetime, dump: APIDump) -> APIHistoryVersion:
+        """
+        Adds the next version to the index.
+        """
+        if version_hash in self._version_positions:
+            raise ValueError(f"{version_hash} is already in the index")
+
+        position = len(self.versions)
+        version = APIHistoryVersion(version_hash=version_hash, timestamp=timestamp)
+        self.versions.append(version)
+        self._version_positions[version_hash] = position
+
+        for symbol in _iter_symbols(dump):
+            ranges = self._ranges.get(symbol)
+            if ranges is None:
+                self._ranges[symbol] = [position, position + 1]
+            elif ranges[-1] == position:
+                ranges[-1] = position + 1
+            elif ranges[-1] < position:
+                ranges += (position, position + 1)
+
+        return version
+
+    def is_known(self, version_hash: str) -> bool:
+        """
+        Checks whether a version hash has been indexed or skipped because it has no API dump.
+        """
+        return version_hash in self._version_positions or version_hash in self._skipped_version_hashes
+
+    async def update(
+            self,
+            history: DeploymentHistory,
+            cache: Optional[APIDumpCache] = None,
+            concurrency: int = 4
+    ) -> List[APIHistoryVersion]:
+        """
+        Adds the deployments in a history that aren't in the index yet. Only the new deployments' dumps are downloaded.
+        Deployments without an API dump are remembered and skipped.
+
+        Arguments:
+            history: The history of the branch and operating system to index.
+            cache: A cache to load dumps from and add them to.
+            concurrency: The maximum number of dumps downloaded at once. Dumps are downloaded ahead of the one being
+                         added, but are added in order.
+
+        Returns:
+            The versions that were added.
+        """
+        deployments: List[Deployment] = []
+        seen_version_hashes = set()
+        for deployment in history.get_deployments_by_type(self.deployment_type):
+            if self.is_known(deployment.version_hash) or deployment.version_hash in seen_version_hashes:
+                continue
+            seen_version_hashes.add(deployment.version_hash)
+            deployments.append(deployment)
+
+        tasks: Dict[int, asyncio.Future] = {}
+
+        def schedule(index: int):
+            if index < len(deployments) and index not in tasks:
+                tasks[index] = asyncio.ensure_future(deployments[index].get_api_dump(cache=cache, validate=False))
+
+        added_versions = []
+        try:
+            for index, deployment in enumerate(deployments):
+                for prefetch_index in range(index, index + concurrency):
+                    schedule(prefetch_index)
+
+                try:
+                    dump = await tasks.pop(index)
+                except ClientResponseError as exception:
+                    if exception.status not in _missing_dump_statuses:
+                        raise
+                    self._skipped_version_hashes.add(deployment.version_hash)
+                    continue
+
+                added_versions.append(self.add_dump(deployment.version_hash, deployment.timestamp, dump))
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        return added_versions
+
+    def _get_version(self, position: int) -> Optional[APIHistoryVersion]:
+        return self.versions[position] if position < len(self.versions) else None
+
+    def get_ranges(self, symbol: str) -> List[APIHistoryRange]:
+        """
+        Gets the runs of versions that something existed in, oldest first.
+        """
+        ranges = self._ranges.get(symbol, [])
+        return [
+            APIHistoryRange(
+                first=self.versions[ranges[index]],
+                last=self.versions[ranges[index + 1] - 1],
+                removed_in=self._get_version(ranges[index + 1])
+            )
+            for index in range(0, len(ranges), 2)
+        ]
+
+    def get_introduced(self, symbol: str) -> Optional[APIHistoryVersion]:
+        """
+        Gets the first indexed version that something existed in, or None if it never existed.
+        """
+        ranges = self._ranges.get(symbol)
+        return self.versions[ranges[0]] if ranges else None
+
+    def get_removed(self, symbol: str) -> Optional[APIHistoryVersion]:
+        """
+        Gets the version that something was last removed in, or None if it exists in the latest indexed version or
+        never existed.
+        """
+        ranges = self._ranges.get(symbol)
+        return self._get_version(ranges[-1]) if ranges else None
+
+    def exists_in(self, symbol: str, version_hash: str) -> bool:
+        """
+        Checks whether something existed in an indexed version.
+        Raises KeyError if the version isn't in the index.
+        """
+        position = self._version_positions[version_hash]
+        return bisect_right(self._ranges.get(symbol, []), position) % 2 == 1
+
+    def save(self, path: Path):
+        """
+        Writes the index to a file atomically.
+        """
+        os.makedirs(path.parent, exist_ok=True)
+        write_file_atomic(path, orjson.dumps({
+            "format": _format_version,
+            "deployment_type": self.deployment_type.value,
+            "versions": [[version.version_hash, version.timestamp.isoformat()] for version in self.versions],
+            "skipped": sorted(self._skipped_version_hashes),
+            "ranges": self._ranges
+        }))
+
+    @classmethod
+    def load(cls, path: Path) -> APIHistoryIndex:
+        """
+        Reads an index written by save.
+        """
+        with open(path, "rb") as file:
+            data = orjson.loads(file.read())
+        if data.get("format") != _format_version:
+            raise ValueError(f"Unsupported API history index format {data.get('format')!r}")
+
+        index = cls(deployment_type=DeploymentType(data["deployment_type"]))
+        for version_hash, timestamp in data["versions"]:
+            index._version_positions[version_hash] = len(index.versions)
+            index.versions.append(APIHistoryVersion(
+                version_hash=version_hash,
+                timestamp=datetime.fromisoformat(timestamp)
+            ))
+        index._skipped_version_hashes = set(data["skipped"])
+        index._ranges = data["ranges"]
+        return index
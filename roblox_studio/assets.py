@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from .utilities import write_file_atomic
+
+_format_version = 1
+
+_rbxasset_scheme = "rbxasset://"
+
+
+def normalize_rbxasset_path(path: str) -> str:
+    """
+    Turns a rbxasset path like "rbxasset://Textures/face.png" or "/textures\\face.png" into the key it's indexed under,
+    like "textures/face.png".
+    """
+    if path[:len(_rbxasset_scheme)].lower() == _rbxasset_scheme:
+        path = path[len(_rbxasset_scheme):]
+    return path.replace("\\", "/").strip("/").lower()
+
+
+class RbxAssetIndex:
+    """
+    An index of every file in a Studio version's content folders, for resolving rbxasset paths without touching the
+    filesystem.
+    Paths are matched case-insensitively. When a path exists in more than one content folder, the one from the earliest
+    folder wins, the same as Version.resolve_rbxasset_to_path.
+    The modification time of every indexed folder is recorded, so is_stale can tell that files were added or removed
+    without listing the folders again.
+    """
+
+    def __init__(self, base_paths: List[Path]):
+        """
+        Arguments:
+            base_paths: The content folders to search, in order of precedence.
+        """
+        self.base_paths: List[Path] = base_paths
+
+        # normalized path -> (base path index, path relative to the base path)
+        self._files: Dict[str, Tuple[int, str]] = {}
+        # (base path index, folder path relative to the base path) -> modification time, or None if the base path
+        # didn't exist
+        self._folder_mtimes: Dict[Tuple[int, str], Optional[int]] = {}
+
+    def __len__(self):
+        return len(self._files)
+
+    @classmethod
+    def build(cls, base_paths: List[Path]) -> RbxAssetIndex:
+        """
+        Indexes the files in content folders.
+
+        Arguments:
+            base_paths: The content folders to search, in order of precedence.
+        """
+        index = cls(base_paths)
+        for base_index, base_path in enumerate(base_paths):
+            index._add_base_path(base_index, str(base_path))
+        return index
+
+    def _add_base_path(self, base_index: int, base_path: str):
+        files = self._files
+        # folders are walked with scandir directly since it gives file types without a stat per entry
+        pending_folders = [""]
+        while pending_folders:
+            relative_folder = pending_folders.pop()
+            folder = os.path.join(base_path, relative_folder) if relative_folder else base_path
+            try:
+                self._folder_mtimes[base_index, relative_folder] = os.stat(folder).st_mtime_ns
+                entries = os.scandir(folder)
+            except (FileNotFoundError, NotADirectoryError):
+                self._folder_mtimes[base_index, relative_folder] = None
+                continue
+
+            with entries:
+                for entry in entries:
+                    relative_path = f"{relative_folder}/{entry.name}" if relative_folder else entry.name
+                    if entry.is_dir():
+                        pending_folders.append(relative_path)
+                    else:
+                        files.setdefault(relative_path.lower(), (base_index, relative_path))
+
+    def is_stale(self) -> bool:
+        """
+        Checks whether files have been added to or removed from the indexed folders since they were indexed, by
+        comparing the modification time of each folder.
+        Files that were only modified don't make the index stale.
+        """
+        base_paths = [str(base_path) for base_path in self.base_paths]
+        for (base_index, relative_folder), mtime_ns in self._folder_mtimes.items():
+            base_path = base_paths[base_index]
+            folder = os.path.join(base_path, relative_folder) if relative_folder else base_path
+            try:
+                current_mtime_ns = os.stat(folder).st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                current_mtime_ns = None
+            if current_mtime_ns != mtime_ns:
+                return True
+        return False
+
+    def resolve(self, path: str) -> Optional[Path]:
+        """
+        Resolves a rbxasset path, like /textures/face.png or rbxasset://textures/face.png, to the file it refers to.
+        The resolved path can't escape the content folders, since only indexed files are returned.
+
+        Returns:
+            The path of the file, or None if there is no such file.
+        """
+        indexed_file = self._files.get(normalize_rbxasset_path(path))
+        if indexed_file is None:
+            return None
+        base_index, relative_path = indexed_file
+        return self.base_paths[base_index] / relative_path
+
+    def resolve_many(self, paths: Iterable[str]) -> Dict[str, Optional[Path]]:
+        """
+        Resolves many rbxasset paths. Paths that appear more than once are only resolved once.
+
+        Returns:
+            A dictionary where the keys are the paths and the values are their resolved paths, or None for paths
+            that don't exist.
+        """
+        resolved_paths = {}
+        for path in paths:
+            if path not in resolved_paths:
+                resolved_paths[path] = self.resolve(path)
+        return resolved_paths
+
+    def save(self, path: Path):
+        """
+        Writes the index to a file atomically.
+        """
+        os.makedirs(path.parent, exist_ok=True)
+        write_file_atomic(path, orjson.dumps({
+            "format": _format_version,
+            "base_paths": [str(base_path) for base_path in self.base_paths],
+            "folders": [
+                [base_index, relative_folder, mtime_ns]
+                for (base_index, relative_folder), mtime_ns in self._folder_mtimes.items()
+            ],
+            # the normalized path is the lowercase relative path, so it isn't stored
+            "files": [[base_index, relative_path] for base_index, relative_path in self._files.values()]
+        }))
+
+    @classmethod
+    def load(cls, path: Path) -> RbxAssetIndex:
+        """
+        Reads an index written by save.
+        """
+        with open(path, "rb") as file:
+            data = orjson.loads(file.read())
+        if data.get("format") != _format_version:
+            raise ValueError(f"Unsupported rbxasset index format {data.get('format')!r}")
+
+        index = cls([Path(base_path) for base_path in data["base_paths"]])
+        index._folder_mtimes = {
+            (base_index, relative_folder): mtime_ns for base_index, relative_folder, mtime_ns in data["folders"]
+        }
+        index._files = {
+            relative_path.lower(): (base_index, relative_path) for base_index, relative_path in data["files"]
+        }
+        return index
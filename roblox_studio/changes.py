@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ChangeType(Enum):
+    added = "added"
+    removed = "removed"
+    changed = "changed"
@@ -1,11 +1,13 @@
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import orjson
 
 from .cookie import RobloxCookie
 from .environments import Version, VersionType
+from .fflags import FFlagReader, FFlags
+from .inventory import InstalledVersion, VersionInventory
 from .settings import get_raw_settings
 from .storage import AppStorage
 
@@ -25,6 +27,8 @@ class StudioClient:
                 roblox_path = Path("~/Library").expanduser() / "Roblox"
 
         self.root_path: Path = roblox_path
+        self._fflag_reader: Optional[FFlagReader] = None
+        self._inventory: Optional[VersionInventory] = None
 
     @property
     def global_settings_file_path(self):
@@ -57,17 +61,37 @@ class StudioClient:
         else:
             return Path("~/Library").expanduser() / "Logs" / "Roblox"
 
+    @property
+    def versions_folder_path(self):
+        return self.root_path / "Versions"
+
     @property
     def app_settings_file_path(self):
         return self.local_storage_folder_path / "appStorage.json"
 
+    @property
+    def fflag_reader(self) -> FFlagReader:
+        """
+        The reader of the cached FFlags file, which can be used to be notified when Studio updates it.
+        """
+        path = self.studio_app_settings_file_path
+        if self._fflag_reader is None or self._fflag_reader.path != path:
+            self._fflag_reader = FFlagReader(path)
+        return self._fflag_reader
+
     def get_cached_fflags(self) -> Dict[str, Any]:
-        with open(
-                file=self.studio_app_settings_file_path,
-                mode="rb"
-        ) as file:
-            data = file.read()
-        return orjson.loads(data)
+        """
+        Gets the FFlags Studio last fetched, as a new dictionary that can be modified. The file is only read again when
+        it changes.
+        """
+        return self.fflag_reader.get().to_dict()
+
+    def get_shared_cached_fflags(self) -> FFlags:
+        """
+        Gets the FFlags Studio last fetched without copying them. The same immutable mapping is returned to every
+        caller until the file changes, and it can be looked up by prefix with FFlags.get_prefix and the typed getters.
+        """
+        return self.fflag_reader.get()
 
     def get_app_storage(self):
         with open(
@@ -77,7 +101,7 @@ class StudioClient:
             data = file.read()
         return AppStorage(orjson.loads(data))
 
-    def get_version(self, path: Path, version_type: Optional[VersionType] = None) -> Version:
+    def _get_version_type(self, version_type: Optional[VersionType]) -> VersionType:
         if version_type is None:
             if _is_windows:
                 version_type = VersionType.windows
@@ -85,12 +109,40 @@ class StudioClient:
                 version_type = VersionType.macos
             else:
                 raise Exception("Couldn't determine your OS type. Specify the version_type parameter to silence this.")
+        return version_type
 
+    def get_version(self, path: Path, version_type: Optional[VersionType] = None) -> Version:
         return Version(
             path=path,
-            version_type=version_type
+            version_type=self._get_version_type(version_type)
         )
 
+    def get_installed_versions(
+            self,
+            cache_path: Optional[Path] = None,
+            version_type: Optional[VersionType] = None
+    ) -> List[InstalledVersion]:
+        """
+        Finds the Studio versions installed in the versions folder.
+        The client keeps its inventory between calls, so later calls with the same arguments only check that nothing
+        has changed, even without a cache file.
+
+        Arguments:
+            cache_path: A file to cache the inventory in, so that calls in other processes can also reuse it.
+            version_type: The type of the versions. Defaults to the current OS's.
+        """
+        folder = self.versions_folder_path
+        version_type = self._get_version_type(version_type)
+        inventory = self._inventory
+        if inventory is None or inventory.folder != folder or inventory.version_type != version_type \
+                or inventory.cache_path != cache_path:
+            inventory = self._inventory = VersionInventory(
+                folder=folder,
+                version_type=version_type,
+                cache_path=cache_path
+            )
+        return inventory.scan()
+
     def get_cookies(self) -> Dict[str, Dict[str, RobloxCookie]]:
         """
         Gets the stored cookies for the current Roblox session.
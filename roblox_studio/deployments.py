@@ -2,17 +2,28 @@ from __future__ import annotations
 
 # import warnings
 
-from datetime import datetime
+import asyncio
+from array import array
+from bisect import bisect_left
+from calendar import timegm
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import lru_cache
 from re import compile
-from typing import List, Optional, Union, Tuple
+from sys import intern
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union, Tuple
 
+import orjson
 from yarl import URL
-from aiohttp import ClientSession
+from aiohttp import ClientResponseError, ClientSession
 from dateutil.parser import parse
 
 from .branches import RobloxBranch, roblox_branch_to_url
-from .dump import APIDump
+from .dump import APIDump, construct_api_dump
+from .dump_cache import APIDumpCache
+from .dump_stream import APIDumpItem, iter_api_dump_response
+from .http_cache import HTTPCache, HTTPCacheEntry
 
 cdn_url = URL("https://setup.rbxcdn.com/")
 mac_cdn_url = cdn_url / "mac"
@@ -25,6 +36,16 @@ fallback_pattern = compile(r"New ([^ ]*?) (version-[^ ]*) at ([^ ]*) (.*)")
 reverting_pattern = compile(r"Reverting ([^ ]*?) to version (version-[^ ]*) at ([^ ]*) (.*)")
 revert_pattern = compile(r"Revert ([^ ]*?) (version-[^ ]*) at ([^ ]*) (.*)")
 
+# matches the whole of a well-formed line in one pass. lines that don't match go through the patterns above.
+_timestamp_pattern = r"at (\d{1,2}/\d{1,2}/\d{4}) (\d{1,2}):(\d{2}):(\d{2}) ([AP]M)"
+fast_deployment_pattern = compile(rf"New ([^ ]*?) (version-[^ ]*) {_timestamp_pattern}"
+                                  r"(?:, file vers?ion: ?([0123456789, ]*)(?:, git hash: ?([^ ]*))?)?")
+fast_revert_pattern = compile(rf"(?:Reverting ([^ ]*?) to version|Revert ([^ ]*?)) (version-[^ ]*) "
+                              rf"{_timestamp_pattern}")
+
+# only extracts what is needed to index an entry without parsing it
+_history_entry_pattern = compile(r"(?:New|Reverting|Revert) ([^ ]*?)(?: to version)? (version-[^ ]*) at ")
+
 
 class OperatingSystem(Enum):
     windows = "windows"
@@ -66,7 +87,180 @@ _log_name_to_deployment_type = {
 }
 
 
+@lru_cache(maxsize=4096)
+def _parse_date(date_string: str) -> Tuple[int, int, int]:
+    month, day, year = date_string.split("/")
+    return int(year), int(month), int(day)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_slow(timestamp_string: str) -> datetime:
+    try:
+        return parse(timestamp_string)
+    except (ValueError, OverflowError) as exception:
+        # reported the same way as other lines that can't be parsed
+        raise AssertionError(f"Failed to parse timestamp {timestamp_string!r}") from exception
+
+
+def _parse_timestamp_fast(date_string: str, hour: str, minute: str, second: str, meridiem: str) -> Optional[datetime]:
+    # timestamps are formatted like "6/2/2022 5:09:16 PM"
+    hour_number = int(hour)
+    if not 1 <= hour_number <= 12:
+        return None
+    if meridiem == "AM":
+        if hour_number == 12:
+            hour_number = 0
+    elif hour_number != 12:
+        hour_number += 12
+
+    year, month, day = _parse_date(date_string)
+    try:
+        return datetime(year, month, day, hour_number, int(minute), int(second))
+    except ValueError:
+        return None
+
+
+def _parse_version_number(version_string: str) -> Optional[Tuple[int, int, int, int]]:
+    version_string = version_string.strip()
+    if not version_string:
+        return None
+    version_number = tuple(int(piece.strip()) for piece in version_string.split(","))
+    if version_number[0] >= 2000:
+        return None
+    return version_number
+
+
+def _parse_deployment_line_slow(history_line: str):
+    version_number = None
+    git_hash = None
+
+    if "git hash" in history_line:
+        match = git_hash_pattern.search(string=history_line)
+        assert match
+        version_number = _parse_version_number(match.group(5))
+        git_hash = match.group(6)
+    elif "file version" in history_line or "file verion" in history_line:
+        match = file_version_pattern.search(string=history_line)
+        assert match
+        version_number = _parse_version_number(match.group(5))
+    else:
+        match = fallback_pattern.search(string=history_line)
+        assert match
+
+    return (
+        _log_name_to_deployment_type.get(match.group(1)),
+        match.group(2),
+        _parse_timestamp_slow(f"{match.group(3)} {match.group(4)}"),
+        version_number,
+        git_hash
+    )
+
+
+def parse_deployment_line(
+        history_line: str
+) -> Tuple[Optional[DeploymentType], str, datetime, Optional[Tuple[int, int, int, int]], Optional[str]]:
+    """
+    Parses a "New" line from a deployment history.
+    Raises AssertionError if the line can't be parsed.
+
+    Returns:
+        A tuple of the deployment type, version hash, timestamp, version number and git hash.
+    """
+    match = fast_deployment_pattern.fullmatch(history_line)
+    if match:
+        timestamp = _parse_timestamp_fast(*match.group(3, 4, 5, 6, 7))
+        if timestamp is not None:
+            version_string = match.group(8)
+            return (
+                _log_name_to_deployment_type.get(match.group(1)),
+                match.group(2),
+                timestamp,
+                _parse_version_number(version_string) if version_string is not None else None,
+                match.group(9)
+            )
+
+    return _parse_deployment_line_slow(history_line)
+
+
+def _parse_revert_line_slow(history_line: str):
+    if history_line.startswith("Reverting"):
+        match = reverting_pattern.search(history_line)
+    else:
+        match = revert_pattern.search(history_line)
+    assert match
+
+    return (
+        _log_name_to_deployment_type.get(match.group(1)),
+        match.group(2),
+        _parse_timestamp_slow(f"{match.group(3)} {match.group(4)}")
+    )
+
+
+def parse_revert_line(history_line: str) -> Tuple[Optional[DeploymentType], str, datetime]:
+    """
+    Parses a "Revert" or "Reverting" line from a deployment history.
+    Raises AssertionError if the line can't be parsed.
+
+    Returns:
+        A tuple of the deployment type, version hash and timestamp.
+    """
+    match = fast_revert_pattern.fullmatch(history_line)
+    if match:
+        timestamp = _parse_timestamp_fast(*match.group(4, 5, 6, 7, 8))
+        if timestamp is not None:
+            return (
+                _log_name_to_deployment_type.get(match.group(1) or match.group(2)),
+                match.group(3),
+                timestamp
+            )
+
+    return _parse_revert_line_slow(history_line)
+
+
+_table_deployment_types = list(DeploymentType)
+_table_deployment_type_codes = {deployment_type: code for code, deployment_type in enumerate(_table_deployment_types)}
+_table_version_hash_pattern = compile(r"version-[0-9a-f]{16}")
+_epoch = datetime(1970, 1, 1)
+
+
+def get_branch_os_url(branch: RobloxBranch, operating_system: OperatingSystem) -> URL:
+    branch_url = roblox_branch_to_url.get(branch)
+    return branch_url / "mac" if operating_system == OperatingSystem.mac else branch_url
+
+
+def get_history_url(branch: RobloxBranch, operating_system: OperatingSystem) -> URL:
+    return get_branch_os_url(branch, operating_system) / "DeployHistory.txt"
+
+
+def _get_content_range_start(content_range: Optional[str]) -> Optional[int]:
+    # Content-Range: bytes 100-199/200
+    if not content_range or not content_range.startswith("bytes "):
+        return None
+    byte_range = content_range[6:].split("/")[0]
+    try:
+        return int(byte_range.split("-")[0])
+    except ValueError:
+        return None
+
+
+def _get_content_range_total(content_range: Optional[str]) -> Optional[int]:
+    # Content-Range: bytes */200
+    if not content_range or "/" not in content_range:
+        return None
+    try:
+        return int(content_range.split("/")[-1])
+    except ValueError:
+        return None
+
+
 class DeploymentPackage:
+    """
+    A package listed in a deployment's rbxPkgManifest.txt.
+    Instances use __slots__ to save memory, so they can't be given other attributes or be weakly referenced.
+    """
+
+    __slots__ = ("_branch", "_client", "_deployment", "name", "md5", "compressed_size", "size")
+
     def __init__(self, client: DeploymentClient, branch: RobloxBranch, deployment: Deployment, lines: List[str]):
         self._branch: RobloxBranch = branch
         self._client: DeploymentClient = client
@@ -106,6 +300,17 @@ class DeploymentPackages:
 
 
 class Deployment:
+    """
+    A deployment in a deployment history.
+    Instances use __slots__ to save memory, since histories hold tens of thousands of them, so they can't be given
+    other attributes or be weakly referenced.
+    """
+
+    __slots__ = (
+        "_branch", "_client", "_operating_system",
+        "deployment_type", "version_hash", "timestamp", "version_number", "git_hash"
+    )
+
     def __init__(
             self,
             client: DeploymentClient,
@@ -120,51 +325,40 @@ class Deployment:
         self.deployment_type: DeploymentType
         self.version_hash: str
         self.timestamp: datetime
-        self.version_number: Optional[Tuple[int, int, int, int]] = None
-        self.git_hash: Optional[str] = None
+        self.version_number: Optional[Tuple[int, int, int, int]]
+        self.git_hash: Optional[str]
 
-        if "git hash" in history_line:
-            match = git_hash_pattern.search(string=history_line)
-            assert match
-
-            self.deployment_type = _log_name_to_deployment_type.get(match.group(1))
-            self.version_hash = match.group(2)
-            date_string = match.group(3)
-            time_string = match.group(4)
-            self.timestamp = parse(f"{date_string} {time_string}")
-            version_string = match.group(5).strip()
-            if version_string:
-                self.version_number = tuple(int(piece.strip()) for piece in version_string.split(","))
-            self.git_hash = match.group(6)
-        elif "file version" in history_line or "file verion" in history_line:
-            match = file_version_pattern.search(string=history_line)
-            assert match
-
-            self.deployment_type = _log_name_to_deployment_type.get(match.group(1))
-            self.version_hash = match.group(2)
-            date_string = match.group(3)
-            time_string = match.group(4)
-            self.timestamp = parse(f"{date_string} {time_string}")
-            version_string = match.group(5).strip()
-            if version_string:
-                self.version_number = tuple(int(piece.strip()) for piece in version_string.split(","))
-        else:
-            match = fallback_pattern.search(string=history_line)
-            assert match
-
-            self.deployment_type = _log_name_to_deployment_type.get(match.group(1))
-            self.version_hash = match.group(2)
-            date_string = match.group(3)
-            time_string = match.group(4)
-            self.timestamp = parse(f"{date_string} {time_string}")
+        self.deployment_type, self.version_hash, self.timestamp, self.version_number, self.git_hash = \
+            parse_deployment_line(history_line)
 
-        if self.version_number and self.version_number[0] >= 2000:
-            self.version_number = None
+    @classmethod
+    def from_fields(
+            cls,
+            client: DeploymentClient,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: Optional[DeploymentType],
+            version_hash: str,
+            timestamp: datetime,
+            version_number: Optional[Tuple[int, int, int, int]] = None,
+            git_hash: Optional[str] = None
+    ) -> Deployment:
+        """
+        Creates a deployment from already parsed fields instead of a history line.
+        """
+        deployment = cls.__new__(cls)
+        deployment._branch = branch
+        deployment._client = client
+        deployment._operating_system = operating_system
+        deployment.deployment_type = deployment_type
+        deployment.version_hash = version_hash
+        deployment.timestamp = timestamp
+        deployment.version_number = version_number
+        deployment.git_hash = git_hash
+        return deployment
 
     def get_url(self, item: str):
-        branch_url = roblox_branch_to_url.get(self._branch)
-        branch_os_url = branch_url / "mac" if self._operating_system == OperatingSystem.mac else branch_url
-        return branch_os_url / f"{self.version_hash}-{item}"
+        return get_branch_os_url(self._branch, self._operating_system) / f"{self.version_hash}-{item}"
 
     def get_app_zip_url(self):
         if self.deployment_type in {DeploymentType.studio, DeploymentType.studio_64}:
@@ -174,10 +368,54 @@ class Deployment:
         else:
             raise NotImplementedError
 
-    async def get_api_dump(self) -> APIDump:
+    async def get_api_dump(
+            self,
+            cache: Optional[APIDumpCache] = None,
+            validate: bool = True,
+            lazy: bool = False
+    ) -> APIDump:
+        """
+        Downloads and parses the API dump for this deployment.
+
+        Arguments:
+            cache: A cache to load the dump from, keyed by version hash. Downloaded dumps are added to it.
+            validate: Whether to validate the dump while parsing it. See construct_api_dump for what skipping
+                      validation means.
+            lazy: Whether to only build each class's members when they are first accessed. Only applies when validate
+                  is False and cache is not specified.
+        """
+        if cache is not None:
+            dump = cache.get(self.version_hash)
+            if dump is not None:
+                return dump
+
         async with self._client.session.get(self.get_url("API-Dump.json")) as dump_response:
             dump_response.raise_for_status()
-            return APIDump(**await dump_response.json())
+            dump_json = await dump_response.read()
+
+        if validate:
+            dump = APIDump(**orjson.loads(dump_json))
+        else:
+            dump = construct_api_dump(orjson.loads(dump_json), lazy=lazy and cache is None)
+        if cache is not None:
+            cache.set(self.version_hash, dump_json, dump)
+        return dump
+
+    async def iter_api_dump(self, validate: bool = True) -> AsyncIterator[APIDumpItem]:
+        """
+        Downloads and parses the API dump for this deployment one class or enum at a time, without holding the whole
+        dump in memory.
+
+        Arguments:
+            validate: Whether to validate each class and enum.
+
+        Yields:
+            Each APIDumpClass and then each APIDumpEnum in the dump, in order.
+        """
+        async with self._client.session.get(self.get_url("API-Dump.json")) as dump_response:
+            dump_response.raise_for_status()
+            async for item in iter_api_dump_response(dump_response, validate=validate):
+                yield item
 
     async def get_packages(self) -> DeploymentPackages:
         assert self._operating_system == OperatingSystem.windows, "Cannot get packages for non-Windows installs"
@@ -193,6 +431,13 @@ class Deployment:
 
 
 class DeploymentRevert:
+    """
+    A revert in a deployment history. Like Deployment, instances use __slots__, so they can't be given other
+    attributes or be weakly referenced.
+    """
+
+    __slots__ = ("_branch", "_client", "_operating_system", "deployment_type", "version_hash", "timestamp", "git_hash")
+
     def __init__(
             self,
             client: DeploymentClient,
@@ -209,20 +454,201 @@ class DeploymentRevert:
         self.timestamp: datetime
         self.git_hash: Optional[str] = None
 
-        if history_line.startswith("Reverting"):
-            match = reverting_pattern.search(history_line)
-            self.deployment_type = _log_name_to_deployment_type.get(match.group(1))
-            self.version_hash = match.group(2)
-            date_string = match.group(3)
-            time_string = match.group(4)
-            self.timestamp = parse(f"{date_string} {time_string}")
+        self.deployment_type, self.version_hash, self.timestamp = parse_revert_line(history_line)
+
+    @classmethod
+    def from_fields(
+            cls,
+            client: DeploymentClient,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            deployment_type: Optional[DeploymentType],
+            version_hash: str,
+            timestamp: datetime
+    ) -> DeploymentRevert:
+        """
+        Creates a revert from already parsed fields instead of a history line.
+        """
+        revert = cls.__new__(cls)
+        revert._branch = branch
+        revert._client = client
+        revert._operating_system = operating_system
+        revert.deployment_type = deployment_type
+        revert.version_hash = version_hash
+        revert.timestamp = timestamp
+        revert.git_hash = None
+        return revert
+
+
+class LazyDeploymentList(Sequence):
+    """
+    A sequence of deployment history entries that keeps the raw history lines and only parses an entry when it is
+    first accessed.
+    """
+
+    def __init__(self, history: DeploymentHistory):
+        self._history: DeploymentHistory = history
+        self._lines: List[str] = []
+        self._entries: List[Optional[Union[Deployment, DeploymentRevert]]] = []
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[item_index] for item_index in range(*index.indices(len(self._lines)))]
+
+        entry = self._entries[index]
+        if entry is None:
+            entry = self._history._make_entry(self._lines[index])
+            self._entries[index] = entry
+        return entry
+
+    def _append_line(self, history_line: str):
+        self._lines.append(history_line)
+        self._entries.append(None)
+
+    def _truncate(self, length: int):
+        del self._lines[length:]
+        del self._entries[length:]
+
+
+class DeploymentTable(Sequence):
+    """
+    A compact, columnar copy of a deployment history for holding many histories in memory at once.
+    Each entry is stored as a row across flat arrays and is only turned back into a Deployment or DeploymentRevert
+    when it is accessed. Timestamps are stored as whole seconds.
+    """
+
+    def __init__(self, client: DeploymentClient, branch: RobloxBranch, operating_system: OperatingSystem):
+        self._client: DeploymentClient = client
+        self._branch: RobloxBranch = branch
+        self._operating_system: OperatingSystem = operating_system
+
+        self._timestamps: array = array("q")
+        # index into _table_deployment_types, or -1 when the type is unknown
+        self._type_codes: array = array("b")
+        self._is_revert: array = array("b")
+        # four numbers per row, all -1 when the entry has no version number
+        self._version_numbers: array = array("q")
+        # the hex part of "version-<16 hex digits>" hashes. rows with other hashes are stored in _odd_version_hashes
+        self._version_hashes: array = array("Q")
+        self._odd_version_hashes: Dict[int, str] = {}
+        self._odd_version_numbers: Dict[int, Tuple[int, ...]] = {}
+        self._git_hashes: List[Optional[str]] = []
+
+    @classmethod
+    def from_history(cls, history: DeploymentHistory) -> DeploymentTable:
+        table = cls(
+            client=history._client,
+            branch=history._branch,
+            operating_system=history._operating_system
+        )
+
+        if history._lazy:
+            for position, history_line in enumerate(history.history._lines):
+                entry = history.history._entries[position]
+                if entry is not None:
+                    table.append(entry)
+                    continue
+                try:
+                    if history_line.startswith("New"):
+                        table._append_fields(False, *parse_deployment_line(history_line))
+                    else:
+                        table._append_fields(True, *parse_revert_line(history_line))
+                except AssertionError:
+                    # lines that can't be parsed are left out, like they are when a history isn't lazy
+                    continue
+        else:
+            for entry in history.history:
+                table.append(entry)
+
+        return table
+
+    def append(self, entry: Union[Deployment, DeploymentRevert]):
+        if isinstance(entry, Deployment):
+            self._append_fields(
+                False,
+                entry.deployment_type,
+                entry.version_hash,
+                entry.timestamp,
+                entry.version_number,
+                entry.git_hash
+            )
         else:
-            match = revert_pattern.search(history_line)
-            self.deployment_type = _log_name_to_deployment_type.get(match.group(1))
-            self.version_hash = match.group(2)
-            date_string = match.group(3)
-            time_string = match.group(4)
-            self.timestamp = parse(f"{date_string} {time_string}")
+            self._append_fields(True, entry.deployment_type, entry.version_hash, entry.timestamp)
+
+    def _append_fields(
+            self,
+            is_revert: bool,
+            deployment_type: Optional[DeploymentType],
+            version_hash: str,
+            timestamp: datetime,
+            version_number: Optional[Tuple[int, ...]] = None,
+            git_hash: Optional[str] = None
+    ):
+        row = len(self._timestamps)
+
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        self._timestamps.append(timegm(timestamp.timetuple()))
+        self._type_codes.append(_table_deployment_type_codes.get(deployment_type, -1))
+        self._is_revert.append(is_revert)
+
+        if version_number is None:
+            self._version_numbers.extend((-1, -1, -1, -1))
+        elif len(version_number) == 4:
+            self._version_numbers.extend(version_number)
+        else:
+            self._version_numbers.extend((-1, -1, -1, -1))
+            self._odd_version_numbers[row] = version_number
+
+        if _table_version_hash_pattern.fullmatch(version_hash):
+            self._version_hashes.append(int(version_hash[8:], 16))
+        else:
+            self._version_hashes.append(0)
+            self._odd_version_hashes[row] = version_hash
+
+        self._git_hashes.append(intern(git_hash) if git_hash is not None else None)
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self)))]
+
+        row = range(len(self))[index]
+
+        type_code = self._type_codes[row]
+        deployment_type = _table_deployment_types[type_code] if type_code >= 0 else None
+        version_hash = self._odd_version_hashes.get(row) or f"version-{self._version_hashes[row]:016x}"
+        timestamp = _epoch + timedelta(seconds=self._timestamps[row])
+
+        if self._is_revert[row]:
+            return DeploymentRevert.from_fields(
+                client=self._client,
+                branch=self._branch,
+                operating_system=self._operating_system,
+                deployment_type=deployment_type,
+                version_hash=version_hash,
+                timestamp=timestamp
+            )
+
+        version_number = self._odd_version_numbers.get(row)
+        if version_number is None and self._version_numbers[row * 4] != -1:
+            version_number = tuple(self._version_numbers[row * 4:row * 4 + 4])
+
+        return Deployment.from_fields(
+            client=self._client,
+            branch=self._branch,
+            operating_system=self._operating_system,
+            deployment_type=deployment_type,
+            version_hash=version_hash,
+            timestamp=timestamp,
+            version_number=version_number,
+            git_hash=self._git_hashes[row]
+        )
 
 
 class DeploymentHistory:
@@ -231,14 +657,118 @@ class DeploymentHistory:
             client: DeploymentClient,
             branch: RobloxBranch,
             operating_system: OperatingSystem,
-            history_data: str
+            history_data: str,
+            lazy: bool = False
     ):
+        """
+        Arguments:
+            client: The client used to make requests for entries in this history.
+            branch: The branch this history belongs to.
+            operating_system: The operating system this history belongs to.
+            history_data: The contents of DeployHistory.txt.
+            lazy: Whether to keep the raw lines and only parse entries when they are accessed. Lines that can't be
+                  parsed raise AssertionError when accessed through history instead of being skipped, but are left
+                  out by the methods of this class.
+        """
         self._client: DeploymentClient = client
         self._branch: RobloxBranch = branch
         self._operating_system: OperatingSystem = operating_system
+        self._lazy: bool = lazy
+
+        self.history: Union[List[Union[Deployment, DeploymentRevert]], LazyDeploymentList] = \
+            LazyDeploymentList(self) if lazy else []
+
+        # positions in self.history, in order, for each deployment type and version hash
+        self._positions_by_type: Dict[Optional[DeploymentType], List[int]] = {}
+        self._positions_by_version_hash: Dict[str, List[int]] = {}
+        # positions in self.history sorted by timestamp. built when first needed
+        self._timestamp_index: Optional[Tuple[List[datetime], List[int]]] = None
+
+        # number of bytes of the history file that have been parsed, up to and including the last complete line
+        self._byte_offset: int = 0
+        # number of entries parsed from a trailing line that had not been terminated yet
+        self._tail_entry_count: int = 0
+
+        self._add_history_data(history_data.encode("utf-8"))
+
+    def _make_entry(self, history_line: str) -> Union[Deployment, DeploymentRevert]:
+        entry_type = Deployment if history_line.startswith("New") else DeploymentRevert
+        return entry_type(
+            client=self._client,
+            branch=self._branch,
+            operating_system=self._operating_system,
+            history_line=history_line
+        )
+
+    def _get_index_keys(self, position: int) -> Tuple[Optional[DeploymentType], str]:
+        if self._lazy:
+            match = _history_entry_pattern.match(self.history._lines[position])
+            return _log_name_to_deployment_type.get(match.group(1)), match.group(2)
+        else:
+            entry = self.history[position]
+            return entry.deployment_type, entry.version_hash
 
-        self.history: List[Union[Deployment, DeploymentRevert]] = []
+    def _get_timestamp(self, position: int) -> Optional[datetime]:
+        # returns None for lines of a lazy history that can't be parsed
+        if self._lazy and self.history._entries[position] is None:
+            history_line = self.history._lines[position]
+            try:
+                if history_line.startswith("New"):
+                    return parse_deployment_line(history_line)[2]
+                else:
+                    return parse_revert_line(history_line)[2]
+            except AssertionError:
+                return None
+        return self.history[position].timestamp
+
+    def _get_entry(self, position: int) -> Optional[Union[Deployment, DeploymentRevert]]:
+        # returns None for lines of a lazy history that can't be parsed
+        try:
+            return self.history[position]
+        except AssertionError:
+            return None
+
+    def _add_entry(self, history_line: str):
+        if self._lazy:
+            match = _history_entry_pattern.match(history_line)
+            if not match:
+                return
+            deployment_type = _log_name_to_deployment_type.get(match.group(1))
+            version_hash = match.group(2)
+            self.history._append_line(history_line)
+        else:
+            try:
+                entry = self._make_entry(history_line)
+            except AssertionError:
+                # warnings.warn(f"Failed to parse string {history_line!r}")
+                return
+            deployment_type = entry.deployment_type
+            version_hash = entry.version_hash
+            self.history.append(entry)
 
+        position = len(self.history) - 1
+        self._positions_by_type.setdefault(deployment_type, []).append(position)
+        self._positions_by_version_hash.setdefault(version_hash, []).append(position)
+        self._timestamp_index = None
+
+    def _truncate(self, length: int):
+        for position in range(len(self.history) - 1, length - 1, -1):
+            for index, key in zip(
+                    (self._positions_by_type, self._positions_by_version_hash),
+                    self._get_index_keys(position)
+            ):
+                positions = index[key]
+                positions.pop()
+                if not positions:
+                    del index[key]
+
+        if self._lazy:
+            self.history._truncate(length)
+        else:
+            del self.history[length:]
+        self._timestamp_index = None
+
+    def _parse_history_data(self, history_data: str):
         history_split = history_data.splitlines()
         for history_line in history_split:
             history_line = history_line.strip()
@@ -253,39 +783,157 @@ class DeploymentHistory:
                 if history_subline == "Done!" or history_subline == "Error!":
                     continue
 
-                try:
-                    if history_subline.startswith("New"):
-                        self.history.append(Deployment(
-                            client=self._client,
-                            branch=self._branch,
-                            operating_system=self._operating_system,
-                            history_line=history_subline
-                        ))
-                    elif history_subline.startswith("Revert"):
-                        self.history.append(DeploymentRevert(
-                            client=self._client,
-                            branch=self._branch,
-                            operating_system=self._operating_system,
-                            history_line=history_subline
-                        ))
-                except AssertionError:
-                    pass
-                    # warnings.warn(f"Failed to parse string {history_subline!r}")
+                if history_subline.startswith("New") or history_subline.startswith("Revert"):
+                    self._add_entry(history_subline)
+
+    def _add_history_data(self, history_data: bytes):
+        """
+        Parses history data that continues from the current byte offset.
+        The trailing line, if it is not terminated yet, is parsed but not counted towards the offset so that it is
+        fetched and parsed again on the next refresh.
+        """
+        if self._tail_entry_count:
+            self._truncate(len(self.history) - self._tail_entry_count)
+            self._tail_entry_count = 0
+
+        newline_index = history_data.rfind(b"\n")
+        complete_data = history_data[:newline_index + 1]
+        tail_data = history_data[newline_index + 1:]
+
+        self._parse_history_data(complete_data.decode("utf-8"))
+        self._byte_offset += len(complete_data)
+
+        try:
+            tail_text = tail_data.decode("utf-8")
+        except UnicodeDecodeError:
+            # the line is still being written and ends partway through a character, so it's left for the next refresh
+            return
+        complete_entry_count = len(self.history)
+        self._parse_history_data(tail_text)
+        self._tail_entry_count = len(self.history) - complete_entry_count
+
+    def _reset(self):
+        if self._lazy:
+            self.history._truncate(0)
+        else:
+            self.history.clear()
+        self._positions_by_type.clear()
+        self._positions_by_version_hash.clear()
+        self._timestamp_index = None
+        self._byte_offset = 0
+        self._tail_entry_count = 0
+
+    async def refresh(self) -> List[Union[Deployment, DeploymentRevert]]:
+        """
+        Adds deployments that were appended to the history since it was last fetched.
+        Only the bytes past the last parsed line are requested. If the server ignores the range or the history has
+        shrunk, the full history is fetched and parsed again.
+
+        Returns:
+            The entries past the ones this history previously held. If the full history had to be fetched again, every
+            entry is returned, since the history was rebuilt and the previous entries may have changed.
+        """
+        previous_length = len(self.history)
+        history_url = get_history_url(self._branch, self._operating_system)
+
+        async with self._client.session.get(
+                history_url,
+                headers={"Range": f"bytes={self._byte_offset}-"}
+        ) as history_response:
+            if history_response.status == 416:
+                # the offset is at or past the end of the file. if it's exactly at the end, nothing was added
+                total_size = _get_content_range_total(history_response.headers.get("Content-Range"))
+                if total_size == self._byte_offset:
+                    return []
+                needs_full_fetch = True
+            elif history_response.status == 206:
+                range_start = _get_content_range_start(history_response.headers.get("Content-Range"))
+                needs_full_fetch = range_start != self._byte_offset
+                if not needs_full_fetch:
+                    self._add_history_data(await history_response.read())
+            else:
+                history_response.raise_for_status()
+                needs_full_fetch = False
+                self._reset()
+                previous_length = 0
+                self._add_history_data(await history_response.read())
+
+        if needs_full_fetch:
+            async with self._client.session.get(history_url) as history_response:
+                history_response.raise_for_status()
+                history_data = await history_response.read()
+            self._reset()
+            previous_length = 0
+            self._add_history_data(history_data)
+
+        return self.history[previous_length:]
+
+    def to_table(self) -> DeploymentTable:
+        """
+        Creates a compact, columnar copy of this history. See DeploymentTable.
+        """
+        return DeploymentTable.from_history(self)
 
     def get_latest_deployment(self, deployment_type: DeploymentType) -> Optional[Deployment]:
-        for deployment in reversed(self.history):
-            if deployment.deployment_type == deployment_type:
-                return deployment
+        for position in reversed(self._positions_by_type.get(deployment_type, [])):
+            entry = self._get_entry(position)
+            if entry is not None:
+                return entry
         return None
 
+    def get_deployments_by_type(self, deployment_type: DeploymentType) -> List[Deployment]:
+        """
+        Gets every deployment of a deployment type, in history order. Reverts are not included.
+        """
+        entries = [self._get_entry(position) for position in self._positions_by_type.get(deployment_type, [])]
+        return [entry for entry in entries if isinstance(entry, Deployment)]
+
+    def get_deployments_by_version_hash(self, version_hash: str) -> List[Union[Deployment, DeploymentRevert]]:
+        """
+        Gets every entry for a version hash, in history order.
+        """
+        entries = [self._get_entry(position) for position in self._positions_by_version_hash.get(version_hash, [])]
+        return [entry for entry in entries if entry is not None]
+
+    def get_deployments_between(
+            self,
+            start: datetime,
+            end: datetime
+    ) -> List[Union[Deployment, DeploymentRevert]]:
+        """
+        Gets every entry with a timestamp at or after start and before end, in history order.
+        """
+        if self._timestamp_index is None:
+            # each timestamp is parsed once. lines that can't be parsed are left out
+            timestamped_positions = []
+            for position in range(len(self.history)):
+                timestamp = self._get_timestamp(position)
+                if timestamp is not None:
+                    timestamped_positions.append((timestamp, position))
+            timestamped_positions.sort()
+            self._timestamp_index = (
+                [timestamp for timestamp, _ in timestamped_positions],
+                [position for _, position in timestamped_positions]
+            )
+
+        timestamps, positions = self._timestamp_index
+        start_index = bisect_left(timestamps, start)
+        end_index = bisect_left(timestamps, end)
+        return [self.history[position] for position in sorted(positions[start_index:end_index])]
+
 
 class DeploymentClient:
-    def __init__(self):
+    def __init__(self, cache: Optional[HTTPCache] = None):
+        """
+        Arguments:
+            cache: An HTTP cache used to revalidate deployment histories instead of downloading them again.
+        """
         self.session = ClientSession(
             headers={
                 "User-Agent": "Roblox/WinInet"
             }
         )
+        self.cache: Optional[HTTPCache] = cache
 
     async def __aenter__(self):
         return self
@@ -293,15 +941,153 @@ class DeploymentClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         await self.session.close()
 
-    async def get_deployments(self, branch: RobloxBranch, operating_system: OperatingSystem):
-        branch_url = roblox_branch_to_url.get(branch)
-        branch_os_url = branch_url / "mac" if operating_system == OperatingSystem.mac else branch_url
+    async def get_deployments(
+            self,
+            branch: RobloxBranch,
+            operating_system: OperatingSystem,
+            lazy: bool = False
+    ) -> DeploymentHistory:
+        """
+        Gets the deployment history for a branch and operating system.
+        If a cache is set, the request is conditional and the previously parsed history is returned when the history
+        has not changed.
+
+        Arguments:
+            branch: The branch to get the history of.
+            operating_system: The operating system to get the history of.
+            lazy: Whether entries should only be parsed when they are accessed. See DeploymentHistory.
+        """
+        history_url = get_history_url(branch, operating_system)
+        cache_key = str(history_url)
+
+        cache_entry = self.cache.get(cache_key) if self.cache is not None else None
+        headers = cache_entry.get_conditional_headers() if cache_entry is not None else None
+
+        async with self.session.get(history_url, headers=headers) as history_response:
+            if cache_entry is not None and history_response.status == 304:
+                if cache_entry.value is None or cache_entry.value._lazy != lazy:
+                    cache_entry.value = DeploymentHistory(
+                        client=self,
+                        branch=branch,
+                        operating_system=operating_system,
+                        history_data=cache_entry.body.decode("utf-8"),
+                        lazy=lazy
+                    )
+
+                # validators sent with a 304 replace the stored ones (RFC 9111 section 4.3.4)
+                etag = history_response.headers.get("ETag", cache_entry.etag)
+                last_modified = history_response.headers.get("Last-Modified", cache_entry.last_modified)
+                if etag != cache_entry.etag or last_modified != cache_entry.last_modified:
+                    cache_entry.etag = etag
+                    cache_entry.last_modified = last_modified
+                    self.cache.set(cache_key, cache_entry)
+
+                return cache_entry.value
 
-        async with self.session.get(branch_os_url / "DeployHistory.txt") as history_response:
             history_response.raise_for_status()
-            return DeploymentHistory(
-                client=self,
-                branch=branch,
-                operating_system=operating_system,
-                history_data=await history_response.text(encoding="utf-8")
+            history_body = await history_response.read()
+            etag = history_response.headers.get("ETag")
+            last_modified = history_response.headers.get("Last-Modified")
+
+        history = DeploymentHistory(
+            client=self,
+            branch=branch,
+            operating_system=operating_system,
+            history_data=history_body.decode("utf-8"),
+            lazy=lazy
+        )
+
+        if self.cache is not None and (etag or last_modified):
+            self.cache.set(cache_key, HTTPCacheEntry(
+                body=history_body,
+                etag=etag,
+                last_modified=last_modified,
+                value=history
+            ))
+
+        return history
+
+    async def iter_all_deployments(
+            self,
+            branches: Optional[Iterable[RobloxBranch]] = None,
+            operating_systems: Optional[Iterable[OperatingSystem]] = None,
+            concurrency: int = 4,
+            lazy: bool = False,
+            return_exceptions: bool = False
+    ) -> AsyncIterator[Tuple[RobloxBranch, OperatingSystem, Union[DeploymentHistory, ClientResponseError]]]:
+        """
+        Fetches the deployment histories of several branches and operating systems concurrently and yields each one as
+        soon as it is ready.
+        Not every branch has a history for every operating system, so a history that the server responds to with an
+        error status doesn't stop the others from being fetched.
+
+        Arguments:
+            branches: The branches to fetch. Defaults to every branch.
+            operating_systems: The operating systems to fetch. Defaults to every operating system.
+            concurrency: The maximum number of histories fetched at once.
+            lazy: Whether entries should only be parsed when they are accessed. See DeploymentHistory.
+            return_exceptions: Whether to yield the ClientResponseError of histories that couldn't be fetched in place
+                               of their history instead of skipping them.
+
+        Yields:
+            Tuples of the branch, the operating system and its history, in order of completion.
+        """
+        if branches is None:
+            branches = list(RobloxBranch)
+        if operating_systems is None:
+            operating_systems = list(OperatingSystem)
+        operating_systems = list(operating_systems)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(branch: RobloxBranch, operating_system: OperatingSystem):
+            async with semaphore:
+                try:
+                    history = await self.get_deployments(branch=branch, operating_system=operating_system, lazy=lazy)
+                except ClientResponseError as exception:
+                    return branch, operating_system, exception
+            return branch, operating_system, history
+
+        tasks = [
+            asyncio.ensure_future(fetch(branch, operating_system))
+            for branch in branches
+            for operating_system in operating_systems
+        ]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                branch, operating_system, history = await task
+                if return_exceptions or not isinstance(history, ClientResponseError):
+                    yield branch, operating_system, history
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_all_deployments(
+            self,
+            branches: Optional[Iterable[RobloxBranch]] = None,
+            operating_systems: Optional[Iterable[OperatingSystem]] = None,
+            concurrency: int = 4,
+            lazy: bool = False,
+            return_exceptions: bool = False
+    ) -> Dict[Tuple[RobloxBranch, OperatingSystem], Union[DeploymentHistory, ClientResponseError]]:
+        """
+        Fetches the deployment histories of several branches and operating systems concurrently.
+        Takes the same arguments as iter_all_deployments.
+
+        Returns:
+            A dictionary where the keys are (branch, operating system) tuples and the values are their histories.
+            Histories that couldn't be fetched are left out, or have their ClientResponseError as the value if
+            return_exceptions is True.
+        """
+        return {
+            (branch, operating_system): history
+            async for branch, operating_system, history in self.iter_all_deployments(
+                branches=branches,
+                operating_systems=operating_systems,
+                concurrency=concurrency,
+                lazy=lazy,
+                return_exceptions=return_exceptions
             )
+        }
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from aiohttp import ClientResponse
+
+from .deployments import DeploymentClient, DeploymentPackage, _get_content_range_start
+
+ProgressCallback = Callable[[DeploymentPackage, int, int], None]
+
+
+class PackageChecksumError(Exception):
+    """
+    Raised when a downloaded package doesn't match the MD5 hash in its manifest.
+    """
+
+    def __init__(self, package: DeploymentPackage, md5: str):
+        super().__init__(f"Package {package.name} has MD5 hash {md5}, expected {package.md5}")
+        self.package: DeploymentPackage = package
+        self.md5: str = md5
+
+
+def _hash_file(path: Path, chunk_size: int):
+    md5 = hashlib.md5()
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            md5.update(chunk)
+    return md5
+
+
+def _write_chunk(file, md5, chunk: bytes):
+    md5.update(chunk)
+    file.write(chunk)
+
+
+class PackageDownloader:
+    """
+    Downloads deployment packages concurrently, verifying each against its MD5 hash.
+    Packages are streamed to a ".part" file next to their destination, and interrupted downloads are resumed from
+    where they left off.
+    """
+
+    def __init__(
+            self,
+            client: DeploymentClient,
+            concurrency: int = 8,
+            chunk_size: int = 1024 * 64,
+            progress: Optional[ProgressCallback] = None
+    ):
+        """
+        Arguments:
+            client: The client whose session is used to download packages.
+            concurrency: The maximum number of packages downloaded at once.
+            chunk_size: The number of bytes read from the network at a time.
+            progress: A function called with the package, the number of bytes downloaded so far and the total number
+                      of bytes each time a chunk of a package is written.
+        """
+        self._client: DeploymentClient = client
+        self.chunk_size: int = chunk_size
+        self.progress: Optional[ProgressCallback] = progress
+        self.concurrency: int = concurrency
+        # created on first use, since before Python 3.10 a semaphore is bound to the loop that is current when it's
+        # created
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _report_progress(self, package: DeploymentPackage, downloaded_size: int):
+        if self.progress is not None:
+            self.progress(package, downloaded_size, package.compressed_size)
+
+    async def download_package(self, package: DeploymentPackage, folder: Path) -> Path:
+        """
+        Downloads a package into a folder, unless a verified copy is already there.
+
+        Returns:
+            The path of the downloaded package.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await self._download_package(package, folder)
+
+    async def _download_package(self, package: DeploymentPackage, folder: Path) -> Path:
+        loop = asyncio.get_event_loop()
+        file_path = folder / package.name
+        part_path = folder / f"{package.name}.part"
+
+        if file_path.exists():
+            md5 = await loop.run_in_executor(None, _hash_file, file_path, self.chunk_size)
+            if md5.hexdigest() == package.md5.lower():
+                self._report_progress(package, package.compressed_size)
+                return file_path
+
+        try:
+            downloaded_size = part_path.stat().st_size
+        except FileNotFoundError:
+            downloaded_size = 0
+
+        if downloaded_size > package.compressed_size:
+            os.remove(part_path)
+            downloaded_size = 0
+
+        if downloaded_size:
+            md5 = await loop.run_in_executor(None, _hash_file, part_path, self.chunk_size)
+        else:
+            md5 = hashlib.md5()
+
+        headers = {"Range": f"bytes={downloaded_size}-"} if downloaded_size else None
+
+        needs_full_download = False
+
+        async with self._client.session.get(package.url, headers=headers) as package_response:
+            if package_response.status == 416 and downloaded_size == package.compressed_size:
+                # the part file was already complete, so there's nothing left to download
+                self._report_progress(package, downloaded_size)
+            else:
+                package_response.raise_for_status()
+
+                if package_response.status == 206:
+                    # the data is only appended if it starts where the part file ends
+                    range_start = _get_content_range_start(package_response.headers.get("Content-Range"))
+                    needs_full_download = range_start != downloaded_size
+                else:
+                    # the server sent the whole file
+                    downloaded_size = 0
+                    md5 = hashlib.md5()
+
+                if not needs_full_download:
+                    await self._write_response(package, package_response, part_path, md5, downloaded_size)
+
+        if needs_full_download:
+            async with self._client.session.get(package.url) as package_response:
+                package_response.raise_for_status()
+                md5 = hashlib.md5()
+                await self._write_response(package, package_response, part_path, md5, 0)
+
+        digest = md5.hexdigest()
+        if digest != package.md5.lower():
+            os.remove(part_path)
+            raise PackageChecksumError(package=package, md5=digest)
+
+        os.replace(part_path, file_path)
+        return file_path
+
+    async def _write_response(
+            self,
+            package: DeploymentPackage,
+            package_response: ClientResponse,
+            part_path: Path,
+            md5,
+            downloaded_size: int
+    ):
+        """
+        Writes a response's body to the part file, appending to it if downloaded_size is not 0.
+        Hashing and writing run in the default executor so they don't block the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        with open(part_path, "ab" if downloaded_size else "wb") as part_file:
+            async for chunk in package_response.content.iter_chunked(self.chunk_size):
+                await loop.run_in_executor(None, _write_chunk, part_file, md5, chunk)
+                downloaded_size += len(chunk)
+                self._report_progress(package, downloaded_size)
+
+    async def download_packages(self, packages: Iterable[DeploymentPackage], folder: Path) -> Dict[str, Path]:
+        """
+        Downloads packages into a folder concurrently.
+
+        Returns:
+            A dictionary where the keys are package names and the values are the paths they were downloaded to.
+        """
+        os.makedirs(folder, exist_ok=True)
+        packages = list(packages)
+        paths = await asyncio.gather(*[self.download_package(package, folder) for package in packages])
+        return {package.name: path for package, path in zip(packages, paths)}
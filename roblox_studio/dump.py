@@ -1,7 +1,14 @@
 from enum import Enum
-from typing import List, Optional, Literal, Union
+from typing import Any, Dict, Iterable, List, Optional, Literal, Union
 
 from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+
+try:
+    from pydantic import field_serializer
+except ImportError:
+    # pydantic 1 serializes lists by iterating over them, which builds lazily loaded members
+    field_serializer = None
 
 
 class ThreadSafety(Enum):
@@ -97,14 +104,27 @@ class ClassMemberCallback(BaseModel):
     thread_safety: ThreadSafety = Field(alias="ThreadSafety")
 
 
+ClassMember = Union[ClassMemberProperty, ClassMemberFunction, ClassMemberEvent, ClassMemberCallback]
+
+# picks the member model from MemberType instead of trying each one in turn
+_DiscriminatedClassMember = Annotated[ClassMember, Field(discriminator="member_type")]
+
+
 class APIDumpClass(BaseModel):
-    members: List[Union[ClassMemberProperty, ClassMemberFunction, ClassMemberEvent, ClassMemberCallback]] = Field(
-        alias="Members")
+    members: List[_DiscriminatedClassMember] = Field(alias="Members")
     tags: Optional[List[ClassTag]] = Field(None, alias="Tags")
     superclass: str = Field(alias="Superclass")
     name: str = Field(alias="Name")
     memory_category: MemoryCategory = Field(alias="MemoryCategory")
 
+    if field_serializer is not None:
+        @field_serializer("members", mode="wrap")
+        def _serialize_members(self, members, handler):
+            # pydantic reads list items directly, so lazily loaded members have to be built first
+            if isinstance(members, LazyMemberList):
+                members._build()
+            return handler(members)
+
 
 class APIDumpEnumItem(BaseModel):
     name: str = Field(alias="Name")
@@ -120,3 +140,205 @@ class APIDump(BaseModel):
     classes: List[APIDumpClass] = Field(alias="Classes")
     enums: List[APIDumpEnum] = Field(alias="Enums")
     version: int = Field(alias="Version")
+
+
+# these do what construct/model_construct do when every field is passed, without their per-call overhead
+if hasattr(BaseModel, "model_construct"):
+    def _construct(model_type, **values):
+        model = model_type.__new__(model_type)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__pydantic_fields_set__", set(values))
+        object.__setattr__(model, "__pydantic_extra__", None)
+        object.__setattr__(model, "__pydantic_private__", None)
+        return model
+else:
+    def _construct(model_type, **values):
+        model = model_type.__new__(model_type)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__fields_set__", set(values))
+        return model
+
+
+def _construct_value_type(data: Dict[str, Any]) -> ValueType:
+    return _construct(ValueType, category=data["Category"], name=data["Name"])
+
+
+def _construct_parameters(data: List[Dict[str, Any]]) -> List[FunctionParameter]:
+    return [
+        _construct(FunctionParameter, name=parameter["Name"], type=_construct_value_type(parameter["Type"]))
+        for parameter in data
+    ]
+
+
+def _construct_property(data: Dict[str, Any]) -> ClassMemberProperty:
+    security = data["Security"]
+    serialization = data["Serialization"]
+    return _construct(
+        ClassMemberProperty,
+        member_type="Property",
+        name=data["Name"],
+        category=data["Category"],
+        security=_construct(
+            MemberSecurity,
+            read=SecurityLevel(security["Read"]),
+            write=SecurityLevel(security["Write"])
+        ),
+        serialization=_construct(
+            MemberSerialization,
+            can_load=serialization["CanLoad"],
+            can_save=serialization["CanSave"]
+        ),
+        thread_safety=ThreadSafety(data["ThreadSafety"]),
+        value_type=_construct_value_type(data["ValueType"])
+    )
+
+
+def _construct_function(data: Dict[str, Any]) -> ClassMemberFunction:
+    return _construct(
+        ClassMemberFunction,
+        member_type="Function",
+        name=data["Name"],
+        parameters=_construct_parameters(data["Parameters"]),
+        return_type=_construct_value_type(data["ReturnType"]),
+        security=SecurityLevel(data["Security"]),
+        thread_safety=ThreadSafety(data["ThreadSafety"])
+    )
+
+
+def _construct_event(data: Dict[str, Any]) -> ClassMemberEvent:
+    return _construct(
+        ClassMemberEvent,
+        member_type="Event",
+        name=data["Name"],
+        parameters=_construct_parameters(data["Parameters"]),
+        security=SecurityLevel(data["Security"]),
+        thread_safety=ThreadSafety(data["ThreadSafety"])
+    )
+
+
+def _construct_callback(data: Dict[str, Any]) -> ClassMemberCallback:
+    return _construct(
+        ClassMemberCallback,
+        member_type="Callback",
+        name=data["Name"],
+        parameters=_construct_parameters(data["Parameters"]),
+        return_type=_construct_value_type(data["ReturnType"]),
+        security=SecurityLevel(data["Security"]),
+        thread_safety=ThreadSafety(data["ThreadSafety"])
+    )
+
+
+_member_constructors = {
+    "Property": _construct_property,
+    "Function": _construct_function,
+    "Event": _construct_event,
+    "Callback": _construct_callback,
+}
+
+
+def _construct_member(data: Dict[str, Any]) -> ClassMember:
+    member_type = data["MemberType"]
+    member_constructor = _member_constructors.get(member_type)
+    if member_constructor is None:
+        raise ValueError(f"Unknown member type {member_type!r}")
+    return member_constructor(data)
+
+
+class LazyMemberList(list):
+    """
+    The members of a class that was loaded lazily. It is a list, but the raw member data is only turned into member
+    objects when the list is first used.
+    Code that reads a list's items without going through its methods, like json.dumps, sees an empty list until then.
+    Pydantic serialization builds the members first.
+    """
+
+    # copies made by pickle and copy are filled in without calling __init__
+    _raw_members: Optional[List[Dict[str, Any]]] = None
+
+    def __init__(self, members: Iterable[ClassMember] = (), raw_members: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(members)
+        self._raw_members: Optional[List[Dict[str, Any]]] = raw_members
+
+    def _build(self):
+        if self._raw_members is not None:
+            raw_members = self._raw_members
+            self._raw_members = None
+            list.extend(self, [_construct_member(raw_member) for raw_member in raw_members])
+
+    def __len__(self):
+        if self._raw_members is not None:
+            return len(self._raw_members)
+        return list.__len__(self)
+
+    def __radd__(self, other):
+        # list + LazyMemberList would otherwise read the members before they're built
+        if not isinstance(other, list):
+            return NotImplemented
+        self._build()
+        return other + list(self)
+
+
+def _make_building_method(name: str):
+    list_method = getattr(list, name)
+
+    def method(self, *args, **kwargs):
+        self._build()
+        return list_method(self, *args, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+# every other list method builds the members first
+for _method_name in (
+        "__getitem__", "__setitem__", "__delitem__", "__iter__", "__reversed__", "__contains__", "__eq__", "__ne__",
+        "__lt__", "__le__", "__gt__", "__ge__", "__add__", "__iadd__", "__mul__", "__rmul__", "__imul__", "__repr__",
+        "__reduce_ex__", "append", "extend", "insert", "remove", "pop", "clear", "index", "count", "sort", "reverse",
+        "copy"
+):
+    setattr(LazyMemberList, _method_name, _make_building_method(_method_name))
+
+
+
+def _construct_class(data: Dict[str, Any], lazy: bool) -> APIDumpClass:
+    tags = data.get("Tags")
+    raw_members = data["Members"]
+    return _construct(
+        APIDumpClass,
+        members=(
+            LazyMemberList(raw_members=raw_members) if lazy
+            else [_construct_member(raw_member) for raw_member in raw_members]
+        ),
+        tags=[ClassTag(tag) for tag in tags] if tags is not None else None,
+        superclass=data["Superclass"],
+        name=data["Name"],
+        memory_category=MemoryCategory(data["MemoryCategory"])
+    )
+
+
+def _construct_enum(data: Dict[str, Any]) -> APIDumpEnum:
+    return _construct(
+        APIDumpEnum,
+        items=[_construct(APIDumpEnumItem, name=item["Name"], value=item["Value"]) for item in data["Items"]],
+        name=data["Name"]
+    )
+
+
+def construct_api_dump(data: Dict[str, Any], lazy: bool = False) -> APIDump:
+    """
+    Builds an API dump from its raw JSON representation without validating it.
+    This is much faster than APIDump(**data), but the data must be a well-formed dump: missing fields raise KeyError
+    and fields of the wrong type are not caught. It is faster still inside utilities.paused_gc, if pausing garbage
+    collection for the whole process is acceptable.
+
+    Arguments:
+        data: The raw JSON representation of the dump.
+        lazy: Whether to only build each class's members when they are first accessed. Lazily loaded classes have a
+              LazyMemberList, a list that builds its members when it is first used.
+    """
+    return _construct(
+        APIDump,
+        classes=[_construct_class(dump_class, lazy) for dump_class in data["Classes"]],
+        enums=[_construct_enum(dump_enum) for dump_enum in data["Enums"]],
+        version=data["Version"]
+    )
@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+import mmap
+from functools import lru_cache
+from pathlib import Path
+from struct import Struct
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .dump import APIDump, APIDumpClass, APIDumpEnum, APIDumpEnumItem, ClassMember, ClassMemberCallback, \
+    ClassMemberEvent, ClassMemberFunction, ClassMemberProperty, ClassTag, FunctionParameter, MemberSecurity, \
+    MemberSerialization, MemoryCategory, SecurityLevel, ThreadSafety, ValueType, _construct
+from .utilities import write_file_atomic
+
+# the layout of a binary dump, with all integers little-endian:
+#
+#     header
+#     string offsets    string_count + 1 offsets into the string data
+#     string data       the UTF-8 bytes of every distinct string, back to back
+#     value types       (category string, name string) for every distinct ValueType
+#     class table       (name string, record offset) for every class, in dump order
+#     enum table        (name string, record offset) for every enum, in dump order
+#     records           the class and enum records that the tables point to
+#
+# strings and value types are referred to by their index, which takes 2 bytes if there are few enough of them and 4
+# bytes otherwise. enum fields like security levels are stored as their index in their Enum class.
+
+_magic = b"RBXD"
+# must be bumped whenever the layout or the order of any of the enums below changes
+_format_version = 2
+
+_header = Struct("<4sHBxiIIIIIIIIII")
+
+_security_levels = list(SecurityLevel)
+_thread_safeties = list(ThreadSafety)
+_memory_categories = list(MemoryCategory)
+_class_tags = list(ClassTag)
+
+_security_level_codes = {security_level: code for code, security_level in enumerate(_security_levels)}
+_thread_safety_codes = {thread_safety: code for code, thread_safety in enumerate(_thread_safeties)}
+_memory_category_codes = {memory_category: code for code, memory_category in enumerate(_memory_categories)}
+_class_tag_codes = {class_tag: code for code, class_tag in enumerate(_class_tags)}
+
+_property_code = 0
+_function_code = 1
+_event_code = 2
+_callback_code = 3
+
+_no_tags = 0xFF
+
+BinaryDumpData = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class _Structs:
+    """
+    The record structs for one index size. X in the formats below is a string or value type index.
+    """
+
+    def __init__(self, index_format: str):
+        def make_struct(record_format: str) -> Struct:
+            return Struct("<" + record_format.replace("X", index_format))
+
+        self.table_entry: Struct = make_struct("XI")
+        self.value_type: Struct = make_struct("XX")
+        self.class_record: Struct = make_struct("XBBI")
+        self.enum_record: Struct = make_struct("I")
+        # enum item values are 64-bit since some enums use values outside the int32 range
+        self.enum_item: Struct = make_struct("Xq")
+        # member type, name, category, read security, write security, can load | can save << 1, thread safety,
+        # value type
+        self.property: Struct = make_struct("BXXBBBBX")
+        # member type, name, parameter count, return type, security, thread safety
+        self.function: Struct = make_struct("BXHXBB")
+        # member type, name, parameter count, security, thread safety
+        self.event: Struct = make_struct("BXHBB")
+        self.parameter: Struct = make_struct("XX")
+
+
+@lru_cache(maxsize=None)
+def _get_structs(index_size: int) -> _Structs:
+    return _Structs("H" if index_size == 2 else "I")
+
+
+class _BinaryDumpEncoder:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.value_types: Dict[Tuple[int, int], int] = {}
+
+    def add_string(self, string: str) -> int:
+        index = self.strings.get(string)
+        if index is None:
+            index = self.strings[string] = len(self.strings)
+        return index
+
+    def add_value_type(self, value_type: ValueType) -> int:
+        key = (self.add_string(value_type.category), self.add_string(value_type.name))
+        index = self.value_types.get(key)
+        if index is None:
+            index = self.value_types[key] = len(self.value_types)
+        return index
+
+    def collect(self, dump: APIDump):
+        # indexes are assigned before anything is written so the index size is known up front
+        for dump_class in dump.classes:
+            self.add_string(dump_class.name)
+            self.add_string(dump_class.superclass)
+            for member in dump_class.members:
+                self.add_string(member.name)
+                if isinstance(member, ClassMemberProperty):
+                    self.add_string(member.category)
+                    self.add_value_type(member.value_type)
+                    continue
+                for parameter in member.parameters:
+                    self.add_string(parameter.name)
+                    self.add_value_type(parameter.type)
+                if isinstance(member, (ClassMemberFunction, ClassMemberCallback)):
+                    self.add_value_type(member.return_type)
+        for dump_enum in dump.enums:
+            self.add_string(dump_enum.name)
+            for item in dump_enum.items:
+                self.add_string(item.name)
+
+    def encode_member(self, structs: _Structs, member: ClassMember, records: bytearray):
+        strings = self.strings
+        if isinstance(member, ClassMemberProperty):
+            records += structs.property.pack(
+                _property_code,
+                strings[member.name],
+                strings[member.category],
+                _security_level_codes[member.security.read],
+                _security_level_codes[member.security.write],
+                member.serialization.can_load | member.serialization.can_save << 1,
+                _thread_safety_codes[member.thread_safety],
+                self.add_value_type(member.value_type)
+            )
+            return
+
+        if isinstance(member, ClassMemberEvent):
+            records += structs.event.pack(
+                _event_code,
+                strings[member.name],
+                len(member.parameters),
+                _security_level_codes[member.security],
+                _thread_safety_codes[member.thread_safety]
+            )
+        else:
+            records += structs.function.pack(
+                _function_code if isinstance(member, ClassMemberFunction) else _callback_code,
+                strings[member.name],
+                len(member.parameters),
+                self.add_value_type(member.return_type),
+                _security_level_codes[member.security],
+                _thread_safety_codes[member.thread_safety]
+            )
+        for parameter in member.parameters:
+            records += structs.parameter.pack(strings[parameter.name], self.add_value_type(parameter.type))
+
+    def encode(self, dump: APIDump) -> bytes:
+        self.collect(dump)
+        index_size = 2 if max(len(self.strings), len(self.value_types)) <= 0xFFFF else 4
+        structs = _get_structs(index_size)
+        strings = self.strings
+
+        records = bytearray()
+        class_table = bytearray()
+        for dump_class in dump.classes:
+            class_table += structs.table_entry.pack(strings[dump_class.name], len(records))
+            tags = dump_class.tags
+            records += structs.class_record.pack(
+                strings[dump_class.superclass],
+                _memory_category_codes[dump_class.memory_category],
+                _no_tags if tags is None else len(tags),
+                len(dump_class.members)
+            )
+            if tags:
+                records += bytes(_class_tag_codes[tag] for tag in tags)
+            for member in dump_class.members:
+                self.encode_member(structs, member, records)
+
+        enum_table = bytearray()
+        for dump_enum in dump.enums:
+            enum_table += structs.table_entry.pack(strings[dump_enum.name], len(records))
+            records += structs.enum_record.pack(len(dump_enum.items))
+            for item in dump_enum.items:
+                records += structs.enum_item.pack(strings[item.name], item.value)
+
+        string_data = bytearray()
+        string_offsets = [0]
+        for string in strings:
+            string_data += string.encode("utf-8")
+            string_offsets.append(len(string_data))
+        string_offset_data = Struct(f"<{len(string_offsets)}I").pack(*string_offsets)
+
+        value_type_data = bytearray()
+        for category_index, name_index in self.value_types:
+            value_type_data += structs.value_type.pack(category_index, name_index)
+
+        strings_offset = _header.size
+        string_data_offset = strings_offset + len(string_offset_data)
+        value_types_offset = string_data_offset + len(string_data)
+        classes_offset = value_types_offset + len(value_type_data)
+        enums_offset = classes_offset + len(class_table)
+        records_offset = enums_offset + len(enum_table)
+
+        header = _header.pack(
+            _magic,
+            _format_version,
+            index_size,
+            dump.version,
+            len(strings),
+            len(self.value_types),
+            len(dump.classes),
+            len(dump.enums),
+            strings_offset,
+            string_data_offset,
+            value_types_offset,
+            classes_offset,
+            enums_offset,
+            records_offset
+        )
+        return b"".join([header, string_offset_data, string_data, value_type_data, class_table, enum_table, records])
+
+
+def encode_api_dump(dump: APIDump) -> bytes:
+    """
+    Encodes an API dump into the compact binary format read by BinaryAPIDump.
+    """
+    return _BinaryDumpEncoder().encode(dump)
+
+
+def write_api_dump_binary(path: Path, dump: APIDump):
+    """
+    Encodes an API dump into the compact binary format and writes it to a file atomically.
+    """
+    write_file_atomic(path, encode_api_dump(dump))
+
+
+class BinaryAPIDump:
+    """
+    An API dump in the compact binary format. Classes and enums are decoded individually when they are requested, so
+    looking at a few classes doesn't require decoding the rest. Decoded objects are shared with ValueType objects
+    being shared between members, so they should not be modified.
+    """
+
+    def __init__(self, data: BinaryDumpData):
+        """
+        Arguments:
+            data: The encoded dump. This can be a memory map of a file, which is only read from as objects are decoded.
+        """
+        self._data: BinaryDumpData = data
+        self._mmap: Optional[mmap.mmap] = None
+
+        try:
+            (
+                magic, format_version, index_size, self.version,
+                self._string_count, self._value_type_count, self._class_count, self._enum_count,
+                self._strings_offset, self._string_data_offset, self._value_types_offset,
+                self._classes_offset, self._enums_offset, self._records_offset
+            ) = _header.unpack_from(data, 0)
+        except Exception as exception:
+            raise ValueError("Data is too short to be a binary API dump") from exception
+        if magic != _magic:
+            raise ValueError("Data is not a binary API dump")
+        if format_version != _format_version:
+            raise ValueError(f"Unsupported binary API dump format version {format_version}")
+
+        self._structs: _Structs = _get_structs(index_size)
+
+        self._string_offsets: Optional[Tuple[int, ...]] = None
+        self._strings: List[Optional[str]] = [None] * self._string_count
+        self._value_types: List[Optional[ValueType]] = [None] * self._value_type_count
+        self._class_offsets: Optional[Dict[str, int]] = None
+        self._enum_offsets: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_file(cls, path: Path) -> BinaryAPIDump:
+        """
+        Opens a binary dump file by memory mapping it. Call close() or use the dump as a context manager to unmap it.
+        """
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            binary_dump = cls(data)
+        except BaseException:
+            data.close()
+            raise
+        binary_dump._mmap = data
+        return binary_dump
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_string(self, index: int) -> str:
+        string = self._strings[index]
+        if string is None:
+            string_offsets = self._string_offsets
+            if string_offsets is None:
+                string_offsets = self._string_offsets = Struct(f"<{self._string_count + 1}I").unpack_from(
+                    self._data, self._strings_offset
+                )
+            start = self._string_data_offset + string_offsets[index]
+            end = self._string_data_offset + string_offsets[index + 1]
+            string = self._strings[index] = str(self._data[start:end], "utf-8")
+        return string
+
+    def _get_value_type(self, index: int) -> ValueType:
+        value_type = self._value_types[index]
+        if value_type is None:
+            category_index, name_index = self._structs.value_type.unpack_from(
+                self._data, self._value_types_offset + index * self._structs.value_type.size
+            )
+            value_type = self._value_types[index] = _construct(
+                ValueType,
+                category=self._get_string(category_index),
+                name=self._get_string(name_index)
+            )
+        return value_type
+
+    def _iter_table(self, offset: int, count: int) -> Iterator[Tuple[str, int]]:
+        table_entry = self._structs.table_entry
+        for name_index, record_offset in table_entry.iter_unpack(
+                self._data[offset:offset + count * table_entry.size]
+        ):
+            yield self._get_string(name_index), self._records_offset + record_offset
+
+    def _get_class_offsets(self) -> Dict[str, int]:
+        if self._class_offsets is None:
+            self._class_offsets = dict(self._iter_table(self._classes_offset, self._class_count))
+        return self._class_offsets
+
+    def _get_enum_offsets(self) -> Dict[str, int]:
+        if self._enum_offsets is None:
+            self._enum_offsets = dict(self._iter_table(self._enums_offset, self._enum_count))
+        return self._enum_offsets
+
+    @property
+    def class_names(self) -> List[str]:
+        return list(self._get_class_offsets())
+
+    @property
+    def enum_names(self) -> List[str]:
+        return list(self._get_enum_offsets())
+
+    def _decode_parameters(self, offset: int, count: int) -> Tuple[List[FunctionParameter], int]:
+        parameter_struct = self._structs.parameter
+        parameters = []
+        for _ in range(count):
+            name_index, type_index = parameter_struct.unpack_from(self._data, offset)
+            offset += parameter_struct.size
+            parameters.append(_construct(
+                FunctionParameter,
+                name=self._get_string(name_index),
+                type=self._get_value_type(type_index)
+            ))
+        return parameters, offset
+
+    def _decode_member(self, offset: int) -> Tuple[ClassMember, int]:
+        data = self._data
+        structs = self._structs
+        get_string = self._get_string
+        member_code = data[offset]
+
+        if member_code == _property_code:
+            (
+                _, name_index, category_index, read_code, write_code, serialization_bits, thread_safety_code,
+                value_type_index
+            ) = structs.property.unpack_from(data, offset)
+            member = _construct(
+                ClassMemberProperty,
+                member_type="Property",
+                name=get_string(name_index),
+                category=get_string(category_index),
+                security=_construct(
+                    MemberSecurity,
+                    read=_security_levels[read_code],
+                    write=_security_levels[write_code]
+                ),
+                serialization=_construct(
+                    MemberSerialization,
+                    can_load=bool(serialization_bits & 1),
+                    can_save=bool(serialization_bits & 2)
+                ),
+                thread_safety=_thread_safeties[thread_safety_code],
+                value_type=self._get_value_type(value_type_index)
+            )
+            return member, offset + structs.property.size
+
+        if member_code == _event_code:
+            _, name_index, parameter_count, security_code, thread_safety_code = structs.event.unpack_from(data, offset)
+            parameters, offset = self._decode_parameters(offset + structs.event.size, parameter_count)
+            member = _construct(
+                ClassMemberEvent,
+                member_type="Event",
+                name=get_string(name_index),
+                parameters=parameters,
+                security=_security_levels[security_code],
+                thread_safety=_thread_safeties[thread_safety_code]
+            )
+            return member, offset
+
+        if member_code in (_function_code, _callback_code):
+            (
+                _, name_index, parameter_count, return_type_index, security_code, thread_safety_code
+            ) = structs.function.unpack_from(data, offset)
+            parameters, offset = self._decode_parameters(offset + structs.function.size, parameter_count)
+            is_function = member_code == _function_code
+            member = _construct(
+                ClassMemberFunction if is_function else ClassMemberCallback,
+                member_type="Function" if is_function else "Callback",
+                name=get_string(name_index),
+                parameters=parameters,
+                return_type=self._get_value_type(return_type_index),
+                security=_security_levels[security_code],
+                thread_safety=_thread_safeties[thread_safety_code]
+            )
+            return member, offset
+
+        raise ValueError(f"Unknown member type code {member_code} at offset {offset}")
+
+    def _decode_class(self, name: str, offset: int) -> APIDumpClass:
+        class_record = self._structs.class_record
+        superclass_index, memory_category_code, tag_count, member_count = class_record.unpack_from(self._data, offset)
+        offset += class_record.size
+
+        tags = None
+        if tag_count != _no_tags:
+            tags = [_class_tags[code] for code in self._data[offset:offset + tag_count]]
+            offset += tag_count
+
+        members = []
+        for _ in range(member_count):
+            member, offset = self._decode_member(offset)
+            members.append(member)
+
+        return _construct(
+            APIDumpClass,
+            members=members,
+            tags=tags,
+            superclass=self._get_string(superclass_index),
+            name=name,
+            memory_category=_memory_categories[memory_category_code]
+        )
+
+    def _decode_enum(self, name: str, offset: int) -> APIDumpEnum:
+        enum_item = self._structs.enum_item
+        (item_count,) = self._structs.enum_record.unpack_from(self._data, offset)
+        offset += self._structs.enum_record.size
+        items = [
+            _construct(APIDumpEnumItem, name=self._get_string(name_index), value=value)
+            for name_index, value in enum_item.iter_unpack(self._data[offset:offset + item_count * enum_item.size])
+        ]
+        return _construct(APIDumpEnum, items=items, name=name)
+
+    def get_class(self, name: str) -> Optional[APIDumpClass]:
+        """
+        Decodes a single class, or returns None if the dump has no class with that name.
+        """
+        offset = self._get_class_offsets().get(name)
+        if offset is None:
+            return None
+        return self._decode_class(name, offset)
+
+    def get_enum(self, name: str) -> Optional[APIDumpEnum]:
+        """
+        Decodes a single enum, or returns None if the dump has no enum with that name.
+        """
+        offset = self._get_enum_offsets().get(name)
+        if offset is None:
+            return None
+        return self._decode_enum(name, offset)
+
+    def iter_classes(self) -> Iterator[APIDumpClass]:
+        for name, offset in self._iter_table(self._classes_offset, self._class_count):
+            yield self._decode_class(name, offset)
+
+    def iter_enums(self) -> Iterator[APIDumpEnum]:
+        for name, offset in self._iter_table(self._enums_offset, self._enum_count):
+            yield self._decode_enum(name, offset)
+
+    def to_api_dump(self) -> APIDump:
+        """
+        Decodes the whole dump.
+        """
+        return _construct(
+            APIDump,
+            classes=list(self.iter_classes()),
+            enums=list(self.iter_enums()),
+            version=self.version
+        )
+
+
+def decode_api_dump(data: BinaryDumpData) -> APIDump:
+    """
+    Decodes a whole API dump from the compact binary format.
+    Like construct_api_dump, it is faster inside utilities.paused_gc, if pausing garbage collection for the whole
+    process is acceptable.
+    """
+    return BinaryAPIDump(data).to_api_dump()
@@ -0,0 +1,107 @@
+import gzip
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import orjson
+
+from .dump import APIDump, construct_api_dump
+from .dump_binary import decode_api_dump, write_api_dump_binary
+from .utilities import write_file_atomic
+
+_unsafe_key_characters = re.compile(r"[^\w.-]")
+
+
+class APIDumpCache:
+    """
+    A cache of parsed API dumps, keyed by version hash for deployments or by binary fingerprint for local versions.
+    Each dump is stored on disk twice: as gzipped raw JSON, and in the compact binary format, which loads without
+    going through validation again and, unlike a pickle, can't run code when it is loaded. Loaded dumps are also kept
+    in memory and shared between callers, so they should not be modified.
+    """
+
+    def __init__(self, path: Path, keep_in_memory: bool = True):
+        """
+        Arguments:
+            path: The folder to store dumps in.
+            keep_in_memory: Whether to keep loaded dumps in memory.
+        """
+        self.path: Path = path
+        self.keep_in_memory: bool = keep_in_memory
+        self._dumps: Dict[str, APIDump] = {}
+
+    def _get_paths(self, key: str):
+        safe_key = _unsafe_key_characters.sub("_", key)
+        return self.path / f"{safe_key}.json.gz", self.path / f"{safe_key}.bin"
+
+    def _load_binary(self, binary_path: Path) -> Optional[APIDump]:
+        try:
+            with open(binary_path, "rb") as binary_file:
+                data = binary_file.read()
+        except FileNotFoundError:
+            return None
+
+        # files written by another format version, or damaged ones, are replaced from the JSON
+        try:
+            return decode_api_dump(data)
+        except Exception:
+            return None
+
+    def get_json(self, key: str) -> Optional[bytes]:
+        """
+        Gets the raw JSON of a cached dump.
+        """
+        json_path, _ = self._get_paths(key)
+        try:
+            with gzip.open(json_path, "rb") as json_file:
+                return json_file.read()
+        except FileNotFoundError:
+            return None
+
+    def get(self, key: str) -> Optional[APIDump]:
+        """
+        Gets a cached dump, or None if it isn't cached.
+        """
+        dump = self._dumps.get(key)
+        if dump is not None:
+            return dump
+
+        _, binary_path = self._get_paths(key)
+        dump = self._load_binary(binary_path)
+
+        if dump is None:
+            dump_json = self.get_json(key)
+            if dump_json is None:
+                return None
+            # the JSON was already parsed once when it was stored, so it is trusted
+            dump = construct_api_dump(orjson.loads(dump_json))
+            write_api_dump_binary(binary_path, dump)
+
+        if self.keep_in_memory:
+            self._dumps[key] = dump
+        return dump
+
+    def set(self, key: str, dump_json: bytes, dump: Optional[APIDump] = None) -> APIDump:
+        """
+        Stores a dump in the cache.
+
+        Arguments:
+            key: The key to store the dump under.
+            dump_json: The raw JSON of the dump.
+            dump: The parsed dump. If not specified, it is parsed from dump_json.
+
+        Returns:
+            The parsed dump.
+        """
+        if dump is None:
+            dump = APIDump(**orjson.loads(dump_json))
+
+        os.makedirs(self.path, exist_ok=True)
+        json_path, binary_path = self._get_paths(key)
+        write_file_atomic(json_path, gzip.compress(dump_json))
+        write_api_dump_binary(binary_path, dump)
+
+        if self.keep_in_memory:
+            self._dumps[key] = dump
+        return dump
@@ -0,0 +1,265 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .changes import ChangeType
+from .deployments import Deployment
+from .dump import APIDump, APIDumpClass, APIDumpEnum, APIDumpEnumItem, ClassMember, ClassMemberCallback, \
+    ClassMemberEvent, ClassMemberFunction, ClassMemberProperty
+from .dump_cache import APIDumpCache
+
+_class_fields = ("superclass", "memory_category", "tags")
+_member_fields = {
+    ClassMemberProperty: ("category", "security", "serialization", "thread_safety", "value_type"),
+    ClassMemberFunction: ("parameters", "return_type", "security", "thread_safety"),
+    ClassMemberEvent: ("parameters", "security", "thread_safety"),
+    ClassMemberCallback: ("parameters", "return_type", "security", "thread_safety"),
+}
+
+
+class FieldChange:
+    """
+    A change to a single field, like a member's security.
+    """
+
+    def __init__(self, name: str, old: Any, new: Any):
+        self.name: str = name
+        self.old: Any = old
+        self.new: Any = new
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name}: {self.old!r} -> {self.new!r}>"
+
+
+class ClassChange:
+    def __init__(
+            self,
+            change_type: ChangeType,
+            old: Optional[APIDumpClass],
+            new: Optional[APIDumpClass],
+            field_changes: Optional[List[FieldChange]] = None
+    ):
+        self.change_type: ChangeType = change_type
+        self.class_name: str = (new or old).name
+        self.old: Optional[APIDumpClass] = old
+        self.new: Optional[APIDumpClass] = new
+        self.field_changes: List[FieldChange] = field_changes or []
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.change_type.value} {self.class_name}>"
+
+
+class MemberChange:
+    def __init__(
+            self,
+            change_type: ChangeType,
+            class_name: str,
+            old: Optional[ClassMember],
+            new: Optional[ClassMember],
+            field_changes: Optional[List[FieldChange]] = None
+    ):
+        self.change_type: ChangeType = change_type
+        self.class_name: str = class_name
+        self.member_name: str = (new or old).name
+        self.old: Optional[ClassMember] = old
+        self.new: Optional[ClassMember] = new
+        self.field_changes: List[FieldChange] = field_changes or []
+
+    @property
+    def changed_fields(self) -> List[str]:
+        return [field_change.name for field_change in self.field_changes]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.change_type.value} {self.class_name}.{self.member_name}>"
+
+
+class EnumChange:
+    def __init__(self, change_type: ChangeType, old: Optional[APIDumpEnum], new: Optional[APIDumpEnum]):
+        self.change_type: ChangeType = change_type
+        self.enum_name: str = (new or old).name
+        self.old: Optional[APIDumpEnum] = old
+        self.new: Optional[APIDumpEnum] = new
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.change_type.value} {self.enum_name}>"
+
+
+class EnumItemChange:
+    def __init__(
+            self,
+            change_type: ChangeType,
+            enum_name: str,
+            old: Optional[APIDumpEnumItem],
+            new: Optional[APIDumpEnumItem]
+    ):
+        self.change_type: ChangeType = change_type
+        self.enum_name: str = enum_name
+        self.item_name: str = (new or old).name
+        self.old: Optional[APIDumpEnumItem] = old
+        self.new: Optional[APIDumpEnumItem] = new
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.change_type.value} {self.enum_name}.{self.item_name}>"
+
+
+class APIDumpDiff:
+    """
+    The changes between two API dumps.
+    Classes that were added or removed are listed in class_changes only; their members are not listed individually.
+    The same goes for enums and their items.
+    """
+
+    def __init__(self):
+        self.class_changes: List[ClassChange] = []
+        self.member_changes: List[MemberChange] = []
+        self.enum_changes: List[EnumChange] = []
+        self.enum_item_changes: List[EnumItemChange] = []
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.class_changes or self.member_changes or self.enum_changes or self.enum_item_changes)
+
+    def get_member_changes_by_field(self, field_name: str) -> List[MemberChange]:
+        """
+        Gets the changed members where a field, like "security" or "thread_safety", changed.
+        """
+        return [
+            member_change for member_change in self.member_changes
+            if member_change.change_type == ChangeType.changed and field_name in member_change.changed_fields
+        ]
+
+
+def _diff_fields(old: Any, new: Any, field_names: Iterable[str]) -> List[FieldChange]:
+    field_changes = []
+    for field_name in field_names:
+        old_value = getattr(old, field_name)
+        new_value = getattr(new, field_name)
+        if field_name == "tags":
+            # tag order isn't meaningful, and no tags is the same as an empty list of them
+            is_changed = set(old_value or ()) != set(new_value or ())
+        else:
+            is_changed = old_value != new_value
+        if is_changed:
+            field_changes.append(FieldChange(name=field_name, old=old_value, new=new_value))
+    return field_changes
+
+
+def _diff_members(old: ClassMember, new: ClassMember) -> List[FieldChange]:
+    if type(old) is not type(new):
+        return [FieldChange(name="member_type", old=old.member_type, new=new.member_type)]
+    return _diff_fields(old, new, _member_fields[type(old)])
+
+
+def _diff_by_name(old_items: Iterable[Any], new_items: Iterable[Any]):
+    """
+    Pairs up items by name. Yields (old, new) tuples where either side is None if the item was added or removed.
+    """
+    old_by_name: Dict[str, Any] = {item.name: item for item in old_items}
+    new_by_name: Dict[str, Any] = {item.name: item for item in new_items}
+
+    for name, old_item in old_by_name.items():
+        yield old_item, new_by_name.get(name)
+    for name, new_item in new_by_name.items():
+        if name not in old_by_name:
+            yield None, new_item
+
+
+def diff_api_dumps(old: APIDump, new: APIDump) -> APIDumpDiff:
+    """
+    Gets the changes between two API dumps.
+    Classes, members, enums and enum items are matched by name, so this runs in linear time.
+    """
+    diff = APIDumpDiff()
+
+    for old_class, new_class in _diff_by_name(old.classes, new.classes):
+        if new_class is None:
+            diff.class_changes.append(ClassChange(ChangeType.removed, old_class, None))
+            continue
+        if old_class is None:
+            diff.class_changes.append(ClassChange(ChangeType.added, None, new_class))
+            continue
+
+        field_changes = _diff_fields(old_class, new_class, _class_fields)
+        if field_changes:
+            diff.class_changes.append(ClassChange(ChangeType.changed, old_class, new_class, field_changes))
+
+        for old_member, new_member in _diff_by_name(old_class.members, new_class.members):
+            if new_member is None:
+                diff.member_changes.append(MemberChange(ChangeType.removed, new_class.name, old_member, None))
+            elif old_member is None:
+                diff.member_changes.append(MemberChange(ChangeType.added, new_class.name, None, new_member))
+            else:
+                field_changes = _diff_members(old_member, new_member)
+                if field_changes:
+                    diff.member_changes.append(MemberChange(
+                        ChangeType.changed, new_class.name, old_member, new_member, field_changes
+                    ))
+
+    for old_enum, new_enum in _diff_by_name(old.enums, new.enums):
+        if new_enum is None:
+            diff.enum_changes.append(EnumChange(ChangeType.removed, old_enum, None))
+            continue
+        if old_enum is None:
+            diff.enum_changes.append(EnumChange(ChangeType.added, None, new_enum))
+            continue
+
+        for old_item, new_item in _diff_by_name(old_enum.items, new_enum.items):
+            if new_item is None:
+                diff.enum_item_changes.append(EnumItemChange(ChangeType.removed, new_enum.name, old_item, None))
+            elif old_item is None:
+                diff.enum_item_changes.append(EnumItemChange(ChangeType.added, new_enum.name, None, new_item))
+            elif old_item.value != new_item.value:
+                diff.enum_item_changes.append(EnumItemChange(ChangeType.changed, new_enum.name, old_item, new_item))
+
+    return diff
+
+
+def diff_api_dump_chain(dumps: Iterable[APIDump]) -> Iterator[APIDumpDiff]:
+    """
+    Diffs each dump against the one before it. Each dump is only held until the next one has been diffed against it.
+    """
+    previous_dump = None
+    for dump in dumps:
+        if previous_dump is not None:
+            yield diff_api_dumps(previous_dump, dump)
+        previous_dump = dump
+
+
+async def iter_deployment_dump_diffs(
+        deployments: Iterable[Deployment],
+        cache: Optional[APIDumpCache] = None,
+        prefetch: int = 4
+) -> AsyncIterator[Tuple[Deployment, Deployment, APIDumpDiff]]:
+    """
+    Diffs the API dump of each deployment against the one of the deployment before it.
+    Each dump is downloaded and parsed once, and up to prefetch dumps are downloaded ahead of the one being diffed.
+
+    Arguments:
+        deployments: The deployments to diff, in order. For example, the Deployment entries of one type from a
+                     DeploymentHistory.
+        cache: A cache to load dumps from and add them to.
+        prefetch: The number of dumps to download ahead.
+
+    Yields:
+        Tuples of the older deployment, the newer deployment and the changes between their dumps.
+    """
+    deployments = list(deployments)
+    tasks: Dict[int, asyncio.Future] = {}
+
+    def schedule(index: int):
+        if index < len(deployments) and index not in tasks:
+            tasks[index] = asyncio.ensure_future(deployments[index].get_api_dump(cache=cache))
+
+    try:
+        previous_dump = None
+        for index, deployment in enumerate(deployments):
+            for prefetch_index in range(index, index + prefetch + 1):
+                schedule(prefetch_index)
+
+            dump = await tasks.pop(index)
+            if previous_dump is not None:
+                yield deployments[index - 1], deployment, diff_api_dumps(previous_dump, dump)
+            previous_dump = dump
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
@@ -0,0 +1,151 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from .dump import APIDump, APIDumpClass, APIDumpEnum, APIDumpEnumItem, ClassMember, ClassMemberProperty, SecurityLevel
+
+
+class APIDumpIndex:
+    """
+    Indexes an API dump for fast lookups of classes, enums, inheritance and members.
+    The index is built once from the dump and assumes that the dump is not modified afterwards. Results are shared
+    between callers and should not be modified either.
+    """
+
+    def __init__(self, dump: APIDump):
+        self.dump: APIDump = dump
+
+        self._classes: Dict[str, APIDumpClass] = {dump_class.name: dump_class for dump_class in dump.classes}
+        self._enums: Dict[str, APIDumpEnum] = {dump_enum.name: dump_enum for dump_enum in dump.enums}
+        self._enum_items: Dict[str, Dict[str, APIDumpEnumItem]] = {
+            dump_enum.name: {item.name: item for item in dump_enum.items}
+            for dump_enum in dump.enums
+        }
+
+        self._subclasses: Dict[str, List[APIDumpClass]] = {}
+        self._properties_by_value_type: Dict[str, List[Tuple[APIDumpClass, ClassMemberProperty]]] = {}
+        self._members_by_security: Dict[SecurityLevel, List[Tuple[APIDumpClass, ClassMember]]] = {}
+
+        for dump_class in dump.classes:
+            self._subclasses.setdefault(dump_class.superclass, []).append(dump_class)
+
+            for member in dump_class.members:
+                if isinstance(member, ClassMemberProperty):
+                    self._properties_by_value_type.setdefault(member.value_type.name, []).append((dump_class, member))
+                    security_levels = {member.security.read, member.security.write}
+                else:
+                    security_levels = {member.security}
+
+                for security_level in security_levels:
+                    self._members_by_security.setdefault(security_level, []).append((dump_class, member))
+
+        # filled in as classes are first queried
+        self._superclass_chains: Dict[str, List[APIDumpClass]] = {}
+        self._superclass_names: Dict[str, Set[str]] = {}
+        self._members: Dict[str, Dict[str, ClassMember]] = {}
+        self._member_owners: Dict[str, Dict[str, APIDumpClass]] = {}
+
+    def get_class(self, name: str) -> Optional[APIDumpClass]:
+        return self._classes.get(name)
+
+    def get_enum(self, name: str) -> Optional[APIDumpEnum]:
+        return self._enums.get(name)
+
+    def get_enum_item(self, enum_name: str, item_name: str) -> Optional[APIDumpEnumItem]:
+        return self._enum_items.get(enum_name, {}).get(item_name)
+
+    def get_superclass_chain(self, class_name: str) -> List[APIDumpClass]:
+        """
+        Gets the superclasses of a class, starting with its direct superclass.
+        """
+        chain = self._superclass_chains.get(class_name)
+        if chain is None:
+            chain = []
+            seen = {class_name}
+            dump_class = self._classes.get(class_name)
+            while dump_class is not None:
+                dump_class = self._classes.get(dump_class.superclass)
+                if dump_class is None or dump_class.name in seen:
+                    break
+                seen.add(dump_class.name)
+                chain.append(dump_class)
+            self._superclass_chains[class_name] = chain
+        return chain
+
+    def is_a(self, class_name: str, superclass_name: str) -> bool:
+        """
+        Checks whether a class is, or inherits from, another class.
+        """
+        if class_name == superclass_name:
+            return class_name in self._classes
+
+        superclass_names = self._superclass_names.get(class_name)
+        if superclass_names is None:
+            superclass_names = {dump_class.name for dump_class in self.get_superclass_chain(class_name)}
+            self._superclass_names[class_name] = superclass_names
+        return superclass_name in superclass_names
+
+    def get_subclasses(self, class_name: str, recursive: bool = False) -> List[APIDumpClass]:
+        """
+        Gets the classes that inherit directly from a class, or from it or any of its subclasses if recursive is True.
+        """
+        subclasses = self._subclasses.get(class_name, [])
+        if not recursive:
+            return subclasses
+
+        all_subclasses = []
+        pending = list(reversed(subclasses))
+        seen = {class_name}
+        while pending:
+            dump_class = pending.pop()
+            if dump_class.name in seen:
+                continue
+            seen.add(dump_class.name)
+            all_subclasses.append(dump_class)
+            pending.extend(reversed(self._subclasses.get(dump_class.name, [])))
+        return all_subclasses
+
+    def _index_members(self, class_name: str):
+        members: Dict[str, ClassMember] = {}
+        member_owners: Dict[str, APIDumpClass] = {}
+
+        dump_class = self._classes.get(class_name)
+        if dump_class is not None:
+            for owner in [*reversed(self.get_superclass_chain(class_name)), dump_class]:
+                for member in owner.members:
+                    members[member.name] = member
+                    member_owners[member.name] = owner
+
+        self._members[class_name] = members
+        self._member_owners[class_name] = member_owners
+
+    def get_members(self, class_name: str) -> Dict[str, ClassMember]:
+        """
+        Gets every member of a class, including inherited ones, keyed by name.
+        Members defined on a class take precedence over members of the same name on its superclasses.
+        """
+        if class_name not in self._members:
+            self._index_members(class_name)
+        return self._members[class_name]
+
+    def get_member(self, class_name: str, member_name: str) -> Optional[ClassMember]:
+        return self.get_members(class_name).get(member_name)
+
+    def get_member_owner(self, class_name: str, member_name: str) -> Optional[APIDumpClass]:
+        """
+        Gets the class that defines a member that is available on a class.
+        """
+        if class_name not in self._member_owners:
+            self._index_members(class_name)
+        return self._member_owners[class_name].get(member_name)
+
+    def get_properties_by_value_type(self, value_type_name: str) -> List[Tuple[APIDumpClass, ClassMemberProperty]]:
+        """
+        Gets every property with a value type, like "Vector3", along with the class that defines it.
+        """
+        return self._properties_by_value_type.get(value_type_name, [])
+
+    def get_members_by_security(self, security_level: SecurityLevel) -> List[Tuple[APIDumpClass, ClassMember]]:
+        """
+        Gets every member that requires a security level, along with the class that defines it.
+        Properties are included if either their read or write security matches.
+        """
+        return self._members_by_security.get(security_level, [])
@@ -0,0 +1,300 @@
+from pathlib import Path
+from functools import lru_cache
+from re import Pattern, compile
+from typing import Any, AsyncIterator, Iterator, List, Optional, Union
+
+import orjson
+from aiohttp import ClientResponse
+
+from .dump import APIDumpClass, APIDumpEnum, _construct_class, _construct_enum
+
+APIDumpItem = Union[APIDumpClass, APIDumpEnum]
+
+_whitespace = b" \t\r\n"
+_string_pattern = compile(rb'"(?:[^"\\]|\\.)*"')
+# skips everything up to the next bracket, stepping over strings so brackets inside them aren't counted
+_bracket_run_pattern = compile(rb'[^"{}\[\]]*(?:"(?:[^"\\]|\\.)*"[^"{}\[\]]*)*')
+_scalar_end_pattern = compile(rb"[,}\]\s]")
+_colon_pattern = compile(rb"\s*:")
+
+
+@lru_cache(maxsize=None)
+def _get_closing_brackets_pattern(count: int) -> Pattern:
+    return compile(rb"(?:[^}\]]*[}\]]){%d}" % count)
+
+
+_incomplete = object()
+
+_streamed_keys = {
+    "Classes": APIDumpClass,
+    "Enums": APIDumpEnum
+}
+
+
+class APIDumpStreamParser:
+    """
+    Parses the JSON of an API dump as it is fed in chunks, producing each class and enum as soon as its JSON is
+    complete. Only the class or enum being read is held in memory, along with the unparsed part of the last chunk.
+    """
+
+    def __init__(self, validate: bool = True):
+        """
+        Arguments:
+            validate: Whether to validate each class and enum. See construct_api_dump for what skipping validation
+                      means.
+        """
+        self.validate: bool = validate
+        self.version: Optional[int] = None
+
+        self._buffer: bytearray = bytearray()
+        self._position: int = 0
+        # the number of bytes that have been dropped from the start of the buffer
+        self._offset: int = 0
+        self._state: str = "start"
+        self._key: Optional[str] = None
+        # the bracket depth and scan position of the value being read, if it's an object or array
+        self._value_depth: int = 0
+        self._value_scan_position: int = 0
+        self._exact_scan: bool = False
+
+    def _skip_whitespace(self):
+        buffer = self._buffer
+        while self._position < len(buffer) and buffer[self._position] in _whitespace:
+            self._position += 1
+
+    def _find_container_end(self) -> Optional[int]:
+        # the value can't end before as many brackets have been closed as are open, so jump straight past that many
+        # closing brackets and count how many were opened on the way. this doesn't know about strings, so a bracket in
+        # a string can make it find the wrong end, which _read_value catches.
+        buffer = self._buffer
+        while self._value_depth:
+            match = _get_closing_brackets_pattern(self._value_depth).match(buffer, self._value_scan_position)
+            if match is None:
+                return None
+            segment_start, segment_end = match.span()
+            self._value_depth = buffer.count(b"{", segment_start, segment_end) + \
+                buffer.count(b"[", segment_start, segment_end)
+            self._value_scan_position = segment_end
+        return self._value_scan_position
+
+    def _find_container_end_exact(self) -> Optional[int]:
+        buffer = self._buffer
+        while self._value_depth:
+            bracket_position = _bracket_run_pattern.match(buffer, self._value_scan_position).end()
+            bracket = buffer[bracket_position:bracket_position + 1]
+            if bracket in (b"", b'"'):
+                # the chunk ends before the next bracket or in the middle of a string
+                self._value_scan_position = bracket_position
+                return None
+            if bracket in (b"{", b"["):
+                self._value_depth += 1
+            else:
+                self._value_depth -= 1
+            self._value_scan_position = bracket_position + 1
+        return self._value_scan_position
+
+    def _find_value_end(self, is_final: bool) -> Optional[int]:
+        buffer = self._buffer
+        start = self._position
+        first_byte = buffer[start:start + 1]
+
+        if first_byte == b'"':
+            match = _string_pattern.match(buffer, start)
+            return match.end() if match else None
+
+        if first_byte not in (b"{", b"["):
+            match = _scalar_end_pattern.search(buffer, start)
+            if match:
+                return match.start()
+            return len(buffer) if is_final else None
+
+        if self._value_scan_position <= start:
+            self._value_scan_position = start + 1
+            self._value_depth = 1
+
+        if self._exact_scan:
+            return self._find_container_end_exact()
+        return self._find_container_end()
+
+    def _restart_exact_scan(self):
+        self._exact_scan = True
+        self._value_scan_position = 0
+
+    def _read_value(self, is_final: bool) -> Any:
+        value_end = self._find_value_end(is_final)
+        if value_end is None:
+            if is_final and not self._exact_scan:
+                self._restart_exact_scan()
+                return self._read_value(is_final)
+            return _incomplete
+
+        try:
+            value = orjson.loads(self._buffer[self._position:value_end])
+        except orjson.JSONDecodeError:
+            if self._exact_scan:
+                raise
+            self._restart_exact_scan()
+            return self._read_value(is_final)
+
+        self._position = value_end
+        self._value_scan_position = 0
+        self._exact_scan = False
+        return value
+
+    def _make_item(self, data: dict) -> APIDumpItem:
+        model_type = _streamed_keys[self._key]
+        if self.validate:
+            return model_type(**data)
+        if model_type is APIDumpClass:
+            return _construct_class(data, lazy=False)
+        return _construct_enum(data)
+
+    def _make_error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at position {self._offset + self._position} of the dump's JSON")
+
+    def _expect(self, character: bytes):
+        if self._buffer[self._position:self._position + 1] != character:
+            raise self._make_error(f"Expected {character.decode()!r}")
+        self._position += 1
+
+    def _parse(self, is_final: bool) -> List[APIDumpItem]:
+        items = []
+        buffer = self._buffer
+
+        while True:
+            self._skip_whitespace()
+            if self._position >= len(buffer):
+                break
+
+            if self._state == "start":
+                self._expect(b"{")
+                self._state = "key"
+
+            elif self._state == "key":
+                character = buffer[self._position:self._position + 1]
+                if character == b",":
+                    self._position += 1
+                    continue
+                if character == b"}":
+                    self._position += 1
+                    self._state = "end"
+                    continue
+
+                match = _string_pattern.match(buffer, self._position)
+                colon_match = match and _colon_pattern.match(buffer, match.end())
+                if not colon_match:
+                    if is_final or (match and buffer[match.end():].strip()):
+                        raise self._make_error("Expected a key")
+                    break
+
+                self._key = orjson.loads(match.group())
+                self._position = colon_match.end()
+                self._state = "array start" if self._key in _streamed_keys else "value"
+
+            elif self._state == "value":
+                value = self._read_value(is_final)
+                if value is _incomplete:
+                    break
+                if self._key == "Version":
+                    self.version = value
+                self._state = "key"
+
+            elif self._state == "array start":
+                self._expect(b"[")
+                self._state = "array"
+
+            elif self._state == "array":
+                character = buffer[self._position:self._position + 1]
+                if character == b",":
+                    self._position += 1
+                    continue
+                if character == b"]":
+                    self._position += 1
+                    self._state = "key"
+                    continue
+
+                value = self._read_value(is_final)
+                if value is _incomplete:
+                    break
+                items.append(self._make_item(value))
+
+            elif self._state == "end":
+                raise self._make_error("Unexpected data after the end of the dump")
+
+        # drop everything that has been parsed so the buffer only holds the value being read
+        if self._position:
+            del buffer[:self._position]
+            self._offset += self._position
+            if self._value_scan_position:
+                self._value_scan_position -= self._position
+            self._position = 0
+
+        return items
+
+    def feed(self, data: bytes) -> List[APIDumpItem]:
+        """
+        Feeds the next chunk of the dump's JSON to the parser.
+
+        Returns:
+            The classes and enums that were completed by this chunk.
+        """
+        self._buffer += data
+        return self._parse(is_final=False)
+
+    def close(self) -> List[APIDumpItem]:
+        """
+        Tells the parser that the dump's JSON has ended.
+
+        Returns:
+            The classes and enums that were completed by the end of the JSON.
+        """
+        items = self._parse(is_final=True)
+        if self._state != "end":
+            raise ValueError("The dump's JSON ended before the dump did")
+        return items
+
+
+def iter_api_dump_file(path: Path, chunk_size: int = 1024 * 64, validate: bool = True) -> Iterator[APIDumpItem]:
+    """
+    Parses an API dump file one class or enum at a time.
+
+    Arguments:
+        path: The path of the dump's JSON file.
+        chunk_size: The number of bytes read from the file at a time.
+        validate: Whether to validate each class and enum.
+
+    Yields:
+        Each APIDumpClass and then each APIDumpEnum in the dump, in order.
+    """
+    parser = APIDumpStreamParser(validate=validate)
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def iter_api_dump_response(
+        response: ClientResponse,
+        chunk_size: int = 1024 * 64,
+        validate: bool = True
+) -> AsyncIterator[APIDumpItem]:
+    """
+    Parses an API dump one class or enum at a time as it is downloaded.
+
+    Arguments:
+        response: The response whose body is the dump's JSON.
+        chunk_size: The number of bytes read from the network at a time.
+        validate: Whether to validate each class and enum.
+
+    Yields:
+        Each APIDumpClass and then each APIDumpEnum in the dump, in order.
+    """
+    parser = APIDumpStreamParser(validate=validate)
+    async for chunk in response.content.iter_chunked(chunk_size):
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
@@ -1,18 +1,61 @@
+import asyncio
+import hashlib
 import os
-import random
-import string
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Union
 
 import orjson
 
-from .dump import APIDump
+from .assets import RbxAssetIndex
+from .dump import APIDump, construct_api_dump
+from .dump_binary import decode_api_dump, encode_api_dump
+from .dump_cache import APIDumpCache
+from .dump_stream import APIDumpItem, iter_api_dump_file
+from .fflags import FFlagReader
+from .manifests import FileHashCache, FileManifest, build_file_manifest
+from .rbxm import RbxmFormatError, RbxmIndex, RbxmInfo
+from .utilities import write_file_atomic
 
-_temp_folder = Path(tempfile.gettempdir())
-_seed_letters = list(string.ascii_letters)
+
+class APIDumpGenerationError(Exception):
+    """
+    Raised when Roblox Studio exits unsuccessfully or without writing an API dump.
+    """
+
+    def __init__(self, version: "Version", return_code: Optional[int], stderr: bytes):
+        super().__init__(f"Failed to generate an API dump with {version.binary_file_path} (exit code {return_code})")
+        self.version: Version = version
+        self.return_code: Optional[int] = return_code
+        self.stderr: bytes = stderr
+
+
+def _make_temp_dump_path() -> Path:
+    # mkstemp creates the file, so the name can't be taken by anything else before Studio writes to it
+    file_descriptor, temp_path = tempfile.mkstemp(prefix="ro.py-studio-", suffix="_dump.json")
+    os.close(file_descriptor)
+    return Path(temp_path)
+
+
+def _remove_temp_dump(path: Path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _parse_api_dump_file(path: Path, validate: bool) -> bytes:
+    # runs in worker processes, so the dump is sent back in the binary format, which is much smaller and faster to
+    # load than a pickle
+    with open(path, "rb") as file:
+        dump_json = orjson.loads(file.read())
+    dump = APIDump(**dump_json) if validate else construct_api_dump(dump_json)
+    return encode_api_dump(dump)
 
 
 class VersionType(Enum):
@@ -31,6 +74,10 @@ class Version:
         self.path: Path = path
         self.version_type: VersionType = version_type
 
+        self._fflag_override_reader: Optional[FFlagReader] = None
+        self._fflag_override_lock: threading.Lock = threading.Lock()
+        self._rbxasset_index: Optional[RbxAssetIndex] = None
+
     @property
     def app_settings_file_path(self):
         return self._root_resources_path / "AppSettings.xml"
@@ -116,40 +163,135 @@ class Version:
         else:
             return self._root_resources_path / "RobloxStudioBeta.exe"
 
-    def get_fflag_overrides(self) -> Dict[str, Any]:
+    @property
+    def manifest_folder_paths(self) -> List[Path]:
         """
-        Gets the active FFlag overrides for this Studio version.
-        If no overrides have been set, an empty dictionary is returned.
+        The folders whose files are hashed by build_file_manifest.
+        """
+        return [
+            self.content_folder_path,
+            self.extra_content_folder_path,
+            self.platform_content_folder_path,
+            self.built_in_plugins_folder_path,
+            self.built_in_standalone_plugins_folder_path,
+            self.qml_folder_path,
+            self.shaders_folder_path,
+            self.ssl_folder_path,
+            self.studio_fonts_folder_path
+        ]
+
+    def build_file_manifest(
+            self,
+            hash_cache: Optional[FileHashCache] = None,
+            folders: Optional[Iterable[Path]] = None,
+            max_workers: Optional[int] = None
+    ) -> FileManifest:
         """
+        Hashes the files in this version's content folders in parallel. Manifests of two versions can be compared with
+        diff_file_manifests from roblox_studio.manifests.
 
-        try:
-            with open(
-                    file=self.client_app_settings_file_path,
-                    mode="rb"
-            ) as client_app_settings_file:
-                data = client_app_settings_file.read()
+        Arguments:
+            hash_cache: A cache of hashes, so that files that haven't changed since they were last hashed aren't hashed
+                        again.
+            folders: The folders to hash. Defaults to manifest_folder_paths.
+            max_workers: The number of threads to hash files in.
+
+        Returns:
+            The manifest, with paths relative to this version's folder.
+        """
+        return build_file_manifest(
+            root=self.path,
+            folders=self.manifest_folder_paths if folders is None else folders,
+            hash_cache=hash_cache,
+            max_workers=max_workers
+        )
 
-            return orjson.loads(data)
+    def get_built_in_plugins(
+            self,
+            index: Optional[RbxmIndex] = None,
+            return_exceptions: bool = False
+    ) -> List[Union[RbxmInfo, RbxmFormatError]]:
+        """
+        Reads the header and chunk table of each plugin in this version's built-in plugin folders.
+
+        Arguments:
+            index: The index to read the plugins with. Keeping one, or its cache file, between scans means plugins
+                   are only read again once they change.
+            return_exceptions: Whether to return the RbxmFormatError of plugins that can't be read in place of their
+                               information instead of raising the first one. See RbxmIndex.scan.
+        """
+        if index is None:
+            index = RbxmIndex()
+        return index.scan(
+            [self.built_in_plugins_folder_path, self.built_in_standalone_plugins_folder_path],
+            return_exceptions=return_exceptions
+        )
+
+    def _get_fflag_override_reader(self) -> FFlagReader:
+        path = self.client_app_settings_file_path
+        if self._fflag_override_reader is None or self._fflag_override_reader.path != path:
+            self._fflag_override_reader = FFlagReader(path)
+        return self._fflag_override_reader
+
+    def _read_fflag_overrides(self) -> Mapping[str, Any]:
+        try:
+            return self._get_fflag_override_reader().get()
         except FileNotFoundError:
             return {}
 
-    def set_fflag_overrides(self, overrides: Dict[str, Any]):
+    def _write_fflag_overrides(self, current: Mapping[str, Any], overrides: Dict[str, Any]) -> bool:
+        # a missing file is the same as having no overrides
+        if overrides == dict(current):
+            return False
+
+        os.makedirs(self.client_settings_folder_path, exist_ok=True)
+        write_file_atomic(self.client_app_settings_file_path, orjson.dumps(overrides))
+        return True
+
+    def get_fflag_overrides(self) -> Dict[str, Any]:
         """
-        Sets the FFlag overrides for this Studio version.
+        Gets the active FFlag overrides for this Studio version.
+        If no overrides have been set, an empty dictionary is returned.
+        The file is only read again when it changes.
         """
+        return dict(self._read_fflag_overrides())
 
-        try:
-            os.mkdir(self.client_settings_folder_path)
-        except FileExistsError:
-            pass
+    def set_fflag_overrides(self, overrides: Dict[str, Any]) -> bool:
+        """
+        Sets the FFlag overrides for this Studio version, replacing all of the existing ones.
+        The file is replaced atomically, so Studio never sees a partially written file, and isn't written at all if the
+        overrides haven't changed.
 
-        fflag_overrides_json = orjson.dumps(overrides)
+        Returns:
+            Whether the file was written.
+        """
+        with self._fflag_override_lock:
+            return self._write_fflag_overrides(self._read_fflag_overrides(), dict(overrides))
 
-        with open(
-                file=self.client_app_settings_file_path,
-                mode="wb"
-        ) as client_app_settings_file:
-            client_app_settings_file.write(fflag_overrides_json)
+    def patch_fflag_overrides(
+            self,
+            overrides: Optional[Mapping[str, Any]] = None,
+            remove: Iterable[str] = ()
+    ) -> bool:
+        """
+        Changes some of the FFlag overrides for this Studio version, keeping the rest.
+        Like set_fflag_overrides, the file is replaced atomically and only written if something changed.
+
+        Arguments:
+            overrides: The overrides to add or change.
+            remove: The flags whose overrides should be removed.
+
+        Returns:
+            Whether the file was written.
+        """
+        with self._fflag_override_lock:
+            current = self._read_fflag_overrides()
+            patched = dict(current)
+            for flag in remove:
+                patched.pop(flag, None)
+            if overrides:
+                patched.update(overrides)
+            return self._write_fflag_overrides(current, patched)
 
     def save_api_dump_to_path(self, path: Path):
         """
@@ -164,57 +306,180 @@ class Version:
             stderr=subprocess.PIPE
         )
 
-    def generate_api_dump_json(self, temp_path: Optional[Path] = None) -> dict:
+    async def save_api_dump_to_path_async(
+            self,
+            path: Path,
+            timeout: Optional[float] = None
+    ) -> subprocess.CompletedProcess:
         """
-        Generates an API dump for this Roblox Studio version and returns its raw JSON representation.
-        If temp_path is not specified, the path is generated randomly in a temporary directory and subsequently deleted.
-        If temp_path is specified, you are expected to handle the deletion of the file yourself.
+        Generates an API dump for this Roblox Studio version and places it in the specified path, without blocking the
+        event loop.
+        If Studio doesn't exit within timeout seconds, it is killed and asyncio.TimeoutError is raised.
         """
+        args = [str(self.binary_file_path), "-API", str(path)]
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except BaseException:
+            # this includes cancellation, which shouldn't leave Studio running either
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        return subprocess.CompletedProcess(args=args, returncode=process.returncode, stdout=stdout, stderr=stderr)
+
+    @contextmanager
+    def _generate_api_dump_file(self, temp_path: Optional[Path] = None) -> Iterator[Path]:
         needs_deletion = False
         if not temp_path:
-            random_seed = [random.choice(_seed_letters) for _ in range(8)]
-            temp_path = _temp_folder / f"{random_seed}_dump.json"
+            temp_path = _make_temp_dump_path()
             needs_deletion = True
 
         try:
             self.save_api_dump_to_path(temp_path)
-
-            with open(temp_path, "rb") as file:
-                dump_json = file.read()
-
-            return orjson.loads(dump_json)
+            yield temp_path
         finally:
             if needs_deletion:
-                try:
-                    os.remove(temp_path)
-                except FileNotFoundError:
-                    pass
+                _remove_temp_dump(temp_path)
 
-    def generate_api_dump(self, temp_path: Optional[Path] = None) -> APIDump:
+    def _generate_api_dump_data(self, temp_path: Optional[Path] = None) -> bytes:
+        with self._generate_api_dump_file(temp_path=temp_path) as dump_path:
+            with open(dump_path, "rb") as file:
+                return file.read()
+
+    def iter_api_dump(self, temp_path: Optional[Path] = None, validate: bool = True) -> Iterator[APIDumpItem]:
+        """
+        Generates an API dump for this Roblox Studio version and parses it one class or enum at a time, without holding
+        the whole dump in memory.
+        temp_path is handled the same way as in generate_api_dump_json. If the dump is generated to a temporary file, it
+        is deleted once iteration finishes or the iterator is closed.
+        """
+        with self._generate_api_dump_file(temp_path=temp_path) as dump_path:
+            yield from iter_api_dump_file(dump_path, validate=validate)
+
+    def generate_api_dump_json(self, temp_path: Optional[Path] = None) -> dict:
+        """
+        Generates an API dump for this Roblox Studio version and returns its raw JSON representation.
+        If temp_path is not specified, a unique temporary file is created for it and subsequently deleted.
+        If temp_path is specified, you are expected to handle the deletion of the file yourself.
+        """
+        return orjson.loads(self._generate_api_dump_data(temp_path=temp_path))
+
+    def get_api_dump_cache_key(self) -> str:
+        """
+        Gets the key that this version's API dump is stored under in an APIDumpCache.
+        The key includes the version's folder, so different versions don't share a key, and changes whenever the
+        Studio binary is replaced.
+        """
+        binary_stat = os.stat(self.binary_file_path)
+        # the folder name alone isn't unique for macOS, where every version is a RobloxStudio.app
+        path_hash = hashlib.sha1(str(self.path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return f"local-{self.path.name}-{path_hash}-{binary_stat.st_size}-{binary_stat.st_mtime_ns}"
+
+    def generate_api_dump(
+            self,
+            temp_path: Optional[Path] = None,
+            cache: Optional[APIDumpCache] = None,
+            validate: bool = True,
+            lazy: bool = False
+    ) -> APIDump:
         """
         Generates an API dump for this Roblox Studio version and parses it.
-        If temp_path is not specified, the path is generated randomly in a temporary directory and subsequently deleted.
+        If temp_path is not specified, a unique temporary file is created for it and subsequently deleted.
         If temp_path is specified, you are expected to handle the deletion of the file yourself.
+        If cache is specified, the dump is loaded from it when this version's binary hasn't changed since the dump was
+        cached, and generated dumps are added to it.
+        If validate is False, the dump is built with construct_api_dump, and lazy is passed on to it when cache is not
+        specified.
         """
+        if cache is None:
+            dump_json = self.generate_api_dump_json(temp_path=temp_path)
+            if validate:
+                return APIDump(**dump_json)
+            return construct_api_dump(dump_json, lazy=lazy)
+
+        cache_key = self.get_api_dump_cache_key()
+        dump = cache.get(cache_key)
+        if dump is None:
+            dump_data = self._generate_api_dump_data(temp_path=temp_path)
+            dump = cache.set(cache_key, dump_data, None if validate else construct_api_dump(orjson.loads(dump_data)))
+        return dump
+
+    async def generate_api_dump_async(
+            self,
+            temp_path: Optional[Path] = None,
+            timeout: Optional[float] = None,
+            validate: bool = True,
+            executor: Optional[Executor] = None
+    ) -> APIDump:
+        """
+        Generates an API dump for this Roblox Studio version and parses it, without blocking the event loop.
+        temp_path is handled the same way as in generate_api_dump.
 
-        return APIDump(**self.generate_api_dump_json(temp_path=temp_path))
+        Arguments:
+            temp_path: The path to generate the dump at.
+            timeout: The number of seconds to wait for Studio before killing it and raising asyncio.TimeoutError.
+            validate: Whether to validate the dump while parsing it.
+            executor: The executor to parse the dump in, like a ProcessPoolExecutor. Defaults to the event loop's
+                      default executor.
+        """
+        return await self._generate_api_dump_async(
+            temp_path=temp_path,
+            timeout=timeout,
+            validate=validate,
+            executor=executor
+        )
 
-    def launch(
+    async def _generate_api_dump_async(
+            self,
+            temp_path: Optional[Path] = None,
+            timeout: Optional[float] = None,
+            validate: bool = True,
+            executor: Optional[Executor] = None,
+            semaphore: Optional[asyncio.Semaphore] = None
+    ) -> APIDump:
+        # the semaphore limits the number of Studio processes, so it's released before the dump is parsed
+        needs_deletion = False
+        if not temp_path:
+            temp_path = _make_temp_dump_path()
+            needs_deletion = True
+
+        try:
+            if semaphore is not None:
+                async with semaphore:
+                    completed_process = await self.save_api_dump_to_path_async(temp_path, timeout=timeout)
+            else:
+                completed_process = await self.save_api_dump_to_path_async(temp_path, timeout=timeout)
+            if completed_process.returncode != 0 or os.stat(temp_path).st_size == 0:
+                raise APIDumpGenerationError(
+                    version=self,
+                    return_code=completed_process.returncode,
+                    stderr=completed_process.stderr
+                )
+
+            loop = asyncio.get_event_loop()
+            dump_data = await loop.run_in_executor(executor, _parse_api_dump_file, temp_path, validate)
+            return decode_api_dump(dump_data)
+        finally:
+            if needs_deletion:
+                _remove_temp_dump(temp_path)
+
+    def get_launch_args(
             self,
             *,
             file: Optional[Path] = None,
             base_url: Optional[str] = None,
             disable_user_plugins: bool = False,
-    ):
+    ) -> List[Union[Path, str]]:
         """
-        Launches Roblox Studio and returns its launch process.
-
-        Arguments:
-            file: The file to launch Studio with, like a rbxl file.
-            base_url: A base URL to use when sending requests. Default is "roblox.com".
-            disable_user_plugins: Disables the loading of all local or remote user plugins.
+        Gets the command line that launch uses to launch Roblox Studio. See launch for the arguments.
         """
-
         args = [self.binary_file_path]
 
         if file:
@@ -227,6 +492,28 @@ class Version:
         if disable_user_plugins:
             args.append("-disableLoadUserPlugins")
 
+        return args
+
+    def launch(
+            self,
+            *,
+            file: Optional[Path] = None,
+            base_url: Optional[str] = None,
+            disable_user_plugins: bool = False,
+    ):
+        """
+        Launches Roblox Studio and returns its launch process.
+        The process's output is piped but not read, so Studio can stall once it has written enough of it. Use
+        StudioProcessManager from roblox_studio.processes to have the output read continuously.
+
+        Arguments:
+            file: The file to launch Studio with, like a rbxl file.
+            base_url: A base URL to use when sending requests. Default is "roblox.com".
+            disable_user_plugins: Disables the loading of all local or remote user plugins.
+        """
+
+        args = self.get_launch_args(file=file, base_url=base_url, disable_user_plugins=disable_user_plugins)
+
         process = subprocess.Popen(
             args=args,
             stdout=subprocess.PIPE,
@@ -235,18 +522,151 @@ class Version:
 
         return process
 
+    @property
+    def _rbxasset_base_paths(self) -> List[Path]:
+        return [
+            self.platform_content_folder_path / "pc",
+            self.extra_content_folder_path,
+            self.content_folder_path
+        ]
+
     def resolve_rbxasset_to_path(self, path: str) -> Optional[Path]:
         """
         Resolves a rbxasset path, like /textures/face.png.
         This function does not ensure that the path does not escape the directory - do not call this function with
-        unfiltered user input.
+        unfiltered user input. To resolve many paths, use get_rbxasset_index, which doesn't touch the filesystem for
+        each path.
         """
-        for base_path in [
-            self.platform_content_folder_path / "pc",
-            self.extra_content_folder_path,
-            self.content_folder_path
-        ]:
+        for base_path in self._rbxasset_base_paths:
             file_path = base_path / path
             if file_path.exists():
                 return file_path
         return None
+
+    def get_rbxasset_index(self, cache_path: Optional[Path] = None, revalidate: bool = True) -> RbxAssetIndex:
+        """
+        Gets an index of this version's content files, building it if needed. The index is kept on this version.
+
+        Arguments:
+            cache_path: A file to load the index from and to save it to when it's built.
+            revalidate: Whether to check that the index isn't stale, building it again if it is. This stats every
+                        content folder, so it's best done once before resolving a batch of paths.
+        """
+        index = self._rbxasset_index
+        base_paths = self._rbxasset_base_paths
+
+        if index is None and cache_path is not None:
+            try:
+                index = RbxAssetIndex.load(cache_path)
+            except (FileNotFoundError, ValueError):
+                # a missing or unreadable cache is rebuilt
+                index = None
+            if index is not None and index.base_paths != base_paths:
+                index = None
+
+        if index is None or (revalidate and index.is_stale()):
+            index = RbxAssetIndex.build(base_paths)
+            if cache_path is not None:
+                index.save(cache_path)
+
+        self._rbxasset_index = index
+        return index
+
+    def resolve_rbxassets(self, paths: Iterable[str], cache_path: Optional[Path] = None) -> Dict[str, Optional[Path]]:
+        """
+        Resolves many rbxasset paths at once with the version's rbxasset index, which is checked for changes once.
+        Paths are matched case-insensitively, and can't escape the content folders.
+
+        Arguments:
+            paths: The rbxasset paths, like /textures/face.png or rbxasset://textures/face.png.
+            cache_path: A file to cache the index in. See get_rbxasset_index.
+
+        Returns:
+            A dictionary where the keys are the paths and the values are their resolved paths, or None for paths that
+            don't exist.
+        """
+        return self.get_rbxasset_index(cache_path=cache_path).resolve_many(paths)
+
+
+async def generate_api_dumps(
+        versions: Iterable[Version],
+        concurrency: int = 4,
+        timeout: Optional[float] = None,
+        validate: bool = True,
+        executor: Optional[Executor] = None,
+        return_exceptions: bool = False
+) -> List[Union[APIDump, BaseException]]:
+    """
+    Generates and parses API dumps for many Roblox Studio versions in parallel.
+
+    Arguments:
+        versions: The versions to generate dumps for.
+        concurrency: The maximum number of Studio processes running at once.
+        timeout: The number of seconds to wait for each Studio process before killing it.
+        validate: Whether to validate the dumps while parsing them.
+        executor: The executor to parse dumps in. Defaults to a process pool with concurrency workers that is shut down
+                  afterwards.
+        return_exceptions: Whether to return the exceptions of versions that failed in place of their dumps instead
+                           of raising the first one.
+
+    Returns:
+        The dumps, in the same order as versions.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=concurrency)
+
+    async def generate(version: Version) -> APIDump:
+        return await version._generate_api_dump_async(
+            timeout=timeout,
+            validate=validate,
+            executor=executor,
+            semaphore=semaphore
+        )
+
+    tasks = [asyncio.ensure_future(generate(version)) for version in versions]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        # if one version failed, the others are cancelled, which kills their Studio processes
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if owns_executor:
+            executor.shutdown(wait=False)
+
+
+async def patch_fflag_overrides(
+        versions: Iterable[Version],
+        overrides: Optional[Mapping[str, Any]] = None,
+        remove: Iterable[str] = (),
+        concurrency: int = 16,
+        executor: Optional[Executor] = None,
+        return_exceptions: bool = False
+) -> List[Union[bool, BaseException]]:
+    """
+    Applies the same FFlag override changes to many Roblox Studio versions in parallel. See
+    Version.patch_fflag_overrides.
+
+    Arguments:
+        versions: The versions to change the overrides of.
+        overrides: The overrides to add or change.
+        remove: The flags whose overrides should be removed.
+        concurrency: The maximum number of versions being changed at once.
+        executor: The executor to read and write files in. Defaults to the event loop's default executor.
+        return_exceptions: Whether to return the exceptions of versions that failed in place of their results instead
+                           of raising the first one.
+
+    Returns:
+        Whether each version's file was written, in the same order as versions.
+    """
+    loop = asyncio.get_event_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    remove = list(remove)
+
+    async def patch(version: Version) -> bool:
+        async with semaphore:
+            return await loop.run_in_executor(executor, version.patch_fflag_overrides, overrides, remove)
+
+    return await asyncio.gather(*[patch(version) for version in versions], return_exceptions=return_exceptions)
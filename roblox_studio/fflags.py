@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import orjson
+
+fflag_prefixes = (
+    "DFString",
+    "SFString",
+    "FString",
+    "DFFlag",
+    "SFFlag",
+    "DFInt",
+    "SFInt",
+    "DFLog",
+    "SFLog",
+    "FFlag",
+    "FInt",
+    "FLog"
+)
+
+_bool_prefixes = ("FFlag", "DFFlag", "SFFlag")
+_int_prefixes = ("FInt", "DFInt", "SFInt", "FLog", "DFLog", "SFLog")
+_string_prefixes = ("FString", "DFString", "SFString")
+
+_empty_bucket: Mapping[str, Any] = MappingProxyType({})
+
+
+def split_fflag_name(flag: str) -> Tuple[Optional[str], str]:
+    """
+    Splits a flag into its prefix and name, like "DFIntTaskSchedulerTargetFps" into "DFInt" and
+    "TaskSchedulerTargetFps".
+
+    Returns:
+        The prefix, or None if the flag doesn't start with a known prefix, and the rest of the flag.
+    """
+    for prefix in fflag_prefixes:
+        if flag.startswith(prefix):
+            return prefix, flag[len(prefix):]
+    return None, flag
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return bool(value)
+
+
+class FFlags(Mapping[str, Any]):
+    """
+    An immutable mapping of flags to their values, indexed by prefix.
+    Instances are shared between callers by FFlagReader, so they can't be modified.
+    """
+
+    def __init__(self, flags: Dict[str, Any]):
+        self._flags: Dict[str, Any] = flags
+        buckets: Dict[Optional[str], Dict[str, Any]] = {}
+        for flag, value in flags.items():
+            prefix, name = split_fflag_name(flag)
+            buckets.setdefault(prefix, {})[name] = value
+        self._buckets: Dict[Optional[str], Mapping[str, Any]] = {
+            prefix: MappingProxyType(bucket) for prefix, bucket in buckets.items()
+        }
+
+    def __getitem__(self, flag: str) -> Any:
+        return self._flags[flag]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._flags)
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {len(self._flags)} flags>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Copies the flags into a new dictionary, which can be modified or passed to orjson.dumps.
+        """
+        return dict(self._flags)
+
+    def get_prefix(self, prefix: Optional[str]) -> Mapping[str, Any]:
+        """
+        Gets the flags with a prefix, keyed by their names without it.
+
+        Arguments:
+            prefix: A prefix from fflag_prefixes like "DFInt", or None for flags without a known prefix.
+        """
+        return self._buckets.get(prefix, _empty_bucket)
+
+    def _get_typed(self, name: str, prefixes: Tuple[str, ...]) -> Tuple[bool, Any]:
+        for prefix in prefixes:
+            bucket = self._buckets.get(prefix)
+            if bucket is not None and name in bucket:
+                return True, bucket[name]
+        return False, None
+
+    def get_bool(self, name: str, default: Optional[bool] = None) -> Optional[bool]:
+        """
+        Gets a boolean flag by its name without a prefix, looking in FFlags, then DFFlags, then SFFlags.
+        """
+        found, value = self._get_typed(name, _bool_prefixes)
+        return _to_bool(value) if found else default
+
+    def get_int(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """
+        Gets an integer flag by its name without a prefix, looking in FInts, DFInts and SFInts, then in the log levels.
+        """
+        found, value = self._get_typed(name, _int_prefixes)
+        return int(value) if found else default
+
+    def get_string(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Gets a string flag by its name without a prefix, looking in FStrings, then DFStrings, then SFStrings.
+        """
+        found, value = self._get_typed(name, _string_prefixes)
+        return str(value) if found else default
+
+
+FFlagsCallback = Callable[[FFlags], None]
+
+
+def _get_file_key(stat: os.stat_result) -> Tuple[int, int, int, int]:
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class FFlagReader:
+    """
+    Reads a flag file like StudioAppSettings.json, only parsing it again when its size, modification time or inode
+    changes. Every caller gets the same FFlags object until the file changes.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Arguments:
+            path: The path of the flag file.
+        """
+        self.path: Path = path
+
+        self._flags: Optional[FFlags] = None
+        self._file_key: Optional[Tuple[int, int, int, int]] = None
+        self._lock: threading.Lock = threading.Lock()
+        self._callbacks: List[FFlagsCallback] = []
+
+    def add_callback(self, callback: FFlagsCallback):
+        """
+        Adds a function that is called with the new flags whenever the file is found to have changed.
+        Changes are found when the flags are read with get or refresh, or while watch is running.
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: FFlagsCallback):
+        self._callbacks.remove(callback)
+
+    def _load(self) -> Tuple[FFlags, bool]:
+        stat = os.stat(self.path)
+        with self._lock:
+            if self._flags is not None and _get_file_key(stat) == self._file_key:
+                return self._flags, False
+
+            with open(self.path, "rb") as file:
+                # the key is taken from the open file, since the file may have been replaced after it was stat'ed
+                file_key = _get_file_key(os.fstat(file.fileno()))
+                data = file.read()
+
+            changed = self._flags is not None
+            self._flags = FFlags(orjson.loads(data))
+            self._file_key = file_key
+            flags = self._flags
+
+        if changed:
+            for callback in list(self._callbacks):
+                callback(flags)
+        return flags, changed
+
+    def get(self) -> FFlags:
+        """
+        Gets the flags, reading the file again only if it has changed.
+        Raises FileNotFoundError if the file doesn't exist.
+        """
+        flags, _ = self._load()
+        return flags
+
+    def refresh(self) -> bool:
+        """
+        Checks whether the file has changed since it was last read, reading it again if it has.
+
+        Returns:
+            Whether the file changed.
+        """
+        _, changed = self._load()
+        return changed
+
+    async def watch(self, poll_interval: float = 1.0):
+        """
+        Checks the file for changes forever, calling the callbacks whenever it changes. A missing file is checked
+        again on the next poll.
+        """
+        while True:
+            try:
+                self.refresh()
+            except FileNotFoundError:
+                pass
+            await asyncio.sleep(poll_interval)
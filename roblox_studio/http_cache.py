@@ -0,0 +1,121 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+from .utilities import write_file_atomic
+
+
+class HTTPCacheEntry:
+    """
+    A cached HTTP response body along with the validators needed to revalidate it.
+    """
+
+    def __init__(
+            self,
+            body: bytes,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None,
+            value: Any = None
+    ):
+        self.body: bytes = body
+        self.etag: Optional[str] = etag
+        self.last_modified: Optional[str] = last_modified
+        self.value: Any = value
+        """The parsed form of the body. This is only kept in memory and is never persisted."""
+
+    def get_conditional_headers(self) -> Dict[str, str]:
+        """
+        Gets the headers that make a request conditional on this entry having changed.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    Base class for caches of HTTP responses keyed by URL.
+    Subclass this and implement get and set to store entries elsewhere.
+    """
+
+    def get(self, url: str) -> Optional[HTTPCacheEntry]:
+        raise NotImplementedError
+
+    def set(self, url: str, entry: HTTPCacheEntry):
+        raise NotImplementedError
+
+
+class MemoryHTTPCache(HTTPCache):
+    """
+    An HTTP cache that keeps entries in memory for the lifetime of the object.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, HTTPCacheEntry] = {}
+
+    def get(self, url: str) -> Optional[HTTPCacheEntry]:
+        return self._entries.get(url)
+
+    def set(self, url: str, entry: HTTPCacheEntry):
+        self._entries[url] = entry
+
+
+class FileHTTPCache(MemoryHTTPCache):
+    """
+    An HTTP cache that persists entries to a folder so they survive restarts.
+    Entries are also kept in memory so that parsed values can be reused within a process.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path: Path = path
+
+    def _get_entry_paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.path / f"{key}.json", self.path / f"{key}.body"
+
+    def get(self, url: str) -> Optional[HTTPCacheEntry]:
+        entry = super().get(url)
+        if entry is not None:
+            return entry
+
+        meta_path, body_path = self._get_entry_paths(url)
+
+        try:
+            with open(meta_path, "rb") as meta_file:
+                meta = orjson.loads(meta_file.read())
+            with open(body_path, "rb") as body_file:
+                body = body_file.read()
+        except FileNotFoundError:
+            return None
+
+        if meta.get("url") != url or meta.get("size") != len(body):
+            return None
+
+        entry = HTTPCacheEntry(
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified")
+        )
+        super().set(url, entry)
+        return entry
+
+    def set(self, url: str, entry: HTTPCacheEntry):
+        super().set(url, entry)
+
+        os.makedirs(self.path, exist_ok=True)
+        meta_path, body_path = self._get_entry_paths(url)
+
+        write_file_atomic(body_path, entry.body)
+        write_file_atomic(meta_path, orjson.dumps({
+            "url": url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "size": len(entry.body)
+        }))
@@ -0,0 +1,390 @@
+import asyncio
+import hashlib
+import os
+import queue
+import struct
+import zlib
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from zipfile import BadZipFile
+
+from .deployments import Deployment, DeploymentClient, DeploymentPackage, DeploymentPackages
+from .downloads import PackageChecksumError, _write_chunk
+from .environments import Version, VersionType
+
+windows_package_folders: Dict[str, str] = {
+    "RobloxApp.zip": "",
+    "RobloxStudio.zip": "",
+    "Libraries.zip": "",
+    "LibrariesQt5.zip": "",
+    "redist.zip": "",
+    "WebView2.zip": "",
+    "WebView2RuntimeInstaller.zip": "WebView2RuntimeInstaller",
+
+    "shaders.zip": "shaders",
+    "ssl.zip": "ssl",
+
+    "content-avatar.zip": "content/avatar",
+    "content-configs.zip": "content/configs",
+    "content-fonts.zip": "content/fonts",
+    "content-sky.zip": "content/sky",
+    "content-sounds.zip": "content/sounds",
+    "content-textures2.zip": "content/textures",
+    "content-models.zip": "content/models",
+    "content-studio_svg_textures.zip": "content/studio_svg_textures",
+    "content-qt_translations.zip": "content/qt_translations",
+    "content-api-docs.zip": "content/api_docs",
+
+    "content-textures3.zip": "PlatformContent/pc/textures",
+    "content-terrain.zip": "PlatformContent/pc/terrain",
+    "content-platform-fonts.zip": "PlatformContent/pc/fonts",
+    "content-platform-dictionaries.zip": "PlatformContent/pc/shared_compression_dictionaries",
+
+    "extracontent-luapackages.zip": "ExtraContent/LuaPackages",
+    "extracontent-translations.zip": "ExtraContent/translations",
+    "extracontent-models.zip": "ExtraContent/models",
+    "extracontent-textures.zip": "ExtraContent/textures",
+    "extracontent-places.zip": "ExtraContent/places",
+    "extracontent-scripts.zip": "ExtraContent/scripts",
+
+    "BuiltInPlugins.zip": "BuiltInPlugins",
+    "BuiltInStandalonePlugins.zip": "BuiltInStandalonePlugins",
+    "ApplicationConfig.zip": "ApplicationConfig",
+    "Plugins.zip": "Plugins",
+    "Qml.zip": "Qml",
+    "StudioFonts.zip": "StudioFonts",
+}
+"""Maps Windows package names to the folder, relative to the version folder, that they are extracted into."""
+
+_app_settings_xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Settings>
+\t<ContentFolder>content</ContentFolder>
+\t<BaseUrl>http://www.roblox.com</BaseUrl>
+</Settings>
+"""
+
+_local_file_header = struct.Struct("<IHHHHHIIIHH")
+_local_file_header_signature = 0x04034b50
+_data_descriptor_signature = 0x08074b50
+_zip64_extra_id = 0x0001
+
+
+class _ChunkReader:
+    """
+    Reads bytes out of a queue of chunks that is filled from another thread. None marks the end of the stream.
+    """
+
+    def __init__(self, chunks: queue.Queue, on_chunk_taken: Callable[[], None]):
+        self._chunks: queue.Queue = chunks
+        self._on_chunk_taken: Callable[[], None] = on_chunk_taken
+        self._buffer: bytes = b""
+        self._position: int = 0
+        self._eof: bool = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._chunks.get()
+        self._on_chunk_taken()
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+    def read_some(self, size: int) -> bytes:
+        """
+        Reads between 1 and size bytes, or no bytes at the end of the stream.
+        """
+        if self._position >= len(self._buffer) and not self._fill():
+            return b""
+        data = self._buffer[self._position:self._position + size]
+        self._position += len(data)
+        return data
+
+    def read_exactly(self, size: int) -> bytes:
+        while len(self._buffer) - self._position < size:
+            if not self._fill():
+                raise BadZipFile("Unexpected end of zip stream")
+        data = self._buffer[self._position:self._position + size]
+        self._position += size
+        return data
+
+    def unread(self, data: bytes):
+        self._buffer = data + self._buffer[self._position:]
+        self._position = 0
+
+
+def _get_zip64_sizes(extra: bytes, compressed_size: int, size: int):
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, data_size = struct.unpack_from("<HH", extra, position)
+        position += 4
+        if header_id == _zip64_extra_id:
+            data = extra[position:position + data_size]
+            # only the fields that overflowed in the local header are present, in this order
+            if size == 0xFFFFFFFF:
+                size, = struct.unpack_from("<Q", data, 0)
+                data = data[8:]
+            if compressed_size == 0xFFFFFFFF:
+                compressed_size, = struct.unpack_from("<Q", data, 0)
+            return compressed_size, size, True
+        position += data_size
+    return compressed_size, size, False
+
+
+def _get_member_path(folder: Path, raw_name: bytes, flags: int) -> Optional[Path]:
+    name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+    name = name.replace("\\", "/").lstrip("/")
+    if not name or name.endswith("/"):
+        return None
+
+    member_path = os.path.normpath(os.path.join(folder, name))
+    if os.path.commonpath([folder, member_path]) != str(folder):
+        raise BadZipFile(f"Zip member {name!r} is outside of the extraction folder")
+    return Path(member_path)
+
+
+def _extract_zip_stream(reader: _ChunkReader, folder: Path, chunk_size: int = 1024 * 64):
+    """
+    Extracts a zip file from a stream of bytes without seeking, by reading each local file header in turn.
+    Stops at the central directory.
+    """
+    folder = Path(os.path.abspath(folder))
+    created_folders = set()
+
+    while True:
+        signature_data = reader.read_some(4)
+        if not signature_data:
+            return
+        if len(signature_data) < 4:
+            signature_data += reader.read_exactly(4 - len(signature_data))
+        signature, = struct.unpack("<I", signature_data)
+        if signature != _local_file_header_signature:
+            # the central directory (or something we don't understand) follows the last file
+            return
+
+        (
+            _, _, flags, method, _, _, crc, compressed_size, size, name_length, extra_length
+        ) = _local_file_header.unpack(signature_data + reader.read_exactly(_local_file_header.size - 4))
+        raw_name = reader.read_exactly(name_length)
+        extra = reader.read_exactly(extra_length)
+        compressed_size, size, is_zip64 = _get_zip64_sizes(extra, compressed_size, size)
+        has_data_descriptor = bool(flags & 0x08)
+
+        if flags & 0x01:
+            raise BadZipFile("Encrypted zip files are not supported")
+        if method not in (0, 8):
+            raise BadZipFile(f"Unsupported compression method {method}")
+        if method == 0 and has_data_descriptor:
+            raise BadZipFile("Stored zip members with data descriptors can't be streamed")
+
+        member_path = _get_member_path(folder, raw_name, flags)
+        if member_path is not None and member_path.parent not in created_folders:
+            os.makedirs(member_path.parent, exist_ok=True)
+            created_folders.add(member_path.parent)
+
+        member_file = open(member_path, "wb") if member_path is not None else None
+        decompressor = zlib.decompressobj(-15) if method == 8 else None
+        member_crc = 0
+
+        try:
+            if has_data_descriptor:
+                while not decompressor.eof:
+                    data = reader.read_some(chunk_size)
+                    if not data:
+                        raise BadZipFile("Unexpected end of zip stream")
+                    output = decompressor.decompress(data)
+                    member_crc = zlib.crc32(output, member_crc)
+                    if member_file:
+                        member_file.write(output)
+                reader.unread(decompressor.unused_data)
+            else:
+                remaining_size = compressed_size
+                while remaining_size:
+                    data = reader.read_some(min(chunk_size, remaining_size))
+                    if not data:
+                        raise BadZipFile("Unexpected end of zip stream")
+                    remaining_size -= len(data)
+                    output = decompressor.decompress(data) if decompressor else data
+                    member_crc = zlib.crc32(output, member_crc)
+                    if member_file:
+                        member_file.write(output)
+                if decompressor:
+                    output = decompressor.flush()
+                    member_crc = zlib.crc32(output, member_crc)
+                    if member_file:
+                        member_file.write(output)
+        finally:
+            if member_file:
+                member_file.close()
+
+        if has_data_descriptor:
+            descriptor = reader.read_exactly(4)
+            if struct.unpack("<I", descriptor)[0] == _data_descriptor_signature:
+                descriptor = reader.read_exactly(4)
+            crc, = struct.unpack("<I", descriptor)
+            reader.read_exactly(16 if is_zip64 else 8)
+
+        if member_crc != crc:
+            raise BadZipFile(f"Bad CRC-32 for {raw_name!r}")
+
+
+class DeploymentInstaller:
+    """
+    Installs a Windows deployment into a folder by streaming each package straight from the network into extraction.
+    Extraction runs in a thread pool so that inflating one package overlaps with downloading the others.
+    If the installer creates its own thread pool, it is shut down by close or when the installer is used as an async
+    context manager and exits.
+    """
+
+    def __init__(
+            self,
+            client: DeploymentClient,
+            concurrency: int = 4,
+            chunk_size: int = 1024 * 64,
+            buffered_chunk_count: int = 64,
+            executor: Optional[Executor] = None,
+            package_folders: Optional[Dict[str, str]] = None
+    ):
+        """
+        Arguments:
+            client: The client whose session is used to download packages.
+            concurrency: The maximum number of packages downloaded and extracted at once.
+            chunk_size: The number of bytes read from the network at a time.
+            buffered_chunk_count: The number of chunks per package that can wait for extraction before downloading
+                                  pauses.
+            executor: The executor to extract packages in. Defaults to a thread pool with one thread per package
+                      being installed at once, which is created when it is first needed.
+            package_folders: Maps package names to the folder they are extracted into. Defaults to
+                             windows_package_folders. Zip packages that aren't in the map are skipped.
+        """
+        self._client: DeploymentClient = client
+        self.chunk_size: int = chunk_size
+        self.buffered_chunk_count: int = buffered_chunk_count
+        self.concurrency: int = concurrency
+        self.executor: Optional[Executor] = executor
+        self.package_folders: Dict[str, str] = package_folders or windows_package_folders
+        self._owns_executor: bool = executor is None
+        # created on first use, since before Python 3.10 a semaphore is bound to the loop that is current when it's
+        # created
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the thread pool that the installer created for itself, if any.
+        Executors that were passed in are left running.
+        """
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    async def install_package(self, package: DeploymentPackage, path: Path):
+        """
+        Downloads a package and extracts it into its folder under path.
+        Packages that aren't zip files are placed in path as they are.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            if package.name.endswith(".zip"):
+                folder = self.package_folders.get(package.name)
+                if folder is None:
+                    return
+                await self._stream_zip_package(package, path / folder)
+            else:
+                await self._stream_raw_package(package, path)
+
+    async def _stream_raw_package(self, package: DeploymentPackage, path: Path):
+        loop = asyncio.get_event_loop()
+        md5 = hashlib.md5()
+        os.makedirs(path, exist_ok=True)
+
+        async with self._client.session.get(package.url) as package_response:
+            package_response.raise_for_status()
+            with open(path / package.name, "wb") as package_file:
+                async for chunk in package_response.content.iter_chunked(self.chunk_size):
+                    # written in the default executor like PackageDownloader does, since self.executor's threads may
+                    # all be busy extracting
+                    await loop.run_in_executor(None, _write_chunk, package_file, md5, chunk)
+
+        if md5.hexdigest() != package.md5.lower():
+            raise PackageChecksumError(package=package, md5=md5.hexdigest())
+
+    async def _stream_zip_package(self, package: DeploymentPackage, folder: Path):
+        loop = asyncio.get_event_loop()
+        chunks = queue.Queue()
+        # one permit per chunk that may be waiting in the queue
+        free_slots = asyncio.Semaphore(self.buffered_chunk_count)
+
+        def on_chunk_taken():
+            loop.call_soon_threadsafe(free_slots.release)
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        reader = _ChunkReader(chunks, on_chunk_taken)
+        extraction = loop.run_in_executor(self.executor, _extract_zip_stream, reader, folder, self.chunk_size)
+        # wakes up a download waiting for a free slot if extraction stops
+        extraction.add_done_callback(lambda _: free_slots.release())
+        md5 = hashlib.md5()
+
+        try:
+            async with self._client.session.get(package.url) as package_response:
+                package_response.raise_for_status()
+
+                async for chunk in package_response.content.iter_chunked(self.chunk_size):
+                    md5.update(chunk)
+                    if extraction.done():
+                        # extraction stopped at the central directory or failed, so only the hash is left to finish
+                        continue
+                    await free_slots.acquire()
+                    if not extraction.done():
+                        chunks.put(chunk)
+        except BaseException:
+            chunks.put(None)
+            try:
+                await extraction
+            except Exception:
+                pass
+            raise
+
+        chunks.put(None)
+        await extraction
+
+        if md5.hexdigest() != package.md5.lower():
+            raise PackageChecksumError(package=package, md5=md5.hexdigest())
+
+    async def install_packages(self, packages: DeploymentPackages, path: Path) -> Version:
+        """
+        Installs every package of a deployment into path.
+
+        Returns:
+            The installed version.
+        """
+        os.makedirs(path, exist_ok=True)
+        await asyncio.gather(*[self.install_package(package, path) for package in packages.packages])
+
+        with open(path / "AppSettings.xml", "wb") as app_settings_file:
+            app_settings_file.write(_app_settings_xml)
+
+        return Version(
+            path=path,
+            version_type=VersionType.windows
+        )
+
+    async def install(self, deployment: Deployment, path: Path) -> Version:
+        """
+        Fetches the packages of a Windows deployment and installs them into path.
+
+        Returns:
+            The installed version.
+        """
+        return await self.install_packages(await deployment.get_packages(), path)
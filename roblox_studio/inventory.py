@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from re import compile
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+from .environments import Version, VersionType
+from .utilities import write_file_atomic
+
+_format_version = 1
+
+_version_hash_pattern = compile(r"version-[0-9a-f]{16}")
+
+# (size, mtime_ns) of a path, or None if it doesn't exist
+_StatKey = Optional[Tuple[int, int]]
+
+
+def _get_stat_key(path: Path) -> _StatKey:
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class InstalledVersion:
+    """
+    A Roblox Studio version found by a VersionInventory, with its identifying metadata.
+    """
+
+    def __init__(
+            self,
+            version: Version,
+            version_hash: Optional[str],
+            binary_size: int,
+            binary_mtime_ns: int,
+            has_app_settings: bool,
+            has_client_app_settings: bool
+    ):
+        """
+        Arguments:
+            version: The version.
+            version_hash: The version hash from the folder name, like "version-0123456789abcdef", or None if the folder
+                          isn't named after one.
+            binary_size: The size of the Studio binary in bytes.
+            binary_mtime_ns: The modification time of the Studio binary in nanoseconds.
+            has_app_settings: Whether the version has an AppSettings.xml file.
+            has_client_app_settings: Whether the version has a ClientAppSettings.json file with FFlag overrides.
+        """
+        self.version: Version = version
+        self.version_hash: Optional[str] = version_hash
+        self.binary_size: int = binary_size
+        self.binary_mtime_ns: int = binary_mtime_ns
+        self.has_app_settings: bool = has_app_settings
+        self.has_client_app_settings: bool = has_client_app_settings
+
+        # the stat keys this metadata was read with, used to check whether it's still current
+        self._stat_keys: Tuple[_StatKey, _StatKey, _StatKey] = (None, None, None)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.version_hash or self.version.path}>"
+
+
+def _get_stat_keys(version: Version) -> Tuple[_StatKey, _StatKey, _StatKey]:
+    # adding or removing AppSettings.xml changes the version folder's modification time, and replacing
+    # ClientAppSettings.json changes the settings folder's
+    return (
+        _get_stat_key(version.path),
+        _get_stat_key(version.binary_file_path),
+        _get_stat_key(version.client_settings_folder_path)
+    )
+
+
+class VersionInventory:
+    """
+    Finds the Roblox Studio versions installed in a folder, like StudioClient.versions_folder_path.
+    Scanning only looks at the folder itself and a few paths in each version rather than walking them. The results can
+    be saved to a cache file so that later scans, even in another process, only have to check that nothing has
+    changed.
+    """
+
+    def __init__(self, folder: Path, version_type: VersionType, cache_path: Optional[Path] = None):
+        """
+        Arguments:
+            folder: The folder the versions are installed in.
+            version_type: The type of the versions.
+            cache_path: The file to load the inventory from and save it to after each scan.
+        """
+        self.folder: Path = folder
+        self.version_type: VersionType = version_type
+        self.cache_path: Optional[Path] = cache_path
+
+        self.versions: List[InstalledVersion] = []
+        self._folder_key: _StatKey = None
+        self._versions_by_path: Dict[str, InstalledVersion] = {}
+
+        if cache_path is not None:
+            self._load_cache()
+
+    def _read_version(self, path: Path) -> Optional[InstalledVersion]:
+        version = Version(path=path, version_type=self.version_type)
+        stat_keys = _get_stat_keys(version)
+        _, binary_key, _ = stat_keys
+        if binary_key is None:
+            # not a Studio version
+            return None
+
+        binary_size, binary_mtime_ns = binary_key
+        installed_version = InstalledVersion(
+            version=version,
+            version_hash=path.name if _version_hash_pattern.fullmatch(path.name) else None,
+            binary_size=binary_size,
+            binary_mtime_ns=binary_mtime_ns,
+            has_app_settings=version.app_settings_file_path.exists(),
+            has_client_app_settings=version.client_app_settings_file_path.exists()
+        )
+        installed_version._stat_keys = stat_keys
+        return installed_version
+
+    def _get_version_paths(self) -> List[Path]:
+        try:
+            with os.scandir(self.folder) as entries:
+                return sorted(Path(entry.path) for entry in entries if entry.is_dir())
+        except FileNotFoundError:
+            return []
+
+    def scan(self) -> List[InstalledVersion]:
+        """
+        Finds the installed versions, reusing the metadata of versions that haven't changed since the last scan.
+        The folder is only listed again if versions have been added or removed since then.
+
+        Returns:
+            The installed versions, sorted by path.
+        """
+        folder_key = _get_stat_key(self.folder)
+        if folder_key is not None and folder_key == self._folder_key:
+            paths = [installed_version.version.path for installed_version in self.versions]
+        else:
+            paths = self._get_version_paths()
+
+        versions = []
+        for path in paths:
+            installed_version = self._versions_by_path.get(str(path))
+            if installed_version is None or _get_stat_keys(installed_version.version) != installed_version._stat_keys:
+                installed_version = self._read_version(path)
+            if installed_version is not None:
+                versions.append(installed_version)
+
+        changed = folder_key != self._folder_key or len(versions) != len(self.versions) or any(
+            new is not old for new, old in zip(versions, self.versions)
+        )
+        self.versions = versions
+        self._folder_key = folder_key
+        self._versions_by_path = {
+            str(installed_version.version.path): installed_version
+            for installed_version in versions
+        }
+
+        if changed and self.cache_path is not None:
+            self._save_cache()
+        return versions
+
+    def get(self, version_hash: str) -> Optional[InstalledVersion]:
+        """
+        Gets a version found by the last scan by its version hash.
+        """
+        for installed_version in self.versions:
+            if installed_version.version_hash == version_hash:
+                return installed_version
+        return None
+
+    def _save_cache(self):
+        os.makedirs(self.cache_path.parent, exist_ok=True)
+        write_file_atomic(self.cache_path, orjson.dumps({
+            "format": _format_version,
+            "folder": str(self.folder),
+            "version_type": self.version_type.value,
+            "folder_key": self._folder_key,
+            "versions": [
+                [
+                    str(installed_version.version.path),
+                    installed_version.version_hash,
+                    installed_version.binary_size,
+                    installed_version.binary_mtime_ns,
+                    installed_version.has_app_settings,
+                    installed_version.has_client_app_settings,
+                    installed_version._stat_keys
+                ]
+                for installed_version in self.versions
+            ]
+        }))
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "rb") as file:
+                data = orjson.loads(file.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return
+
+        # a cache of another folder or an older format is rebuilt by the next scan
+        if data.get("format") != _format_version or data.get("folder") != str(self.folder) \
+                or data.get("version_type") != self.version_type.value:
+            return
+
+        self._folder_key = tuple(data["folder_key"]) if data["folder_key"] else None
+        for path, version_hash, binary_size, binary_mtime_ns, has_app_settings, has_client_app_settings, stat_keys \
+                in data["versions"]:
+            installed_version = InstalledVersion(
+                version=Version(path=Path(path), version_type=self.version_type),
+                version_hash=version_hash,
+                binary_size=binary_size,
+                binary_mtime_ns=binary_mtime_ns,
+                has_app_settings=has_app_settings,
+                has_client_app_settings=has_client_app_settings
+            )
+            installed_version._stat_keys = tuple(tuple(key) if key else None for key in stat_keys)
+            self.versions.append(installed_version)
+            self._versions_by_path[path] = installed_version
@@ -0,0 +1,515 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from re import compile
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 2023-05-01T12:34:56.789Z,12.345678,1a2b,6 [FLog::Output] Message
+_record_pattern = compile(
+    r"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?)Z,(\d+(?:\.\d+)?),([0-9a-fA-F]+),(\d+)(?: \[([^\]]*)\])? ?(.*)"
+)
+
+_chunk_size = 1024 * 256
+
+
+def _parse_timestamp(timestamp_string: str) -> datetime:
+    try:
+        return datetime.fromisoformat(timestamp_string).replace(tzinfo=timezone.utc)
+    except ValueError:
+        # fromisoformat only accepts 3 or 6 fractional digits before Python 3.11
+        pass
+    date_string, _, fraction = timestamp_string.partition(".")
+    timestamp = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    if fraction:
+        timestamp = timestamp.replace(microsecond=int(fraction[:6].ljust(6, "0")))
+    return timestamp
+
+
+class LogRecord:
+    """
+    A single entry of a Roblox log file. Lines that don't start with a timestamp are added to the message of the
+    entry before them. Lines at the start of a file that come before any entry become an entry of their own with only
+    a message.
+    """
+
+    __slots__ = ("path", "offset", "timestamp", "uptime", "thread_id", "level", "channel", "message")
+
+    def __init__(
+            self,
+            path: Path,
+            offset: int,
+            timestamp: Optional[datetime],
+            uptime: Optional[float],
+            thread_id: Optional[str],
+            level: Optional[int],
+            channel: Optional[str],
+            message: str
+    ):
+        """
+        Arguments:
+            path: The path of the log file.
+            offset: The byte offset of the entry in the log file.
+            timestamp: When the entry was written, in UTC.
+            uptime: The number of seconds the process had been running for when the entry was written.
+            thread_id: The ID of the thread that wrote the entry, in hexadecimal.
+            level: The number after the thread ID, which is the entry's log level.
+            channel: The log channel, like "FLog::Output".
+            message: The entry's text, with continuation lines separated by newlines.
+        """
+        self.path: Path = path
+        self.offset: int = offset
+        self.timestamp: Optional[datetime] = timestamp
+        self.uptime: Optional[float] = uptime
+        self.thread_id: Optional[str] = thread_id
+        self.level: Optional[int] = level
+        self.channel: Optional[str] = channel
+        self.message: str = message
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.timestamp} [{self.channel}] {self.message!r}>"
+
+
+def parse_log_line(path: Path, offset: int, line: str) -> Optional[LogRecord]:
+    """
+    Parses the line that starts a log entry, or returns None if the line continues the entry before it.
+    """
+    match = _record_pattern.match(line)
+    if not match:
+        return None
+    timestamp_string, uptime, thread_id, level, channel, message = match.groups()
+    return LogRecord(
+        path=path,
+        offset=offset,
+        timestamp=_parse_timestamp(timestamp_string),
+        uptime=float(uptime),
+        thread_id=thread_id,
+        level=int(level),
+        channel=channel,
+        message=message
+    )
+
+
+class _LogParser:
+    """
+    Turns the complete lines of a log file into records. The last record is held back until the line after it shows
+    that it has no more continuation lines, or until flush is called.
+    """
+
+    def __init__(self, path: Path, offset: int = 0):
+        self.path: Path = path
+        # the offset in the file of the first line that hasn't been parsed yet
+        self.offset: int = offset
+        self.pending_record: Optional[LogRecord] = None
+
+    def feed(self, data: bytes) -> Tuple[List[LogRecord], int]:
+        """
+        Parses the complete lines at the start of data, which starts at self.offset in the file.
+
+        Returns:
+            The records completed by the lines, and the number of bytes of data that make up complete lines.
+        """
+        records = []
+        offset = self.offset
+        end = data.rfind(b"\n") + 1
+        position = 0
+        while position < end:
+            line_end = data.index(b"\n", position) + 1
+            line = data[position:line_end].decode("utf-8", errors="replace").rstrip("\r\n")
+
+            record = parse_log_line(self.path, offset + position, line)
+            if record is None and self.pending_record is not None:
+                self.pending_record.message += "\n" + line
+            else:
+                if self.pending_record is not None:
+                    records.append(self.pending_record)
+                self.pending_record = record or LogRecord(
+                    path=self.path,
+                    offset=offset + position,
+                    timestamp=None,
+                    uptime=None,
+                    thread_id=None,
+                    level=None,
+                    channel=None,
+                    message=line
+                )
+            position = line_end
+        self.offset += end
+        return records, end
+
+    def flush(self) -> List[LogRecord]:
+        if self.pending_record is None:
+            return []
+        record = self.pending_record
+        self.pending_record = None
+        return [record]
+
+
+def _read_log_records(
+        path: Path,
+        parser: _LogParser,
+        is_final: bool,
+        size: Optional[int] = None
+) -> Iterator[LogRecord]:
+    with open(path, "rb") as file:
+        file.seek(parser.offset)
+        remaining_size = size - parser.offset if size is not None else None
+        buffer = b""
+        while True:
+            chunk = file.read(_chunk_size if remaining_size is None else min(_chunk_size, remaining_size))
+            if not chunk:
+                break
+            if remaining_size is not None:
+                remaining_size -= len(chunk)
+            buffer += chunk
+            records, consumed = parser.feed(buffer)
+            yield from records
+            buffer = buffer[consumed:]
+
+    if is_final:
+        # a last line without a newline is still part of the log once the file is complete
+        if buffer:
+            records, _ = parser.feed(buffer + b"\n")
+            yield from records
+        yield from parser.flush()
+
+
+def iter_log_records(path: Path, offset: int = 0) -> Iterator[LogRecord]:
+    """
+    Parses a log file one record at a time without reading the whole file into memory.
+
+    Arguments:
+        path: The path of the log file.
+        offset: The byte offset to start at. It should be the start of a line.
+    """
+    return _read_log_records(path, _LogParser(path, offset), is_final=True)
+
+
+def _is_line_start(path: Path, offset: int) -> bool:
+    if offset == 0:
+        return True
+    with open(path, "rb") as file:
+        file.seek(offset - 1)
+        return file.read(1) == b"\n"
+
+
+class _TailedFile:
+    def __init__(self, path: Path, identity: Tuple[int, int], offset: int):
+        self.identity: Tuple[int, int] = identity
+        self.parser: _LogParser = _LogParser(path, offset)
+
+    def is_replaced(self, identity: Tuple[int, int], stat: os.stat_result) -> bool:
+        if identity != self.identity or stat.st_size < self.parser.offset:
+            return True
+        if stat.st_size == self.parser.offset:
+            # nothing was added, even if the file was touched
+            return False
+        # a file that was truncated and rewritten past where reading stopped between polls no longer has a line
+        # ending there
+        return not _is_line_start(self.parser.path, self.parser.offset)
+
+
+class LogTailer:
+    """
+    Follows the log files in a folder by polling them, producing records as they are written.
+    Each file's read offset is tracked, so only new data is read on each poll. A file that is replaced or truncated is
+    read again from the start, and files that are deleted stop being followed.
+    """
+
+    def __init__(
+            self,
+            folder: Path,
+            pattern: str = "*.log",
+            poll_interval: float = 1.0,
+            start_at_end: bool = False
+    ):
+        """
+        Arguments:
+            folder: The folder to follow, like StudioClient.logs_folder_path.
+            pattern: The glob pattern of the log files in the folder.
+            poll_interval: The number of seconds between polls when following asynchronously.
+            start_at_end: Whether to skip the data already in files that exist when the folder is first polled.
+        """
+        self.folder: Path = folder
+        self.pattern: str = pattern
+        self.poll_interval: float = poll_interval
+        self.start_at_end: bool = start_at_end
+
+        self._files: Dict[Path, _TailedFile] = {}
+        self._has_polled: bool = False
+
+    def poll(self) -> List[LogRecord]:
+        """
+        Reads the data written since the last poll.
+        A file's last record is only returned once the next record starts or the file stops growing, since until then
+        more continuation lines may be added to it.
+
+        Returns:
+            The new records, grouped by file.
+        """
+        records = []
+        seen_paths = set()
+
+        for path in sorted(self.folder.glob(self.pattern)):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            seen_paths.add(path)
+
+            try:
+                records += self._poll_file(path, stat)
+            except FileNotFoundError:
+                # the file was deleted while it was being read
+                seen_paths.discard(path)
+
+        for path in list(self._files):
+            if path not in seen_paths:
+                records += self._files.pop(path).parser.flush()
+
+        self._has_polled = True
+        return records
+
+    def _poll_file(self, path: Path, stat: os.stat_result) -> List[LogRecord]:
+        records = []
+        identity = (stat.st_dev, stat.st_ino)
+
+        tailed_file = self._files.get(path)
+        if tailed_file is not None and tailed_file.is_replaced(identity, stat):
+            # the file was rotated or truncated
+            records += tailed_file.parser.flush()
+            tailed_file = None
+        if tailed_file is None:
+            start_offset = stat.st_size if self.start_at_end and not self._has_polled else 0
+            tailed_file = self._files[path] = _TailedFile(path, identity, start_offset)
+
+        if stat.st_size > tailed_file.parser.offset:
+            # only complete lines are parsed, so a line that is still being written is read again next time.
+            # reading stops at the size that was seen so the offset never passes what was checked above
+            records += _read_log_records(path, tailed_file.parser, is_final=False, size=stat.st_size)
+        else:
+            records += tailed_file.parser.flush()
+        return records
+
+    async def follow(self) -> AsyncIterator[LogRecord]:
+        """
+        Polls the folder forever, yielding records as they are written.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            for record in await loop.run_in_executor(None, self.poll):
+                yield record
+            await asyncio.sleep(self.poll_interval)
+
+
+_index_schema = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    resume_offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    offset INTEGER NOT NULL,
+    timestamp REAL,
+    uptime REAL,
+    thread_id TEXT,
+    level INTEGER,
+    channel TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_file ON records (file_id, offset);
+CREATE INDEX IF NOT EXISTS records_timestamp ON records (timestamp);
+CREATE INDEX IF NOT EXISTS records_level ON records (level, timestamp);
+CREATE INDEX IF NOT EXISTS records_channel ON records (channel, timestamp);
+"""
+
+
+class LogIndex:
+    """
+    A searchable SQLite index of the records in many log files.
+    Updating the index only parses what has been added to files since the last update, and files that were replaced or
+    truncated are indexed again from scratch.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Arguments:
+            path: The path of the index's database file.
+        """
+        self.path: Path = path
+        os.makedirs(path.parent, exist_ok=True)
+        self._connection: sqlite3.Connection = sqlite3.connect(str(path))
+        self._connection.executescript(_index_schema)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _index_file(self, path: Path, stat: os.stat_result) -> bool:
+        connection = self._connection
+        key = str(path)
+        identity = (stat.st_dev, stat.st_ino)
+
+        row = connection.execute(
+            "SELECT id, device, inode, size, mtime_ns, resume_offset FROM files WHERE path = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            file_id, device, inode, size, mtime_ns, resume_offset = row
+            if (device, inode) == identity and (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return False
+            if (device, inode) != identity or stat.st_size < size or not _is_line_start(path, resume_offset):
+                # the file was replaced or rewritten
+                resume_offset = 0
+        else:
+            file_id = connection.execute(
+                "INSERT INTO files (path, device, inode, size, mtime_ns, resume_offset) VALUES (?, ?, ?, ?, ?, 0)",
+                (key, *identity, stat.st_size, stat.st_mtime_ns)
+            ).lastrowid
+            resume_offset = 0
+
+        # the last record is parsed again, since continuation lines may have been added to it
+        connection.execute("DELETE FROM records WHERE file_id = ? AND offset >= ?", (file_id, resume_offset))
+
+        last_offset = resume_offset
+        batch = []
+        for record in iter_log_records(path, resume_offset):
+            batch.append((
+                file_id,
+                record.offset,
+                record.timestamp.timestamp() if record.timestamp else None,
+                record.uptime,
+                record.thread_id,
+                record.level,
+                record.channel,
+                record.message
+            ))
+            last_offset = record.offset
+            if len(batch) >= 10000:
+                connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                batch.clear()
+        connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+
+        connection.execute(
+            "UPDATE files SET device = ?, inode = ?, size = ?, mtime_ns = ?, resume_offset = ? WHERE id = ?",
+            (*identity, stat.st_size, stat.st_mtime_ns, last_offset, file_id)
+        )
+        return True
+
+    def update(self, folder: Path, pattern: str = "*.log", recursive: bool = False, prune: bool = True) -> int:
+        """
+        Indexes new and changed log files in a folder.
+
+        Arguments:
+            folder: The folder to index.
+            pattern: The glob pattern of the log files in the folder.
+            recursive: Whether to look for log files in subfolders too, like one folder per machine.
+            prune: Whether to remove files that no longer exist in the folder from the index.
+
+        Returns:
+            The number of files that were indexed.
+        """
+        paths = folder.rglob(pattern) if recursive else folder.glob(pattern)
+        seen_paths = set()
+        indexed_count = 0
+
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            seen_paths.add(str(path))
+            try:
+                with self._connection:
+                    if self._index_file(path, stat):
+                        indexed_count += 1
+            except FileNotFoundError:
+                # the file was deleted while it was being indexed
+                seen_paths.discard(str(path))
+
+        if prune:
+            folder_prefix = os.path.join(str(folder), "")
+            with self._connection:
+                for file_id, key in self._connection.execute("SELECT id, path FROM files").fetchall():
+                    if key.startswith(folder_prefix) and key not in seen_paths:
+                        self._connection.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+                        self._connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+        return indexed_count
+
+    def search(
+            self,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            levels: Optional[Iterable[int]] = None,
+            channels: Optional[Iterable[str]] = None,
+            text: Optional[str] = None,
+            limit: Optional[int] = None
+    ) -> Iterator[LogRecord]:
+        """
+        Finds records, ordered by timestamp. Records without a timestamp are only found when start and end are None.
+
+        Arguments:
+            start: Only find records at or after this time.
+            end: Only find records before this time.
+            levels: Only find records with one of these levels.
+            channels: Only find records in one of these channels, like "FLog::Output".
+            text: Only find records whose message contains this text.
+            limit: The maximum number of records to find.
+        """
+        conditions = []
+        parameters = []
+        if start is not None:
+            conditions.append("records.timestamp >= ?")
+            parameters.append(start.timestamp())
+        if end is not None:
+            conditions.append("records.timestamp < ?")
+            parameters.append(end.timestamp())
+        if levels is not None:
+            levels = list(levels)
+            conditions.append(f"records.level IN ({', '.join('?' * len(levels))})")
+            parameters += levels
+        if channels is not None:
+            channels = list(channels)
+            conditions.append(f"records.channel IN ({', '.join('?' * len(channels))})")
+            parameters += channels
+        if text is not None:
+            conditions.append("instr(records.message, ?) > 0")
+            parameters.append(text)
+
+        query = (
+            "SELECT files.path, records.offset, records.timestamp, records.uptime, records.thread_id, records.level, "
+            "records.channel, records.message FROM records JOIN files ON files.id = records.file_id"
+        )
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY records.timestamp, records.file_id, records.offset"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        for path, offset, timestamp, uptime, thread_id, level, channel, message in self._connection.execute(
+                query, parameters
+        ):
+            yield LogRecord(
+                path=Path(path),
+                offset=offset,
+                timestamp=datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None,
+                uptime=uptime,
+                thread_id=thread_id,
+                level=level,
+                channel=channel,
+                message=message
+            )
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from .changes import ChangeType
+from .utilities import write_file_atomic
+
+_format_version = 1
+
+_chunk_size = 1024 * 1024
+# files at least this large are hashed from a memory map in one call, which releases the GIL for the whole file
+_mmap_threshold = 1024 * 1024 * 4
+
+
+class ManifestEntry:
+    __slots__ = ("size", "mtime_ns", "sha256")
+
+    def __init__(self, size: int, mtime_ns: int, sha256: str):
+        self.size: int = size
+        self.mtime_ns: int = mtime_ns
+        self.sha256: str = sha256
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.sha256} size={self.size}>"
+
+
+class FileManifest:
+    """
+    The SHA-256 hashes of a set of files, keyed by their paths relative to a root folder using forward slashes.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, ManifestEntry]] = None):
+        self.entries: Dict[str, ManifestEntry] = entries or {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self, path: Path):
+        """
+        Writes the manifest to a file atomically.
+        """
+        os.makedirs(path.parent, exist_ok=True)
+        write_file_atomic(path, orjson.dumps({
+            "format": _format_version,
+            "files": {
+                relative_path: [entry.size, entry.mtime_ns, entry.sha256]
+                for relative_path, entry in self.entries.items()
+            }
+        }))
+
+    @classmethod
+    def load(cls, path: Path) -> FileManifest:
+        """
+        Reads a manifest written by save.
+        """
+        with open(path, "rb") as file:
+            data = orjson.loads(file.read())
+        if data.get("format") != _format_version:
+            raise ValueError(f"Unsupported file manifest format {data.get('format')!r}")
+        return cls({
+            relative_path: ManifestEntry(size=size, mtime_ns=mtime_ns, sha256=sha256)
+            for relative_path, (size, mtime_ns, sha256) in data["files"].items()
+        })
+
+
+class FileHashCache:
+    """
+    Remembers the hashes of files by their path, size and modification time, so files that haven't changed aren't
+    hashed again. It's safe to use from multiple threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Arguments:
+            path: The file to load the cache from and save it to. None keeps the cache in memory only.
+        """
+        self.path: Optional[Path] = path
+
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._is_dirty: bool = False
+
+        if path is not None:
+            try:
+                with open(path, "rb") as file:
+                    data = orjson.loads(file.read())
+            except (FileNotFoundError, orjson.JSONDecodeError):
+                data = None
+            if data and data.get("format") == _format_version:
+                self._hashes = {key: tuple(value) for key, value in data["hashes"].items()}
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[str]:
+        """
+        Gets the hash of a file, or None if it isn't cached or the file has changed since it was.
+        """
+        cached_hash = self._hashes.get(path)
+        if cached_hash is None or cached_hash[0] != size or cached_hash[1] != mtime_ns:
+            return None
+        return cached_hash[2]
+
+    def set(self, path: str, size: int, mtime_ns: int, sha256: str):
+        with self._lock:
+            self._hashes[path] = (size, mtime_ns, sha256)
+            self._is_dirty = True
+
+    def save(self):
+        """
+        Writes the cache to its file if it has changed since it was loaded.
+        """
+        if self.path is None or not self._is_dirty:
+            return
+        with self._lock:
+            data = orjson.dumps({"format": _format_version, "hashes": self._hashes})
+            self._is_dirty = False
+        os.makedirs(self.path.parent, exist_ok=True)
+        write_file_atomic(self.path, data)
+
+
+def hash_file(path: str, size: Optional[int] = None) -> str:
+    """
+    Gets the SHA-256 hash of a file as a hex string.
+
+    Arguments:
+        path: The path of the file.
+        size: The size of the file if it's already known, used to decide whether to memory map it. The file may have
+              changed since, so it is only a hint.
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        if size is None:
+            size = os.fstat(file.fileno()).st_size
+        is_hashed = False
+        if size >= _mmap_threshold:
+            try:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    sha256.update(data)
+                is_hashed = True
+            except ValueError:
+                # the file was emptied since its size was taken, and empty files can't be memory mapped
+                pass
+        if not is_hashed:
+            while True:
+                chunk = file.read(_chunk_size)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _iter_files(root: str, folder: str) -> Iterable[Tuple[str, str, os.stat_result]]:
+    pending_folders = [folder]
+    while pending_folders:
+        current_folder = pending_folders.pop()
+        try:
+            entries = os.scandir(current_folder)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending_folders.append(entry.path)
+                elif entry.is_file():
+                    relative_path = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                    yield relative_path, entry.path, entry.stat()
+
+
+def build_file_manifest(
+        root: Path,
+        folders: Iterable[Path],
+        hash_cache: Optional[FileHashCache] = None,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None
+) -> FileManifest:
+    """
+    Hashes every file in some folders in parallel.
+
+    Arguments:
+        root: The folder that the manifest's paths are relative to.
+        folders: The folders to hash the files in. Folders that don't exist are skipped.
+        hash_cache: A cache of hashes to reuse for files that haven't changed and to add new hashes to. It's saved
+                    once the manifest has been built.
+        max_workers: The number of threads to hash files in, if executor isn't given.
+        executor: The executor to hash files in. Defaults to a thread pool that is shut down afterwards.
+
+    Returns:
+        The manifest.
+    """
+    root_string = str(root)
+    entries: Dict[str, ManifestEntry] = {}
+    pending_files: List[Tuple[str, str, os.stat_result]] = []
+
+    # folders may overlap, like PlatformContent and PlatformContent/pc
+    seen_paths = set()
+    for folder in folders:
+        for relative_path, path, stat in _iter_files(root_string, os.path.normpath(str(folder))):
+            if relative_path in seen_paths:
+                continue
+            seen_paths.add(relative_path)
+            sha256 = hash_cache.get(path, stat.st_size, stat.st_mtime_ns) if hash_cache is not None else None
+            if sha256 is None:
+                pending_files.append((relative_path, path, stat))
+            else:
+                entries[relative_path] = ManifestEntry(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=sha256)
+
+    if pending_files:
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            # the largest files are started first so that a big file doesn't start last and run alone
+            pending_files.sort(key=lambda pending_file: pending_file[2].st_size, reverse=True)
+            hashes = executor.map(
+                lambda pending_file: hash_file(pending_file[1], pending_file[2].st_size),
+                pending_files
+            )
+            for (relative_path, path, stat), sha256 in zip(pending_files, hashes):
+                entries[relative_path] = ManifestEntry(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=sha256)
+                if hash_cache is not None:
+                    hash_cache.set(path, stat.st_size, stat.st_mtime_ns, sha256)
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=True)
+
+    if hash_cache is not None:
+        hash_cache.save()
+
+    return FileManifest(dict(sorted(entries.items())))
+
+
+class FileChange:
+    def __init__(
+            self,
+            change_type: ChangeType,
+            path: str,
+            old: Optional[ManifestEntry],
+            new: Optional[ManifestEntry]
+    ):
+        self.change_type: ChangeType = change_type
+        self.path: str = path
+        self.old: Optional[ManifestEntry] = old
+        self.new: Optional[ManifestEntry] = new
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.change_type.value} {self.path}>"
+
+
+def diff_file_manifests(old: FileManifest, new: FileManifest) -> List[FileChange]:
+    """
+    Finds the files that were added, removed or changed between two manifests. Files are compared by hash only, so a
+    file that was only touched isn't changed.
+
+    Returns:
+        The changes, sorted by path.
+    """
+    changes = []
+    for path in sorted(old.entries.keys() | new.entries.keys()):
+        old_entry = old.entries.get(path)
+        new_entry = new.entries.get(path)
+        if old_entry is None:
+            changes.append(FileChange(ChangeType.added, path, None, new_entry))
+        elif new_entry is None:
+            changes.append(FileChange(ChangeType.removed, path, old_entry, None))
+        elif old_entry.sha256 != new_entry.sha256:
+            changes.append(FileChange(ChangeType.changed, path, old_entry, new_entry))
+    return changes
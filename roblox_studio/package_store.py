@@ -0,0 +1,189 @@
+import asyncio
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import orjson
+
+from .deployments import DeploymentPackage
+from .downloads import PackageDownloader
+from .utilities import write_file_atomic
+
+
+class PackageStore:
+    """
+    A local store of package zips keyed by their MD5 hash.
+    Packages that are shared between deployments are only downloaded and stored once, and are hardlinked into each
+    folder that uses them. Least recently used packages are evicted when the store grows past its maximum size.
+    """
+
+    def __init__(self, path: Path, max_size: Optional[int] = None):
+        """
+        Arguments:
+            path: The folder to keep the store in.
+            max_size: The maximum total size of stored packages in bytes, or None for no limit.
+        """
+        self.path: Path = path
+        self.max_size: Optional[int] = max_size
+
+        self._index: Optional[Dict[str, Dict[str, float]]] = None
+
+    @property
+    def _blobs_folder_path(self):
+        return self.path / "blobs"
+
+    @property
+    def _staging_folder_path(self):
+        return self.path / "staging"
+
+    @property
+    def _index_file_path(self):
+        return self.path / "index.json"
+
+    def get_blob_path(self, md5: str) -> Path:
+        md5 = md5.lower()
+        return self._blobs_folder_path / md5[:2] / md5
+
+    def has_package(self, package: DeploymentPackage) -> bool:
+        return self.get_blob_path(package.md5).exists()
+
+    def _get_index(self) -> Dict[str, Dict[str, float]]:
+        if self._index is None:
+            try:
+                with open(self._index_file_path, "rb") as index_file:
+                    self._index = orjson.loads(index_file.read())
+            except FileNotFoundError:
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.path, exist_ok=True)
+        write_file_atomic(self._index_file_path, orjson.dumps(self._index))
+
+    def _mark_used(self, packages: Iterable[DeploymentPackage]):
+        index = self._get_index()
+        now = time.time()
+        for package in packages:
+            md5 = package.md5.lower()
+            index[md5] = {
+                "size": self.get_blob_path(md5).stat().st_size,
+                "last_used": now
+            }
+        self._save_index()
+
+    async def fetch_packages(
+            self,
+            downloader: PackageDownloader,
+            packages: Iterable[DeploymentPackage]
+    ) -> Dict[str, Path]:
+        """
+        Downloads the packages that aren't in the store yet and adds them to it.
+
+        Returns:
+            A dictionary where the keys are package names and the values are the paths of their stored copies.
+        """
+        packages = list(packages)
+
+        missing_packages: Dict[str, DeploymentPackage] = {}
+        for package in packages:
+            if not self.has_package(package):
+                missing_packages.setdefault(package.md5.lower(), package)
+
+        async def fetch(md5: str, package: DeploymentPackage):
+            # each hash gets its own staging folder so interrupted downloads can be resumed
+            staging_path = self._staging_folder_path / md5
+            os.makedirs(staging_path, exist_ok=True)
+            downloaded_path = await downloader.download_package(package, staging_path)
+
+            blob_path = self.get_blob_path(md5)
+            os.makedirs(blob_path.parent, exist_ok=True)
+            os.replace(downloaded_path, blob_path)
+            shutil.rmtree(staging_path, ignore_errors=True)
+
+        await asyncio.gather(*[fetch(md5, package) for md5, package in missing_packages.items()])
+
+        self._mark_used(packages)
+        self.evict(keep={package.md5.lower() for package in packages})
+
+        return {package.name: self.get_blob_path(package.md5) for package in packages}
+
+    def link_packages(self, packages: Iterable[DeploymentPackage], folder: Path) -> Dict[str, Path]:
+        """
+        Places stored packages into a folder under their package names.
+        Files are hardlinked to the stored copies where possible and copied otherwise.
+
+        Returns:
+            A dictionary where the keys are package names and the values are the paths they were placed at.
+        """
+        os.makedirs(folder, exist_ok=True)
+        packages = list(packages)
+        paths = {}
+
+        for package in packages:
+            blob_path = self.get_blob_path(package.md5)
+            file_path = folder / package.name
+
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+            try:
+                os.link(blob_path, file_path)
+            except OSError:
+                shutil.copyfile(blob_path, file_path)
+
+            paths[package.name] = file_path
+
+        self._mark_used(packages)
+        return paths
+
+    def get_size(self) -> int:
+        """
+        Gets the total size of the stored packages in bytes.
+        """
+        return sum(entry["size"] for entry in self._get_index().values())
+
+    def evict(self, max_size: Optional[int] = None, keep: Iterable[str] = ()) -> List[str]:
+        """
+        Removes the least recently used packages until the store is no larger than max_size.
+        Folders that packages were linked into keep their copies.
+
+        Arguments:
+            max_size: The size to shrink the store to. Defaults to the store's maximum size.
+            keep: MD5 hashes that must not be evicted.
+
+        Returns:
+            The MD5 hashes of the evicted packages.
+        """
+        if max_size is None:
+            max_size = self.max_size
+        if max_size is None:
+            return []
+
+        index = self._get_index()
+        keep = set(keep)
+        total_size = self.get_size()
+        evicted = []
+
+        for md5, entry in sorted(index.items(), key=lambda item: item[1]["last_used"]):
+            if total_size <= max_size:
+                break
+            if md5 in keep:
+                continue
+
+            try:
+                os.remove(self.get_blob_path(md5))
+            except FileNotFoundError:
+                pass
+            total_size -= entry["size"]
+            evicted.append(md5)
+
+        if evicted:
+            for md5 in evicted:
+                del index[md5]
+            self._save_index()
+
+        return evicted
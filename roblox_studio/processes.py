@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Optional, Set
+
+from .environments import Version
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# lines longer than this are dropped instead of being split up
+_line_limit = 1024 * 1024
+
+
+async def _discard_line(reader: asyncio.StreamReader):
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            # the output ended before the line did
+            return
+        except asyncio.LimitOverrunError as exception:
+            # drop what has been checked for a newline so far, which is everything before the newline if it was found
+            await reader.readexactly(exception.consumed)
+
+
+class OutputStream(Enum):
+    stdout = "stdout"
+    stderr = "stderr"
+
+
+class OutputLine:
+    __slots__ = ("stream", "text", "timestamp")
+
+    def __init__(self, stream: OutputStream, text: str, timestamp: datetime):
+        self.stream: OutputStream = stream
+        self.text: str = text
+        self.timestamp: datetime = timestamp
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.stream.value}: {self.text!r}>"
+
+
+OutputCallback = Callable[["StudioProcess", OutputLine], None]
+
+
+class ResourceUsage:
+    """
+    A sample of a process's resource usage.
+    """
+
+    def __init__(self, cpu_time: float, memory: int, thread_count: int):
+        """
+        Arguments:
+            cpu_time: The user and system CPU time used so far, in seconds.
+            memory: The resident memory in bytes.
+            thread_count: The number of threads.
+        """
+        self.cpu_time: float = cpu_time
+        self.memory: int = memory
+        self.thread_count: int = thread_count
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} cpu_time={self.cpu_time:.2f}s memory={self.memory}>"
+
+
+class StudioProcess:
+    """
+    A Roblox Studio process started by a StudioProcessManager. Its output is read continuously and passed to output
+    callbacks and iterators line by line, so Studio never stalls on a full pipe.
+    Resource usage is sampled while the process runs if psutil is installed.
+    """
+
+    def __init__(self, version: Version, process: asyncio.subprocess.Process, sample_interval: float):
+        self.version: Version = version
+        self.process: asyncio.subprocess.Process = process
+        self.pid: int = process.pid
+        self.started_at: float = time.monotonic()
+        self.ended_at: Optional[float] = None
+
+        self.resource_usage: Optional[ResourceUsage] = None
+        self.peak_memory: Optional[int] = None
+
+        self._output_callbacks: List[OutputCallback] = []
+        self._output_queues: Set[asyncio.Queue] = set()
+
+        self._reader_tasks: List[asyncio.Task] = [
+            asyncio.ensure_future(self._read_stream(OutputStream.stdout, process.stdout)),
+            asyncio.ensure_future(self._read_stream(OutputStream.stderr, process.stderr))
+        ]
+        self._sampler_task: Optional[asyncio.Task] = None
+        if psutil is not None:
+            self._sampler_task = asyncio.ensure_future(self._sample_resource_usage(sample_interval))
+        self._wait_task: asyncio.Task = asyncio.ensure_future(self._wait())
+
+    @property
+    def return_code(self) -> Optional[int]:
+        return self.process.returncode
+
+    @property
+    def is_running(self) -> bool:
+        return not self._wait_task.done()
+
+    @property
+    def run_time(self) -> float:
+        """
+        The number of seconds the process has been running for, or ran for if it has exited.
+        """
+        return (self.ended_at or time.monotonic()) - self.started_at
+
+    def add_output_callback(self, callback: OutputCallback):
+        """
+        Adds a function that is called with this process and each line of output it writes from now on.
+        """
+        self._output_callbacks.append(callback)
+
+    def remove_output_callback(self, callback: OutputCallback):
+        self._output_callbacks.remove(callback)
+
+    async def iter_output(self) -> AsyncIterator[OutputLine]:
+        """
+        Iterates over the lines of output the process writes from now on, until it closes its output.
+        Lines are queued for the iterator until they are consumed, so iterators should keep up with the process.
+        """
+        if not self._reader_tasks_running():
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self._output_queues.add(queue)
+        try:
+            while True:
+                line = await queue.get()
+                if line is None:
+                    break
+                yield line
+        finally:
+            self._output_queues.discard(queue)
+
+    def _reader_tasks_running(self) -> bool:
+        return not all(task.done() for task in self._reader_tasks)
+
+    async def _read_stream(self, stream: OutputStream, reader: asyncio.StreamReader):
+        while True:
+            try:
+                data = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as exception:
+                # the output ended without a newline
+                data = exception.partial
+            except asyncio.LimitOverrunError:
+                # the line is longer than the limit, so all of it is dropped, up to and including its newline
+                await _discard_line(reader)
+                continue
+            if not data:
+                break
+
+            line = OutputLine(
+                stream=stream,
+                text=data.decode("utf-8", errors="replace").rstrip("\r\n"),
+                timestamp=datetime.now()
+            )
+            for callback in list(self._output_callbacks):
+                callback(self, line)
+            for queue in self._output_queues:
+                queue.put_nowait(line)
+
+    def _sample(self, psutil_process):
+        cpu_times = psutil_process.cpu_times()
+        self.resource_usage = ResourceUsage(
+            cpu_time=cpu_times.user + cpu_times.system,
+            memory=psutil_process.memory_info().rss,
+            thread_count=psutil_process.num_threads()
+        )
+        self.peak_memory = max(self.peak_memory or 0, self.resource_usage.memory)
+
+    async def _sample_resource_usage(self, sample_interval: float):
+        try:
+            psutil_process = psutil.Process(self.pid)
+            while True:
+                self._sample(psutil_process)
+                await asyncio.sleep(sample_interval)
+        except psutil.Error:
+            # the process has exited
+            pass
+
+    async def _wait(self) -> int:
+        return_code = await self.process.wait()
+        self.ended_at = time.monotonic()
+        if self._sampler_task is not None:
+            self._sampler_task.cancel()
+        await asyncio.gather(*self._reader_tasks, return_exceptions=True)
+        for queue in self._output_queues:
+            queue.put_nowait(None)
+        return return_code
+
+    async def wait(self, timeout: Optional[float] = None) -> int:
+        """
+        Waits for the process to exit and for all of its output to be read.
+        Raises asyncio.TimeoutError if it doesn't exit within timeout seconds, leaving it running.
+
+        Returns:
+            The process's exit code.
+        """
+        return await asyncio.wait_for(asyncio.shield(self._wait_task), timeout)
+
+    async def stop(self, grace_period: float = 5.0) -> int:
+        """
+        Asks the process to exit, and kills it if it hasn't exited after grace_period seconds.
+        On Windows, processes can't be asked to exit, so they are always killed straight away.
+
+        Returns:
+            The process's exit code.
+        """
+        if self.is_running:
+            try:
+                self.process.terminate()
+            except ProcessLookupError:
+                pass
+            try:
+                return await self.wait(timeout=grace_period)
+            except asyncio.TimeoutError:
+                try:
+                    self.process.kill()
+                except ProcessLookupError:
+                    pass
+        return await self.wait()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} pid={self.pid} return_code={self.return_code}>"
+
+
+class StudioProcessManager:
+    """
+    Launches and keeps track of Roblox Studio processes.
+    Use it as an async context manager to stop any processes that are still running when the block exits.
+    """
+
+    def __init__(
+            self,
+            max_processes: Optional[int] = None,
+            timeout: Optional[float] = None,
+            grace_period: float = 5.0,
+            output_callback: Optional[OutputCallback] = None,
+            sample_interval: float = 1.0
+    ):
+        """
+        Arguments:
+            max_processes: The maximum number of processes running at once. launch waits for a process to exit when
+                           the limit is reached. None means no limit.
+            timeout: The default number of seconds a process may run for before it is stopped. None means no limit.
+            grace_period: The number of seconds stopped processes are given to exit before they are killed.
+            output_callback: A function called with each process and each line of output it writes.
+            sample_interval: The number of seconds between resource usage samples. Only used if psutil is installed.
+        """
+        self.timeout: Optional[float] = timeout
+        self.grace_period: float = grace_period
+        self.output_callback: Optional[OutputCallback] = output_callback
+        self.sample_interval: float = sample_interval
+
+        self.max_processes: Optional[int] = max_processes
+
+        self.processes: List[StudioProcess] = []
+        # created by the first launch, since before Python 3.10 a semaphore is bound to the loop that is current when
+        # it's created
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._supervisor_tasks: Set[asyncio.Task] = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop_all()
+
+    @property
+    def running_processes(self) -> List[StudioProcess]:
+        return [process for process in self.processes if process.is_running]
+
+    async def launch(
+            self,
+            version: Version,
+            *,
+            file: Optional[Path] = None,
+            base_url: Optional[str] = None,
+            disable_user_plugins: bool = False,
+            timeout: Optional[float] = None
+    ) -> StudioProcess:
+        """
+        Launches Roblox Studio. See Version.launch for the launch arguments.
+
+        Arguments:
+            version: The Studio version to launch.
+            timeout: The number of seconds the process may run for before it is stopped. Defaults to the manager's
+                     timeout.
+        """
+        if self.max_processes and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_processes)
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+
+        try:
+            args = version.get_launch_args(file=file, base_url=base_url, disable_user_plugins=disable_user_plugins)
+            process = await asyncio.create_subprocess_exec(
+                *[str(arg) for arg in args],
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=_line_limit
+            )
+        except BaseException:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+
+        studio_process = StudioProcess(version=version, process=process, sample_interval=self.sample_interval)
+        if self.output_callback is not None:
+            studio_process.add_output_callback(self.output_callback)
+        self.processes.append(studio_process)
+
+        if timeout is None:
+            timeout = self.timeout
+        supervisor_task = asyncio.ensure_future(self._supervise(studio_process, timeout))
+        self._supervisor_tasks.add(supervisor_task)
+        supervisor_task.add_done_callback(self._supervisor_tasks.discard)
+
+        return studio_process
+
+    async def _supervise(self, studio_process: StudioProcess, timeout: Optional[float]):
+        try:
+            try:
+                await studio_process.wait(timeout=timeout)
+            except asyncio.TimeoutError:
+                await studio_process.stop(grace_period=self.grace_period)
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    async def wait_all(self) -> List[int]:
+        """
+        Waits for every launched process to exit.
+
+        Returns:
+            Their exit codes, in launch order.
+        """
+        return list(await asyncio.gather(*[process.wait() for process in self.processes]))
+
+    async def stop_all(self, grace_period: Optional[float] = None) -> List[int]:
+        """
+        Stops every running process, killing those that don't exit within grace_period seconds.
+
+        Returns:
+            The exit codes of every launched process, in launch order.
+        """
+        if grace_period is None:
+            grace_period = self.grace_period
+        await asyncio.gather(*[process.stop(grace_period=grace_period) for process in self.running_processes])
+        await asyncio.gather(*self._supervisor_tasks, return_exceptions=True)
+        return await self.wait_all()
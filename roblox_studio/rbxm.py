@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import mmap
+import os
+from enum import Enum
+from pathlib import Path
+from struct import Struct
+from typing import Dict, Iterable, List, Optional, Union
+
+import orjson
+
+from .utilities import write_file_atomic
+
+_format_version = 2
+
+_binary_magic = b"<roblox!\x89\xff\r\n\x1a\n"
+_xml_magic = b"<roblox"
+_zstd_magic = b"\x28\xb5\x2f\xfd"
+
+# magic, format version, class count, instance count, reserved
+_header = Struct("<14sHii8x")
+# name, compressed size, uncompressed size, reserved
+_chunk_header = Struct("<4sII4x")
+
+_end_chunk_name = "END"
+
+
+class RbxmFormatError(ValueError):
+    """
+    Raised when a model file is truncated or isn't a Roblox model file.
+    """
+
+    def __init__(self, path: Path, message: str):
+        super().__init__(f"{path}: {message}")
+        self.path: Path = path
+
+
+class ChunkCompression(Enum):
+    none = "none"
+    lz4 = "lz4"
+    zstd = "zstd"
+
+
+class RbxmChunk:
+    __slots__ = ("name", "offset", "compressed_size", "size", "compression")
+
+    def __init__(self, name: str, offset: int, compressed_size: int, size: int, compression: ChunkCompression):
+        """
+        Arguments:
+            name: The chunk's name, like "INST", "PROP" or "PRNT".
+            offset: The offset of the chunk's data in the file.
+            compressed_size: The size of the chunk's data in the file.
+            size: The size of the chunk's data once decompressed.
+            compression: How the chunk's data is compressed.
+        """
+        self.name: str = name
+        self.offset: int = offset
+        self.compressed_size: int = compressed_size
+        self.size: int = size
+        self.compression: ChunkCompression = compression
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name} size={self.size}>"
+
+
+class RbxmInfo:
+    """
+    The header and chunk table of a Roblox model file like a built-in plugin. Instances aren't decoded.
+    XML model files have no header or chunks, so their counts are None.
+    """
+
+    def __init__(
+            self,
+            path: Path,
+            size: int,
+            mtime_ns: int,
+            is_binary: bool,
+            format_version: Optional[int] = None,
+            class_count: Optional[int] = None,
+            instance_count: Optional[int] = None,
+            chunks: Optional[List[RbxmChunk]] = None
+    ):
+        self.path: Path = path
+        self.size: int = size
+        self.mtime_ns: int = mtime_ns
+        self.is_binary: bool = is_binary
+        self.format_version: Optional[int] = format_version
+        self.class_count: Optional[int] = class_count
+        self.instance_count: Optional[int] = instance_count
+        self.chunks: List[RbxmChunk] = chunks or []
+
+    def get_chunk_sizes(self) -> Dict[str, int]:
+        """
+        Gets the total decompressed size of each type of chunk.
+        """
+        chunk_sizes = {}
+        for chunk in self.chunks:
+            chunk_sizes[chunk.name] = chunk_sizes.get(chunk.name, 0) + chunk.size
+        return chunk_sizes
+
+    def get_chunk_counts(self) -> Dict[str, int]:
+        """
+        Gets the number of chunks of each type. There is one INST chunk per class and one PROP chunk per property of
+        each class.
+        """
+        chunk_counts = {}
+        for chunk in self.chunks:
+            chunk_counts[chunk.name] = chunk_counts.get(chunk.name, 0) + 1
+        return chunk_counts
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.path.name} instance_count={self.instance_count}>"
+
+
+def _read_chunks(path: Path, data: mmap.mmap, offset: int) -> List[RbxmChunk]:
+    chunks = []
+    data_size = len(data)
+    while True:
+        if offset + _chunk_header.size > data_size:
+            raise RbxmFormatError(path, "the file ends before its END chunk")
+        raw_name, compressed_size, size = _chunk_header.unpack_from(data, offset)
+        offset += _chunk_header.size
+
+        name = raw_name.rstrip(b"\x00").decode("ascii", errors="replace")
+        stored_size = compressed_size or size
+        if offset + stored_size > data_size:
+            raise RbxmFormatError(path, f"the {name} chunk at {offset} is truncated")
+
+        if not compressed_size:
+            compression = ChunkCompression.none
+        elif data[offset:offset + len(_zstd_magic)] == _zstd_magic:
+            compression = ChunkCompression.zstd
+        else:
+            compression = ChunkCompression.lz4
+
+        chunks.append(RbxmChunk(
+            name=name,
+            offset=offset,
+            compressed_size=compressed_size,
+            size=size,
+            compression=compression
+        ))
+        offset += stored_size
+
+        if name == _end_chunk_name:
+            return chunks
+
+
+def read_rbxm_info(path: Path) -> RbxmInfo:
+    """
+    Reads the header and chunk table of a model file. The file is memory mapped and only the chunk headers are read,
+    so the pages of chunk data are never loaded.
+    Raises RbxmFormatError if the file isn't a valid model file.
+    """
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        if stat.st_size < _header.size:
+            data = file.read()
+            if data.startswith(_xml_magic) and not data.startswith(_binary_magic):
+                return RbxmInfo(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, is_binary=False)
+            raise RbxmFormatError(path, "the file is too short to be a model file")
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, format_version, class_count, instance_count = _header.unpack_from(data, 0)
+            if magic != _binary_magic:
+                if data[:len(_xml_magic)] == _xml_magic:
+                    return RbxmInfo(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, is_binary=False)
+                raise RbxmFormatError(path, "the file isn't a model file")
+
+            return RbxmInfo(
+                path=path,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                is_binary=True,
+                format_version=format_version,
+                class_count=class_count,
+                instance_count=instance_count,
+                chunks=_read_chunks(path, data, _header.size)
+            )
+
+
+def _get_fingerprint(path: Path, stat: os.stat_result) -> str:
+    # extracted files get new modification times, so this only matches the same file on disk and a file replaced in
+    # place is read again
+    return f"{path}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class RbxmIndex:
+    """
+    Reads the model files in folders like Version.built_in_plugins_folder_path, caching what was read by each file's
+    fingerprint: its path, inode, size and modification time. Files are only read again once they change, so
+    scanning the same versions again, like with a cache_path that's kept between runs, reads nothing.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Arguments:
+            cache_path: The file to load the cache from and save it to after each scan. None keeps the cache in memory
+                        only.
+        """
+        self.cache_path: Optional[Path] = cache_path
+
+        # fingerprint -> [[format version, class count, instance count], [[name, offset, compressed size, size,
+        # compression], ...]], with None in place of the header for XML files
+        self._cache: Dict[str, list] = {}
+        self._is_dirty: bool = False
+
+        if cache_path is not None:
+            try:
+                with open(cache_path, "rb") as file:
+                    data = orjson.loads(file.read())
+            except (FileNotFoundError, orjson.JSONDecodeError):
+                data = None
+            if data and data.get("format") == _format_version:
+                self._cache = data["files"]
+
+    def _from_cache(self, path: Path, stat: os.stat_result, cached_info: list) -> RbxmInfo:
+        header, raw_chunks = cached_info
+        if header is None:
+            return RbxmInfo(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, is_binary=False)
+        format_version, class_count, instance_count = header
+        return RbxmInfo(
+            path=path,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            is_binary=True,
+            format_version=format_version,
+            class_count=class_count,
+            instance_count=instance_count,
+            chunks=[
+                RbxmChunk(
+                    name=name,
+                    offset=offset,
+                    compressed_size=compressed_size,
+                    size=size,
+                    compression=ChunkCompression(compression)
+                )
+                for name, offset, compressed_size, size, compression in raw_chunks
+            ]
+        )
+
+    def _to_cache(self, info: RbxmInfo) -> list:
+        if not info.is_binary:
+            return [None, []]
+        return [
+            [info.format_version, info.class_count, info.instance_count],
+            [
+                [chunk.name, chunk.offset, chunk.compressed_size, chunk.size, chunk.compression.value]
+                for chunk in info.chunks
+            ]
+        ]
+
+    def get_info(self, path: Path) -> RbxmInfo:
+        """
+        Gets the header and chunk table of a model file, reading it only if its fingerprint isn't cached.
+        """
+        stat = os.stat(path)
+        fingerprint = _get_fingerprint(path, stat)
+        cached_info = self._cache.get(fingerprint)
+        if cached_info is not None:
+            return self._from_cache(path, stat, cached_info)
+
+        info = read_rbxm_info(path)
+        # the file may have changed since it was stat'ed, in which case what was read isn't cached
+        if (info.size, info.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            self._cache[fingerprint] = self._to_cache(info)
+            self._is_dirty = True
+        return info
+
+    def scan(
+            self,
+            folders: Iterable[Path],
+            pattern: str = "*.rbxm",
+            return_exceptions: bool = False
+    ) -> List[Union[RbxmInfo, RbxmFormatError]]:
+        """
+        Reads every model file in some folders. Folders that don't exist are skipped.
+        The cache is saved even if a file can't be read, so the files read before it aren't read again.
+
+        Arguments:
+            folders: The folders to scan.
+            pattern: The glob pattern of the model files in the folders.
+            return_exceptions: Whether to return the RbxmFormatError of files that aren't valid model files in place
+                               of their information and carry on, instead of raising the first one.
+
+        Returns:
+            The files' information, sorted by path within each folder.
+        """
+        infos = []
+        try:
+            for folder in folders:
+                for path in sorted(folder.glob(pattern)):
+                    if not path.is_file():
+                        continue
+                    try:
+                        infos.append(self.get_info(path))
+                    except RbxmFormatError as exception:
+                        if not return_exceptions:
+                            raise
+                        infos.append(exception)
+        finally:
+            self.save()
+        return infos
+
+    def save(self):
+        """
+        Writes the cache to its file if anything has been added to it.
+        """
+        if self.cache_path is None or not self._is_dirty:
+            return
+        os.makedirs(self.cache_path.parent, exist_ok=True)
+        write_file_atomic(self.cache_path, orjson.dumps({"format": _format_version, "files": self._cache}))
+        self._is_dirty = False
@@ -1,5 +1,50 @@
+import gc
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
 def int_or_none(input):
     if input is None:
         return None
     else:
         return int(input)
+
+
+def write_file_atomic(path: Path, data: bytes):
+    """
+    Writes data to a file without ever exposing a partially written file.
+    The data is written to a temporary file in the same folder, flushed to disk and then renamed over the target.
+    """
+    file_descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Turns off automatic garbage collection for the duration of the block, which can make building many objects at
+    once, like with construct_api_dump or decode_api_dump, several times faster.
+    This affects the whole process, including every other thread, so it is never done by the library itself. Only
+    use it around code that doesn't create reference cycles.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
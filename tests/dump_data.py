@@ -0,0 +1,145 @@
+"""
+A small API dump in its raw JSON form that covers every kind of class member, tag and security level.
+"""
+
+
+def make_dump_json() -> dict:
+    return {
+        "Version": 1,
+        "Classes": [
+            {
+                "Name": "Instance",
+                "Superclass": "<<<ROOT>>>",
+                "MemoryCategory": "Instances",
+                "Tags": ["NotCreatable", "NotBrowsable"],
+                "Members": [
+                    {
+                        "MemberType": "Property",
+                        "Name": "Archivable",
+                        "Category": "Behavior",
+                        "Security": {"Read": "None", "Write": "PluginSecurity"},
+                        "Serialization": {"CanLoad": True, "CanSave": False},
+                        "ThreadSafety": "ReadSafe",
+                        "ValueType": {"Category": "Primitive", "Name": "bool"}
+                    },
+                    {
+                        "MemberType": "Function",
+                        "Name": "FindFirstChild",
+                        "Parameters": [
+                            {"Name": "name", "Type": {"Category": "Primitive", "Name": "string"}},
+                            {"Name": "recursive", "Type": {"Category": "Primitive", "Name": "bool"}}
+                        ],
+                        "ReturnType": {"Category": "Class", "Name": "Instance"},
+                        "Security": "RobloxScriptSecurity",
+                        "ThreadSafety": "Safe"
+                    },
+                    {
+                        "MemberType": "Event",
+                        "Name": "ChildAdded",
+                        "Parameters": [{"Name": "child", "Type": {"Category": "Class", "Name": "Instance"}}],
+                        "Security": "NotAccessibleSecurity",
+                        "ThreadSafety": "Unsafe"
+                    },
+                    {
+                        "MemberType": "Callback",
+                        "Name": "OnInvoke",
+                        "Parameters": [],
+                        "ReturnType": {"Category": "Primitive", "Name": "Tuple"},
+                        "Security": "LocalUserSecurity",
+                        "ThreadSafety": "Unsafe"
+                    }
+                ]
+            },
+            {
+                "Name": "Workspace",
+                "Superclass": "Instance",
+                "MemoryCategory": "PhysicsParts",
+                "Tags": ["Service", "NotReplicated", "Deprecated", "PlayerReplicated", "Settings", "UserSettings"],
+                "Members": []
+            },
+            {
+                # classes without tags don't have a Tags field at all
+                "Name": "Part",
+                "Superclass": "Instance",
+                "MemoryCategory": "Internal",
+                "Members": [
+                    {
+                        "MemberType": "Property",
+                        "Name": "Size",
+                        "Category": "Part",
+                        "Security": {"Read": "RobloxSecurity", "Write": "RobloxPlaceSecurity"},
+                        "Serialization": {"CanLoad": False, "CanSave": True},
+                        "ThreadSafety": "Safe",
+                        "ValueType": {"Category": "DataType", "Name": "Vector3"}
+                    }
+                ]
+            }
+        ],
+        "Enums": [
+            {
+                "Name": "Material",
+                "Items": [
+                    {"Name": "Plastic", "Value": 256},
+                    {"Name": "Air", "Value": 1792},
+                    {"Name": "Negative", "Value": -5}
+                ]
+            },
+            {
+                "Name": "Large",
+                "Items": [
+                    {"Name": "UInt32Max", "Value": 2 ** 32 - 1},
+                    {"Name": "Int32Min", "Value": -2 ** 31},
+                    {"Name": "Int64Max", "Value": 2 ** 63 - 1},
+                    {"Name": "Int64Min", "Value": -2 ** 63}
+                ]
+            },
+            {
+                "Name": "Empty",
+                "Items": []
+            }
+        ]
+    }
+
+
+def make_changed_dump_json() -> dict:
+    """
+    The dump from make_dump_json, with a class, member, enum and enum item of each kind added, removed and changed.
+    """
+    dump_json = make_dump_json()
+    instance_json, _, part_json = dump_json["Classes"]
+    archivable_json, find_first_child_json, child_added_json, on_invoke_json = instance_json["Members"]
+
+    # reordering tags isn't a change
+    instance_json["Tags"].reverse()
+    archivable_json["Security"] = {"Read": "None", "Write": "None"}
+    child_added_json["ThreadSafety"] = "Safe"
+    instance_json["Members"] = [
+        archivable_json,
+        child_added_json,
+        # the callback became a function
+        {**on_invoke_json, "MemberType": "Function"},
+        {
+            "MemberType": "Property",
+            "Name": "Name",
+            "Category": "Data",
+            "Security": {"Read": "None", "Write": "None"},
+            "Serialization": {"CanLoad": True, "CanSave": True},
+            "ThreadSafety": "ReadSafe",
+            "ValueType": {"Category": "Primitive", "Name": "string"}
+        }
+    ]
+    part_json["MemoryCategory"] = "PhysicsParts"
+    dump_json["Classes"] = [
+        instance_json,
+        part_json,
+        {"Name": "Model", "Superclass": "Instance", "MemoryCategory": "Instances", "Members": []}
+    ]
+
+    material_json, large_json, _ = dump_json["Enums"]
+    material_json["Items"] = [
+        {"Name": "Plastic", "Value": 256},
+        {"Name": "Air", "Value": 1793},
+        {"Name": "Wood", "Value": 512}
+    ]
+    dump_json["Enums"] = [material_json, large_json, {"Name": "Shape", "Items": [{"Name": "Ball", "Value": 0}]}]
+    return dump_json
@@ -0,0 +1,97 @@
+"""
+A stand-in for the Roblox setup CDN. Files are served from a dictionary of paths to bytes, with support for range
+requests and conditional requests, and every request is recorded so tests can check what was asked for.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+from aiohttp import web
+from yarl import URL
+
+
+def make_history_line(version_hash: str, day: int, deployment_type: str = "Studio64") -> str:
+    return f"New {deployment_type} version-{version_hash} at 1/{day}/2023 3:04:05 PM, file version: 0, 1, 2, {day}\n"
+
+
+def make_history(days) -> bytes:
+    return "".join(make_history_line(f"{day:016x}", day) for day in days).encode("utf-8")
+
+
+def get_etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+class FakeCDN:
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+        self.requests: List[web.Request] = []
+        self.responses: List[int] = []
+        # paths that return this status instead of their file
+        self.errors: Dict[str, int] = {}
+        # whether Range headers are ignored and the full file is always sent
+        self.ignore_range: bool = False
+        # if set, range requests are answered from this offset instead of the requested one
+        self.forced_range_start: Optional[int] = None
+        # headers added to every response for a file, replacing the ones that would be sent otherwise
+        self.headers: Dict[str, str] = {}
+
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[URL] = None
+
+    def add_packages(self, version_hash: str, packages: Dict[str, bytes]):
+        """
+        Serves the packages of a Windows production version, and the rbxPkgManifest.txt that lists them.
+        """
+        manifest_lines = ["v0"]
+        for name, data in packages.items():
+            self.files[f"{version_hash}-{name}"] = data
+            manifest_lines += [name, hashlib.md5(data).hexdigest(), str(len(data)), str(len(data))]
+        self.files[f"{version_hash}-rbxPkgManifest.txt"] = "\n".join(manifest_lines).encode("utf-8")
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = URL(f"http://127.0.0.1:{port}/")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests.append(request)
+        response = self._respond(request)
+        self.responses.append(response.status)
+        return response
+
+    def _respond(self, request: web.Request) -> web.Response:
+        path = request.match_info["path"]
+        if path in self.errors:
+            return web.Response(status=self.errors[path])
+        if path not in self.files:
+            return web.Response(status=404)
+
+        data = self.files[path]
+        etag = get_etag(data)
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag, **self.headers})
+
+        range_header = request.headers.get("Range")
+        if range_header and not self.ignore_range:
+            start = int(range_header[len("bytes="):].split("-")[0])
+            if self.forced_range_start is not None:
+                start = self.forced_range_start
+            if start >= len(data):
+                return web.Response(status=416, headers={"Content-Range": f"bytes */{len(data)}"})
+            return web.Response(
+                status=206,
+                body=data[start:],
+                headers={"Content-Range": f"bytes {start}-{len(data) - 1}/{len(data)}", "ETag": etag, **self.headers}
+            )
+
+        return web.Response(body=data, headers={"ETag": etag, **self.headers})
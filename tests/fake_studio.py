@@ -0,0 +1,109 @@
+"""
+A stand-in for the Roblox Studio binary. create_fake_version installs it as the binary of a Version, with a behaviour
+that the stand-in reads from a JSON file next to it.
+
+Behaviours:
+    dump        write the dump in "dump" to the path after -API, after sleeping for "delay" seconds
+    fail        write "stderr" to stderr and exit with "exit_code"
+    empty       exit successfully without writing anything
+    hang        sleep forever
+    output      print "lines" to stdout and stderr, then write each of "parts" to stdout separately, then sleep for
+                "delay" seconds
+    stubborn    ignore SIGTERM and sleep forever, so it has to be killed
+
+While it runs, the stand-in keeps a marker file in "state_folder" and appends the number of markers it saw when it
+started to "state_folder"/counts, so tests can check how many ran at once.
+"""
+
+import json
+import os
+import signal
+import stat
+import sys
+import time
+from pathlib import Path
+
+_config_name = "fake_studio.json"
+
+
+def create_fake_version(path: Path, behaviour: str, **options):
+    """
+    Creates a Windows-type version folder whose RobloxStudioBeta.exe is this stand-in.
+    """
+    # imported here so the stand-in itself starts quickly
+    from roblox_studio.environments import Version, VersionType
+
+    version = Version(path=path, version_type=VersionType.windows)
+    os.makedirs(path, exist_ok=True)
+    with open(path / _config_name, "w") as config_file:
+        json.dump({"behaviour": behaviour, **options}, config_file)
+
+    binary_path = version.binary_file_path
+    with open(binary_path, "w") as binary_file:
+        binary_file.write(f"#!{sys.executable}\n")
+        binary_file.write("import runpy\n")
+        binary_file.write(
+            f"runpy.run_path({__file__!r}, {{'config_path': {str(path / _config_name)!r}}}, run_name='__main__')\n"
+        )
+    os.chmod(binary_path, os.stat(binary_path).st_mode | stat.S_IXUSR)
+    return version
+
+
+def get_counts(state_folder: Path):
+    try:
+        with open(state_folder / "counts") as counts_file:
+            return [int(line) for line in counts_file.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def _main(config_path: str):
+    with open(config_path) as config_file:
+        config = json.load(config_file)
+
+    marker_path = None
+    state_folder = config.get("state_folder")
+    if state_folder:
+        state_folder = Path(state_folder)
+        marker_path = state_folder / f"running-{os.getpid()}"
+        marker_path.touch()
+        running_count = len(list(state_folder.glob("running-*")))
+        with open(state_folder / "counts", "a") as counts_file:
+            counts_file.write(f"{running_count}\n")
+
+    try:
+        behaviour = config["behaviour"]
+        if behaviour == "dump":
+            time.sleep(config.get("delay", 0))
+            dump_path = sys.argv[sys.argv.index("-API") + 1]
+            with open(dump_path, "w") as dump_file:
+                json.dump(config["dump"], dump_file)
+        elif behaviour == "fail":
+            sys.stderr.write(config.get("stderr", ""))
+            sys.exit(config.get("exit_code", 1))
+        elif behaviour == "empty":
+            pass
+        elif behaviour == "hang":
+            time.sleep(3600)
+        elif behaviour == "output":
+            for line in config.get("lines", []):
+                print(line, flush=True)
+                print(f"error: {line}", file=sys.stderr, flush=True)
+            for part in config.get("parts", []):
+                sys.stdout.write(part)
+                sys.stdout.flush()
+                # gives the reader time to see each part on its own
+                time.sleep(0.1)
+            time.sleep(config.get("delay", 0))
+        elif behaviour == "stubborn":
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            print("ready", flush=True)
+            time.sleep(3600)
+    finally:
+        if marker_path is not None:
+            marker_path.unlink()
+
+
+if __name__ == "__main__":
+    # config_path is passed in by the binary that runs the stand-in
+    _main(globals()["config_path"])
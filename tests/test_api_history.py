@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime
+
+import orjson
+import pytest
+
+from roblox_studio.api_history import APIHistoryIndex, get_enum_item_symbol, get_enum_symbol, get_member_symbol
+from roblox_studio.branches import RobloxBranch, roblox_branch_to_url
+from roblox_studio.deployments import DeploymentClient, DeploymentType, OperatingSystem
+from roblox_studio.dump import APIDump
+
+from .dump_data import make_changed_dump_json, make_dump_json
+from .fake_cdn import FakeCDN, make_history
+
+
+def get_version_hash(day: int) -> str:
+    return f"version-{day:016x}"
+
+
+def make_index() -> APIHistoryIndex:
+    # the dump changes and then changes back
+    index = APIHistoryIndex(DeploymentType.studio_64)
+    for day, dump_json in enumerate([make_dump_json(), make_changed_dump_json(), make_dump_json()], start=1):
+        index.add_dump(get_version_hash(day), datetime(2023, 1, day), APIDump(**dump_json))
+    return index
+
+
+def describe_ranges(index: APIHistoryIndex, symbol: str):
+    return [
+        (version_range.first.version_hash, version_range.last.version_hash, (
+            version_range.removed_in.version_hash if version_range.removed_in else None
+        ))
+        for version_range in index.get_ranges(symbol)
+    ]
+
+
+def test_index_records_when_symbols_existed():
+    index = make_index()
+    first, second, third = [get_version_hash(day) for day in range(1, 4)]
+
+    # in every version
+    assert describe_ranges(index, "Instance") == [(first, third, None)]
+    assert describe_ranges(index, get_member_symbol("Instance", "Archivable")) == [(first, third, None)]
+    # removed and added back
+    assert describe_ranges(index, "Workspace") == [(first, first, second), (third, third, None)]
+    assert describe_ranges(index, get_enum_item_symbol("Material", "Negative")) == [
+        (first, first, second), (third, third, None)
+    ]
+    # only in the second version
+    assert describe_ranges(index, get_member_symbol("Instance", "Name")) == [(second, second, third)]
+    assert describe_ranges(index, get_enum_symbol("Shape")) == [(second, second, third)]
+    assert describe_ranges(index, "Missing") == []
+
+    assert index.get_introduced("Model").version_hash == second
+    assert index.get_removed("Model").version_hash == third
+    assert index.get_introduced("Workspace").version_hash == first
+    assert index.get_removed("Workspace") is None
+    assert index.get_introduced("Missing") is None
+    assert index.get_removed("Missing") is None
+
+    assert [index.exists_in("Workspace", version_hash) for version_hash in (first, second, third)] == [
+        True, False, True
+    ]
+    assert not index.exists_in("Missing", first)
+    with pytest.raises(KeyError):
+        index.exists_in("Workspace", get_version_hash(4))
+    with pytest.raises(ValueError):
+        index.add_dump(first, datetime(2023, 1, 4), APIDump(**make_dump_json()))
+
+
+def test_index_save_and_load(tmp_path):
+    index = make_index()
+    index_path = tmp_path / "history" / "index.json"
+    index.save(index_path)
+
+    loaded_index = APIHistoryIndex.load(index_path)
+    assert loaded_index.deployment_type == DeploymentType.studio_64
+    assert [(version.version_hash, version.timestamp) for version in loaded_index.versions] == [
+        (version.version_hash, version.timestamp) for version in index.versions
+    ]
+    for symbol in ("Workspace", "Model", get_member_symbol("Instance", "Name"), get_enum_symbol("Empty")):
+        assert describe_ranges(loaded_index, symbol) == describe_ranges(index, symbol)
+
+    # versions added after loading extend the loaded ranges
+    loaded_index.add_dump(get_version_hash(4), datetime(2023, 1, 4), APIDump(**make_dump_json()))
+    assert describe_ranges(loaded_index, "Workspace")[-1] == (get_version_hash(3), get_version_hash(4), None)
+
+    with open(index_path, "wb") as index_file:
+        index_file.write(orjson.dumps({"format": 0}))
+    with pytest.raises(ValueError):
+        APIHistoryIndex.load(index_path)
+
+
+def test_index_update_downloads_new_dumps(monkeypatch):
+    async def main():
+        async with FakeCDN() as cdn:
+            monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.production, cdn.url)
+            # the second deployment has no dump
+            for day, dump_json in ((1, make_dump_json()), (3, make_changed_dump_json()), (4, make_dump_json())):
+                cdn.files[f"{get_version_hash(day)}-API-Dump.json"] = orjson.dumps(dump_json)
+            cdn.files["DeployHistory.txt"] = make_history(range(1, 4))
+
+            index = APIHistoryIndex(DeploymentType.studio_64)
+            async with DeploymentClient() as client:
+                history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+                added = await index.update(history, concurrency=2)
+                assert [version.version_hash for version in added] == [get_version_hash(1), get_version_hash(3)]
+                assert index.is_known(get_version_hash(2))
+
+                cdn.files["DeployHistory.txt"] = make_history(range(1, 5))
+                await history.refresh()
+                cdn.requests.clear()
+                added = await index.update(history)
+                assert [version.version_hash for version in added] == [get_version_hash(4)]
+                # neither the indexed nor the skipped deployments are requested again
+                assert [request.match_info["path"] for request in cdn.requests] == [
+                    f"{get_version_hash(4)}-API-Dump.json"
+                ]
+
+            return index
+
+    index = asyncio.run(main())
+    assert [version.version_hash for version in index.versions] == [get_version_hash(day) for day in (1, 3, 4)]
+    assert describe_ranges(index, "Model") == [(get_version_hash(3), get_version_hash(3), get_version_hash(4))]
@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from roblox_studio.assets import RbxAssetIndex, normalize_rbxasset_path
+from roblox_studio.environments import Version, VersionType
+
+
+def write_file(path, data: bytes = b"asset"):
+    os.makedirs(path.parent, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def make_version(path) -> Version:
+    version = Version(path=path, version_type=VersionType.windows)
+    # the same path in every content folder, and paths that are only in some of them
+    write_file(version.platform_content_folder_path / "pc" / "textures" / "face.png", b"platform")
+    write_file(version.extra_content_folder_path / "textures" / "face.png", b"extra")
+    write_file(version.content_folder_path / "textures" / "face.png", b"content")
+    write_file(version.extra_content_folder_path / "Sounds" / "Click.ogg")
+    write_file(version.content_folder_path / "sounds" / "click.ogg")
+    write_file(version.content_folder_path / "fonts" / "nested" / "Arial.ttf")
+    return version
+
+
+@pytest.mark.parametrize("path", [
+    "rbxasset://Textures/face.png",
+    "RBXASSET://textures/face.png",
+    "/textures\\face.png",
+    "textures/FACE.png/"
+])
+def test_normalize_rbxasset_path(path):
+    assert normalize_rbxasset_path(path) == "textures/face.png"
+
+
+def test_index_resolves_with_folder_precedence(tmp_path):
+    version = make_version(tmp_path / "version")
+    index = RbxAssetIndex.build(version._rbxasset_base_paths)
+    assert len(index) == 3
+
+    # the earliest folder wins, like resolve_rbxasset_to_path
+    platform_face_path = version.platform_content_folder_path / "pc" / "textures" / "face.png"
+    assert index.resolve("rbxasset://textures/face.png") == platform_face_path
+    assert index.resolve("/textures/face.png") == version.resolve_rbxasset_to_path("textures/face.png")
+    # matching is case-insensitive, and the file's own case is kept
+    assert index.resolve("sounds/click.ogg") == version.extra_content_folder_path / "Sounds" / "Click.ogg"
+    assert index.resolve("FONTS/Nested/arial.TTF") == version.content_folder_path / "fonts" / "nested" / "Arial.ttf"
+    # only files are indexed, and nothing outside the content folders
+    assert index.resolve("fonts/nested") is None
+    assert index.resolve("../ClientSettings/ClientAppSettings.json") is None
+    assert index.resolve("textures/missing.png") is None
+
+    assert index.resolve_many(["/textures/face.png", "/textures/face.png", "missing"]) == {
+        "/textures/face.png": platform_face_path,
+        "missing": None
+    }
+
+
+def test_index_staleness(tmp_path):
+    version = make_version(tmp_path / "version")
+    index = RbxAssetIndex.build(version._rbxasset_base_paths)
+    assert not index.is_stale()
+
+    # modifying a file doesn't change what paths resolve to
+    write_file(version.content_folder_path / "sounds" / "click.ogg", b"modified")
+    assert not index.is_stale()
+
+    write_file(version.content_folder_path / "sounds" / "new.ogg")
+    assert index.is_stale()
+
+
+def test_index_notices_content_folders_being_created(tmp_path):
+    version = Version(path=tmp_path / "version", version_type=VersionType.windows)
+    write_file(version.content_folder_path / "textures" / "face.png")
+    index = RbxAssetIndex.build(version._rbxasset_base_paths)
+    assert index.resolve("textures/face.png") == version.content_folder_path / "textures" / "face.png"
+    assert not index.is_stale()
+
+    write_file(version.extra_content_folder_path / "textures" / "face.png")
+    assert index.is_stale()
+
+
+def test_index_save_and_load(tmp_path):
+    version = make_version(tmp_path / "version")
+    index = RbxAssetIndex.build(version._rbxasset_base_paths)
+    index_path = tmp_path / "cache" / "rbxassets.json"
+    index.save(index_path)
+
+    loaded_index = RbxAssetIndex.load(index_path)
+    assert loaded_index.base_paths == index.base_paths
+    for path in ("textures/face.png", "sounds/click.ogg", "fonts/nested/arial.ttf", "missing"):
+        assert loaded_index.resolve(path) == index.resolve(path)
+    assert not loaded_index.is_stale()
+
+
+def test_version_rebuilds_stale_cached_index(tmp_path):
+    version = make_version(tmp_path / "version")
+    cache_path = tmp_path / "cache" / "rbxassets.json"
+    assert version.resolve_rbxassets(["textures/new.png"], cache_path=cache_path) == {"textures/new.png": None}
+    assert cache_path.exists()
+
+    write_file(version.content_folder_path / "textures" / "new.png")
+    # a new Version loads the cached index and notices that it's stale
+    fresh_version = Version(path=version.path, version_type=VersionType.windows)
+    assert fresh_version.resolve_rbxassets(["textures/new.png"], cache_path=cache_path) == {
+        "textures/new.png": version.content_folder_path / "textures" / "new.png"
+    }
+    assert len(RbxAssetIndex.load(cache_path)) == 4
+
+    # an unreadable cache is rebuilt
+    write_file(cache_path, b"not an index")
+    assert len(Version(path=version.path, version_type=VersionType.windows).get_rbxasset_index(cache_path)) == 4
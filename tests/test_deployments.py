@@ -0,0 +1,176 @@
+import asyncio
+import weakref
+from datetime import datetime
+
+import pytest
+from aiohttp import ClientResponseError
+
+from roblox_studio.branches import RobloxBranch, roblox_branch_to_url
+from roblox_studio.deployments import DeploymentClient, DeploymentHistory, DeploymentType, OperatingSystem
+
+from .fake_cdn import FakeCDN, make_history, make_history_line
+
+history_path = "DeployHistory.txt"
+
+
+def version_hashes(entries):
+    return [entry.version_hash for entry in entries]
+
+
+def run_with_cdn(monkeypatch, test):
+    async def main():
+        async with FakeCDN() as cdn:
+            monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.production, cdn.url)
+            async with DeploymentClient() as client:
+                return await test(cdn, client)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_refresh_returns_appended_entries(monkeypatch, lazy):
+    async def test(cdn, client):
+        cdn.files[history_path] = make_history(range(1, 4))
+        history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows, lazy=lazy)
+
+        assert await history.refresh() == []
+
+        cdn.files[history_path] = make_history(range(1, 6))
+        added = await history.refresh()
+        assert version_hashes(added) == [f"version-{day:016x}" for day in (4, 5)]
+        assert len(history.history) == 5
+        assert cdn.responses == [200, 416, 206]
+
+    run_with_cdn(monkeypatch, test)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("ignore_range", [False, True])
+def test_refresh_returns_whole_history_after_full_fetch(monkeypatch, lazy, ignore_range):
+    async def test(cdn, client):
+        cdn.files[history_path] = make_history(range(1, 6))
+        history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows, lazy=lazy)
+
+        # the history was rewritten with fewer, different entries
+        cdn.ignore_range = ignore_range
+        cdn.files[history_path] = make_history(range(10, 13))
+        added = await history.refresh()
+
+        expected_hashes = [f"version-{day:016x}" for day in range(10, 13)]
+        assert version_hashes(added) == expected_hashes
+        assert version_hashes(history.history) == expected_hashes
+        assert cdn.responses == ([200, 200] if ignore_range else [200, 416, 200])
+
+    run_with_cdn(monkeypatch, test)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_refresh_tracks_offset_in_bytes(monkeypatch, lazy):
+    # a line that isn't a deployment, with characters that take more than one byte in UTF-8
+    note_line = "Note: café ☃ deployed\n".encode("utf-8")
+    snowman = "☃".encode("utf-8")
+
+    async def test(cdn, client):
+        cdn.files[history_path] = make_history(range(1, 3)) + note_line
+        history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows, lazy=lazy)
+
+        # the new line is still being written and stops partway through a character
+        cdn.files[history_path] += make_history(range(3, 4)) + b"Note: " + snowman[:2]
+        added = await history.refresh()
+        assert version_hashes(added) == ["version-0000000000000003"]
+
+        cdn.files[history_path] += snowman[2:] + b"\n" + make_history(range(4, 5))
+        added = await history.refresh()
+        assert version_hashes(added) == ["version-0000000000000004"]
+        assert version_hashes(history.history) == [f"version-{day:016x}" for day in range(1, 5)]
+        # every refresh continued from where the last one stopped
+        assert cdn.responses == [200, 206, 206]
+        assert cdn.requests[-1].headers["Range"] == f"bytes={len(make_history(range(1, 4))) + len(note_line)}-"
+
+    run_with_cdn(monkeypatch, test)
+
+
+def test_refresh_rejects_invalid_utf8(monkeypatch):
+    async def test(cdn, client):
+        cdn.files[history_path] = make_history(range(1, 3))
+        history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+
+        cdn.files[history_path] += b"Note: \xff\n" + make_history(range(3, 4))
+        with pytest.raises(UnicodeDecodeError):
+            await history.refresh()
+
+    run_with_cdn(monkeypatch, test)
+
+
+def test_get_all_deployments_tolerates_missing_histories(monkeypatch):
+    async def test(cdn, client):
+        monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.sitetest1, cdn.url / "sitetest1")
+        cdn.files[history_path] = make_history(range(1, 4))
+        cdn.files["mac/DeployHistory.txt"] = make_history(range(4, 6))
+        cdn.files["sitetest1/DeployHistory.txt"] = make_history(range(6, 7))
+        # sitetest1 has no mac history, which S3 responds to with 403
+        cdn.errors["sitetest1/mac/DeployHistory.txt"] = 403
+
+        branches = [RobloxBranch.production, RobloxBranch.sitetest1]
+        histories = await client.get_all_deployments(branches=branches)
+        assert set(histories) == {
+            (RobloxBranch.production, OperatingSystem.windows),
+            (RobloxBranch.production, OperatingSystem.mac),
+            (RobloxBranch.sitetest1, OperatingSystem.windows)
+        }
+        assert len(histories[RobloxBranch.production, OperatingSystem.mac].history) == 2
+
+        results = [
+            result async for result in client.iter_all_deployments(branches=branches, return_exceptions=True)
+        ]
+        assert len(results) == 4
+        exceptions = [
+            (branch, operating_system, history.status)
+            for branch, operating_system, history in results
+            if isinstance(history, ClientResponseError)
+        ]
+        assert exceptions == [(RobloxBranch.sitetest1, OperatingSystem.mac, 403)]
+
+    run_with_cdn(monkeypatch, test)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_history_skips_lines_that_cant_be_parsed(lazy):
+    history_data = "".join([
+        make_history_line("0000000000000001", 1),
+        "New Studio64 version-0000000000000002 at notadate nonsense, file version: 0, 1, 2, 3\n",
+        make_history_line("0000000000000003", 3),
+        "Revert Studio64 version-0000000000000003 at ??? ???\n",
+        make_history_line("0000000000000004", 4, deployment_type="WindowsPlayer")
+    ])
+    history = DeploymentHistory(
+        client=None,
+        branch=RobloxBranch.production,
+        operating_system=OperatingSystem.windows,
+        history_data=history_data,
+        lazy=lazy
+    )
+
+    between = history.get_deployments_between(datetime(2023, 1, 1), datetime(2023, 2, 1))
+    assert version_hashes(between) == [f"version-{day:016x}" for day in (1, 3, 4)]
+    assert version_hashes(history.to_table()) == [f"version-{day:016x}" for day in (1, 3, 4)]
+    assert history.get_latest_deployment(DeploymentType.studio_64).version_hash == "version-0000000000000003"
+    assert len(history.get_deployments_by_type(DeploymentType.studio_64)) == 2
+    assert version_hashes(history.get_deployments_by_version_hash("version-0000000000000003")) == [
+        "version-0000000000000003"
+    ]
+
+
+def test_entries_use_strict_slots():
+    history = DeploymentHistory(
+        client=None,
+        branch=RobloxBranch.production,
+        operating_system=OperatingSystem.windows,
+        history_data=make_history(range(1, 2)).decode("utf-8")
+    )
+    entry = history.history[0]
+    assert not hasattr(entry, "__dict__")
+    with pytest.raises(AttributeError):
+        entry.note = "checked"
+    with pytest.raises(TypeError):
+        weakref.ref(entry)
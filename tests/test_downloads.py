@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+from datetime import datetime
+
+import pytest
+
+from roblox_studio.branches import RobloxBranch, roblox_branch_to_url
+from roblox_studio.deployments import Deployment, DeploymentClient, DeploymentType, OperatingSystem
+from roblox_studio.downloads import PackageChecksumError, PackageDownloader
+
+from .fake_cdn import FakeCDN
+
+version_hash = "version-0123456789abcdef"
+package_data = {
+    "RobloxStudio.zip": bytes(range(256)) * 400,
+    "content-fonts.zip": b"fonts" * 1000
+}
+
+
+def download(monkeypatch, folder, prepare=None, packages=None, concurrency=8):
+    progress = []
+
+    async def main():
+        async with FakeCDN() as cdn:
+            monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.production, cdn.url)
+            cdn.add_packages(version_hash, packages or package_data)
+            if prepare is not None:
+                prepare(cdn)
+            async with DeploymentClient() as client:
+                downloader = PackageDownloader(
+                    client,
+                    concurrency=concurrency,
+                    chunk_size=1024,
+                    progress=lambda package, size, total: progress.append((package.name, size, total))
+                )
+                deployment = Deployment.from_fields(
+                    client=client,
+                    branch=RobloxBranch.production,
+                    operating_system=OperatingSystem.windows,
+                    deployment_type=DeploymentType.studio_64,
+                    version_hash=version_hash,
+                    timestamp=datetime(2023, 1, 1)
+                )
+                packages_list = await deployment.get_packages()
+                paths = await downloader.download_packages(packages_list.packages, folder)
+            return cdn, paths
+
+    cdn, paths = asyncio.run(main())
+    return cdn, paths, progress
+
+
+def get_package_requests(cdn: FakeCDN):
+    return [
+        (request.match_info["path"], request.headers.get("Range"), status)
+        for request, status in zip(cdn.requests, cdn.responses)
+        if not request.match_info["path"].endswith("rbxPkgManifest.txt")
+    ]
+
+
+def test_download_packages(monkeypatch, tmp_path):
+    _, paths, progress = download(monkeypatch, tmp_path, concurrency=1)
+
+    assert set(paths) == set(package_data)
+    for name, data in package_data.items():
+        assert paths[name] == tmp_path / name
+        assert paths[name].read_bytes() == data
+    assert not list(tmp_path.glob("*.part"))
+
+    studio_progress = [(size, total) for name, size, total in progress if name == "RobloxStudio.zip"]
+    assert studio_progress[-1] == (len(package_data["RobloxStudio.zip"]),) * 2
+    assert [size for size, _ in studio_progress] == sorted(size for size, _ in studio_progress)
+
+
+def test_download_resumes_part_file(monkeypatch, tmp_path):
+    data = package_data["RobloxStudio.zip"]
+    (tmp_path / "RobloxStudio.zip.part").write_bytes(data[:5000])
+
+    cdn, paths, _ = download(monkeypatch, tmp_path, packages={"RobloxStudio.zip": data})
+
+    assert paths["RobloxStudio.zip"].read_bytes() == data
+    assert get_package_requests(cdn) == [(f"{version_hash}-RobloxStudio.zip", "bytes=5000-", 206)]
+
+
+def test_download_restarts_when_range_start_differs(monkeypatch, tmp_path):
+    data = package_data["RobloxStudio.zip"]
+    (tmp_path / "RobloxStudio.zip.part").write_bytes(data[:5000])
+
+    def prepare(cdn):
+        cdn.forced_range_start = 4000
+
+    cdn, paths, _ = download(monkeypatch, tmp_path, prepare=prepare, packages={"RobloxStudio.zip": data})
+
+    assert paths["RobloxStudio.zip"].read_bytes() == data
+    assert get_package_requests(cdn) == [
+        (f"{version_hash}-RobloxStudio.zip", "bytes=5000-", 206),
+        (f"{version_hash}-RobloxStudio.zip", None, 200)
+    ]
+
+
+def test_download_complete_part_file(monkeypatch, tmp_path):
+    data = package_data["RobloxStudio.zip"]
+    (tmp_path / "RobloxStudio.zip.part").write_bytes(data)
+
+    cdn, paths, progress = download(monkeypatch, tmp_path, packages={"RobloxStudio.zip": data})
+
+    assert paths["RobloxStudio.zip"].read_bytes() == data
+    assert get_package_requests(cdn) == [(f"{version_hash}-RobloxStudio.zip", f"bytes={len(data)}-", 416)]
+    assert progress == [("RobloxStudio.zip", len(data), len(data))]
+
+
+def test_download_rejects_bad_checksum(monkeypatch, tmp_path):
+    data = package_data["RobloxStudio.zip"]
+    # the part file doesn't match the start of the package
+    (tmp_path / "RobloxStudio.zip.part").write_bytes(bytes(5000))
+
+    with pytest.raises(PackageChecksumError) as exception_info:
+        download(monkeypatch, tmp_path, packages={"RobloxStudio.zip": data})
+
+    assert exception_info.value.md5 != hashlib.md5(data).hexdigest()
+    assert not (tmp_path / "RobloxStudio.zip.part").exists()
+    assert not (tmp_path / "RobloxStudio.zip").exists()
@@ -0,0 +1,55 @@
+import copy
+import pickle
+
+import orjson
+
+from roblox_studio.dump import APIDump, LazyMemberList, construct_api_dump
+
+from .dump_data import make_dump_json
+
+
+def make_dumps():
+    dump_json = make_dump_json()
+    return (
+        APIDump(**copy.deepcopy(dump_json)),
+        construct_api_dump(copy.deepcopy(dump_json)),
+        construct_api_dump(copy.deepcopy(dump_json), lazy=True)
+    )
+
+
+def test_construct_matches_validated_dump():
+    validated_dump, dump, lazy_dump = make_dumps()
+    assert dump == validated_dump
+    assert lazy_dump == validated_dump
+
+
+def test_lazy_dump_serializes_like_eager_dump():
+    validated_dump, _, lazy_dump = make_dumps()
+    assert isinstance(lazy_dump.classes[0].members, LazyMemberList)
+
+    assert orjson.loads(lazy_dump.model_dump_json()) == orjson.loads(validated_dump.model_dump_json())
+    _, _, lazy_dump = make_dumps()
+    assert lazy_dump.model_dump(by_alias=True) == validated_dump.model_dump(by_alias=True)
+
+
+def test_lazy_members_are_a_list():
+    validated_dump, _, lazy_dump = make_dumps()
+    eager_members = validated_dump.classes[0].members
+    members = lazy_dump.classes[0].members
+
+    assert isinstance(members, list)
+    assert len(members) == len(eager_members)
+    assert members + [] == eager_members
+    assert [] + members == eager_members
+    assert list(members) == eager_members
+    assert members[1:] == eager_members[1:]
+    assert [member.name for member in reversed(members)] == [member.name for member in reversed(eager_members)]
+
+    members.append(eager_members[0])
+    assert len(members) == len(eager_members) + 1
+    assert members[-1] is eager_members[0]
+
+
+def test_lazy_members_survive_pickling():
+    validated_dump, _, lazy_dump = make_dumps()
+    assert pickle.loads(pickle.dumps(lazy_dump)) == validated_dump
@@ -0,0 +1,71 @@
+import copy
+
+import pytest
+
+from roblox_studio.dump import APIDump
+from roblox_studio.dump_binary import BinaryAPIDump, decode_api_dump, encode_api_dump, write_api_dump_binary
+
+from .dump_data import make_dump_json
+
+
+def round_trip(dump_json: dict) -> APIDump:
+    return decode_api_dump(encode_api_dump(APIDump(**copy.deepcopy(dump_json))))
+
+
+def test_round_trip_equals_json():
+    dump_json = make_dump_json()
+    assert round_trip(dump_json) == APIDump(**dump_json)
+
+
+def test_round_trip_keeps_members_and_tags():
+    dump = round_trip(make_dump_json())
+    instance_class, workspace_class, part_class = dump.classes
+
+    assert [member.member_type for member in instance_class.members] == ["Property", "Function", "Event", "Callback"]
+    assert [tag.value for tag in instance_class.tags] == ["NotCreatable", "NotBrowsable"]
+    assert len(workspace_class.tags) == 6
+    assert part_class.tags is None
+
+    archivable = instance_class.members[0]
+    assert archivable.security.read.value == "None"
+    assert archivable.security.write.value == "PluginSecurity"
+    assert archivable.serialization.can_load and not archivable.serialization.can_save
+    assert instance_class.members[1].security.value == "RobloxScriptSecurity"
+    assert [parameter.name for parameter in instance_class.members[1].parameters] == ["name", "recursive"]
+
+
+def test_round_trip_keeps_enum_values_outside_int32():
+    dump = round_trip(make_dump_json())
+    large_enum = dump.enums[1]
+    assert [item.value for item in large_enum.items] == [2 ** 32 - 1, -2 ** 31, 2 ** 63 - 1, -2 ** 63]
+
+
+def test_round_trip_with_four_byte_indexes():
+    # more than 65535 distinct strings need 4-byte string indexes
+    dump_json = make_dump_json()
+    dump_json["Enums"].append({
+        "Name": "Huge",
+        "Items": [{"Name": f"Item{index}", "Value": index} for index in range(70000)]
+    })
+    assert round_trip(dump_json) == APIDump(**dump_json)
+
+
+def test_binary_dump_file_lookups(tmp_path):
+    dump_json = make_dump_json()
+    path = tmp_path / "dump.bin"
+    write_api_dump_binary(path, APIDump(**dump_json))
+
+    with BinaryAPIDump.from_file(path) as binary_dump:
+        assert binary_dump.version == 1
+        assert list(binary_dump.class_names) == ["Instance", "Workspace", "Part"]
+        assert list(binary_dump.enum_names) == ["Material", "Large", "Empty"]
+        assert binary_dump.get_class("Part") == APIDump(**dump_json).classes[2]
+        assert binary_dump.get_enum("Large").items[2].value == 2 ** 63 - 1
+        assert binary_dump.get_class("Missing") is None
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        BinaryAPIDump(b"not a dump")
+    with pytest.raises(ValueError):
+        BinaryAPIDump(b"JSON" + bytes(64))
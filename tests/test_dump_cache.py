@@ -0,0 +1,57 @@
+import os
+
+import orjson
+
+from roblox_studio.dump import APIDump
+from roblox_studio.dump_binary import encode_api_dump
+from roblox_studio.dump_cache import APIDumpCache
+from roblox_studio.environments import Version, VersionType
+
+from .dump_data import make_dump_json
+
+
+def test_cache_round_trip(tmp_path):
+    dump_json = make_dump_json()
+    APIDumpCache(tmp_path).set("version-0123456789abcdef", orjson.dumps(dump_json))
+
+    assert sorted(os.listdir(tmp_path)) == ["version-0123456789abcdef.bin", "version-0123456789abcdef.json.gz"]
+    with open(tmp_path / "version-0123456789abcdef.bin", "rb") as binary_file:
+        assert binary_file.read() == encode_api_dump(APIDump(**dump_json))
+
+    cache = APIDumpCache(tmp_path, keep_in_memory=False)
+    assert cache.get("version-0123456789abcdef") == APIDump(**dump_json)
+    assert orjson.loads(cache.get_json("version-0123456789abcdef")) == dump_json
+    assert cache.get("version-fedcba9876543210") is None
+
+
+def test_cache_replaces_unreadable_binary(tmp_path):
+    dump_json = make_dump_json()
+    APIDumpCache(tmp_path).set("key", orjson.dumps(dump_json))
+
+    binary_path = tmp_path / "key.bin"
+    with open(binary_path, "wb") as binary_file:
+        binary_file.write(b"\x80\x04not a dump")
+
+    assert APIDumpCache(tmp_path).get("key") == APIDump(**dump_json)
+    with open(binary_path, "rb") as binary_file:
+        assert binary_file.read() == encode_api_dump(APIDump(**dump_json))
+
+
+def test_cache_keys_differ_between_versions(tmp_path):
+    versions = [
+        Version(path=tmp_path / name, version_type=VersionType.windows)
+        for name in ("version-0123456789abcdef", "version-fedcba9876543210")
+    ]
+    for version in versions:
+        os.makedirs(version.path)
+        with open(version.binary_file_path, "wb") as binary_file:
+            binary_file.write(b"same binary")
+        os.utime(version.binary_file_path, ns=(1_000_000_000, 1_000_000_000))
+
+    first_key, second_key = [version.get_api_dump_cache_key() for version in versions]
+    assert first_key != second_key
+    assert "version-0123456789abcdef" in first_key
+
+    # replacing the binary changes the key
+    os.utime(versions[0].binary_file_path, ns=(2_000_000_000, 2_000_000_000))
+    assert versions[0].get_api_dump_cache_key() != first_key
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime
+
+import orjson
+
+from roblox_studio.branches import RobloxBranch, roblox_branch_to_url
+from roblox_studio.changes import ChangeType
+from roblox_studio.deployments import Deployment, DeploymentClient, DeploymentType, OperatingSystem
+from roblox_studio.dump import APIDump, SecurityLevel, ThreadSafety
+from roblox_studio.dump_diff import diff_api_dump_chain, diff_api_dumps, iter_deployment_dump_diffs
+
+from .dump_data import make_changed_dump_json, make_dump_json
+from .fake_cdn import FakeCDN
+
+
+def summarize(changes, *name_fields):
+    return sorted(
+        (change.change_type.value, *[getattr(change, name_field) for name_field in name_fields])
+        for change in changes
+    )
+
+
+def test_diff_finds_added_removed_and_changed_items():
+    diff = diff_api_dumps(APIDump(**make_dump_json()), APIDump(**make_changed_dump_json()))
+    assert not diff.is_empty
+
+    assert summarize(diff.class_changes, "class_name") == [
+        ("added", "Model"),
+        ("changed", "Part"),
+        ("removed", "Workspace")
+    ]
+    part_change = next(change for change in diff.class_changes if change.class_name == "Part")
+    assert [(change.name, change.old.value, change.new.value) for change in part_change.field_changes] == [
+        ("memory_category", "Internal", "PhysicsParts")
+    ]
+
+    # the removed class's members aren't listed, and neither is anything on the unchanged Part property
+    assert summarize(diff.member_changes, "class_name", "member_name") == [
+        ("added", "Instance", "Name"),
+        ("changed", "Instance", "Archivable"),
+        ("changed", "Instance", "ChildAdded"),
+        ("changed", "Instance", "OnInvoke"),
+        ("removed", "Instance", "FindFirstChild")
+    ]
+    member_changes = {change.member_name: change for change in diff.member_changes}
+    assert member_changes["Archivable"].changed_fields == ["security"]
+    assert member_changes["Archivable"].field_changes[0].new.write == SecurityLevel.none
+    assert member_changes["ChildAdded"].changed_fields == ["thread_safety"]
+    assert member_changes["ChildAdded"].field_changes[0].new == ThreadSafety.safe
+    assert [
+        (change.name, change.old, change.new) for change in member_changes["OnInvoke"].field_changes
+    ] == [("member_type", "Callback", "Function")]
+    assert diff.get_member_changes_by_field("security") == [member_changes["Archivable"]]
+
+    assert summarize(diff.enum_changes, "enum_name") == [("added", "Shape"), ("removed", "Empty")]
+    assert summarize(diff.enum_item_changes, "enum_name", "item_name") == [
+        ("added", "Material", "Wood"),
+        ("changed", "Material", "Air"),
+        ("removed", "Material", "Negative")
+    ]
+    air_change = next(change for change in diff.enum_item_changes if change.item_name == "Air")
+    assert (air_change.old.value, air_change.new.value) == (1792, 1793)
+
+
+def test_diff_of_equal_dumps_is_empty():
+    diff = diff_api_dumps(APIDump(**make_dump_json()), APIDump(**make_dump_json()))
+    assert diff.is_empty
+
+
+def test_diff_chain_diffs_consecutive_dumps():
+    old_dump = APIDump(**make_dump_json())
+    new_dump = APIDump(**make_changed_dump_json())
+    diffs = list(diff_api_dump_chain([old_dump, new_dump, new_dump, old_dump]))
+
+    assert len(diffs) == 3
+    assert summarize(diffs[0].class_changes, "class_name") == summarize(
+        diff_api_dumps(old_dump, new_dump).class_changes, "class_name"
+    )
+    assert diffs[1].is_empty
+    assert summarize(diffs[2].enum_changes, "enum_name") == [("added", "Empty"), ("removed", "Shape")]
+
+
+def test_iter_deployment_dump_diffs(monkeypatch):
+    dumps = [make_dump_json(), make_dump_json(), make_changed_dump_json()]
+
+    async def main():
+        async with FakeCDN() as cdn:
+            monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.production, cdn.url)
+            async with DeploymentClient() as client:
+                deployments = []
+                for day, dump_json in enumerate(dumps, start=1):
+                    version_hash = f"version-{day:016x}"
+                    cdn.files[f"{version_hash}-API-Dump.json"] = orjson.dumps(dump_json)
+                    deployments.append(Deployment.from_fields(
+                        client=client,
+                        branch=RobloxBranch.production,
+                        operating_system=OperatingSystem.windows,
+                        deployment_type=DeploymentType.studio_64,
+                        version_hash=version_hash,
+                        timestamp=datetime(2023, 1, day)
+                    ))
+
+                results = [result async for result in iter_deployment_dump_diffs(deployments, prefetch=1)]
+                # each dump is only downloaded once
+                assert len(cdn.requests) == 3
+                return deployments, results
+
+    deployments, results = asyncio.run(main())
+    assert [(old, new) for old, new, _ in results] == [
+        (deployments[0], deployments[1]),
+        (deployments[1], deployments[2])
+    ]
+    assert results[0][2].is_empty
+    assert ChangeType.removed in {change.change_type for change in results[1][2].class_changes}
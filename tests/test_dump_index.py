@@ -0,0 +1,90 @@
+import copy
+
+from roblox_studio.dump import APIDump, SecurityLevel
+from roblox_studio.dump_index import APIDumpIndex
+
+from .dump_data import make_dump_json
+
+
+def make_index() -> APIDumpIndex:
+    dump_json = make_dump_json()
+    part_json = dump_json["Classes"][2]
+    # a subclass of Part that overrides one of its properties and one of Instance's
+    mesh_part_json = copy.deepcopy(part_json)
+    mesh_part_json["Name"] = "MeshPart"
+    mesh_part_json["Superclass"] = "Part"
+    mesh_part_json["Members"][0]["ValueType"] = {"Category": "DataType", "Name": "Vector2"}
+    mesh_part_json["Members"].append({**dump_json["Classes"][0]["Members"][0], "Category": "Data"})
+    dump_json["Classes"].append(mesh_part_json)
+    # a class whose superclass isn't in the dump
+    dump_json["Classes"].append({**part_json, "Name": "Orphan", "Superclass": "Missing", "Members": []})
+    return APIDumpIndex(APIDump(**dump_json))
+
+
+def names(items):
+    return [item.name for item in items]
+
+
+def test_index_looks_up_classes_and_enums():
+    index = make_index()
+    assert index.get_class("Part") is index.dump.classes[2]
+    assert index.get_class("Missing") is None
+    assert index.get_enum("Material").name == "Material"
+    assert index.get_enum("Missing") is None
+    assert index.get_enum_item("Material", "Air").value == 1792
+    assert index.get_enum_item("Material", "Missing") is None
+    assert index.get_enum_item("Missing", "Air") is None
+
+
+def test_index_follows_inheritance():
+    index = make_index()
+    assert names(index.get_superclass_chain("MeshPart")) == ["Part", "Instance"]
+    assert names(index.get_superclass_chain("Instance")) == []
+    assert names(index.get_superclass_chain("Orphan")) == []
+    assert names(index.get_superclass_chain("Missing")) == []
+
+    assert index.is_a("MeshPart", "Instance")
+    assert index.is_a("Part", "Part")
+    assert not index.is_a("Part", "MeshPart")
+    assert not index.is_a("Missing", "Missing")
+
+    assert names(index.get_subclasses("Instance")) == ["Workspace", "Part"]
+    assert names(index.get_subclasses("Instance", recursive=True)) == ["Workspace", "Part", "MeshPart"]
+    assert names(index.get_subclasses("MeshPart", recursive=True)) == []
+
+
+def test_index_resolves_inherited_members():
+    index = make_index()
+    members = index.get_members("MeshPart")
+    assert list(members) == ["Archivable", "FindFirstChild", "ChildAdded", "OnInvoke", "Size"]
+
+    # members defined on a class take precedence over its superclasses' members
+    assert members["Size"].value_type.name == "Vector2"
+    assert members["Archivable"].category == "Data"
+    assert index.get_member_owner("MeshPart", "Archivable").name == "MeshPart"
+    assert index.get_member_owner("MeshPart", "FindFirstChild").name == "Instance"
+    assert index.get_member("Part", "Size").value_type.name == "Vector3"
+    assert index.get_member("Part", "Missing") is None
+    assert index.get_members("Missing") == {}
+    assert index.get_member_owner("Missing", "Size") is None
+
+
+def test_index_finds_members_by_value_type_and_security():
+    index = make_index()
+    assert [
+        (dump_class.name, member.name) for dump_class, member in index.get_properties_by_value_type("Vector3")
+    ] == [("Part", "Size")]
+    assert index.get_properties_by_value_type("CFrame") == []
+
+    # properties are found by either their read or their write security
+    assert [
+        (dump_class.name, member.name) for dump_class, member in index.get_members_by_security(SecurityLevel.none)
+    ] == [("Instance", "Archivable"), ("MeshPart", "Archivable")]
+    assert [
+        (dump_class.name, member.name)
+        for dump_class, member in index.get_members_by_security(SecurityLevel.roblox_place_security)
+    ] == [("Part", "Size"), ("MeshPart", "Size")]
+    assert [
+        (dump_class.name, member.name)
+        for dump_class, member in index.get_members_by_security(SecurityLevel.roblox_script_security)
+    ] == [("Instance", "FindFirstChild")]
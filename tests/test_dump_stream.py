@@ -0,0 +1,83 @@
+import orjson
+import pytest
+
+from roblox_studio.dump import APIDump
+from roblox_studio.dump_stream import APIDumpStreamParser, iter_api_dump_file
+
+from .dump_data import make_dump_json
+
+
+def make_tricky_dump_json() -> dict:
+    dump_json = make_dump_json()
+    # brackets, quotes and escapes inside strings must not be mistaken for the structure around them
+    dump_json["Classes"][2]["Members"][0]["Category"] = 'Odd "]}" {[ \\" \\\\ é☃ category'
+    dump_json["Enums"][0]["Items"][0]["Name"] = "Plastic]}"
+    dump_json["Enums"].append({"Name": "{[Brackets\\", "Items": [{"Name": '"', "Value": 0}]})
+    return dump_json
+
+
+def parse_in_chunks(dump_data: bytes, chunk_size: int, validate: bool = True):
+    parser = APIDumpStreamParser(validate=validate)
+    items = []
+    for start in range(0, len(dump_data), chunk_size):
+        items += parser.feed(dump_data[start:start + chunk_size])
+    items += parser.close()
+    return parser, items
+
+
+def get_expected_items(dump_json: dict):
+    dump = APIDump(**dump_json)
+    return dump.classes + dump.enums
+
+
+@pytest.mark.parametrize("validate", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024 * 64])
+@pytest.mark.parametrize("indent", [False, True])
+def test_parser_matches_full_parse(chunk_size, validate, indent):
+    dump_json = make_tricky_dump_json()
+    dump_data = orjson.dumps(dump_json, option=orjson.OPT_INDENT_2 if indent else None)
+
+    parser, items = parse_in_chunks(dump_data, chunk_size, validate=validate)
+    assert items == get_expected_items(orjson.loads(dump_data))
+    assert parser.version == 1
+
+
+def test_parser_yields_items_as_they_complete():
+    dump_data = orjson.dumps(make_dump_json())
+    first_class_end = dump_data.index(b'{"Name":"Workspace"')
+
+    parser = APIDumpStreamParser()
+    assert parser.feed(dump_data[:first_class_end - 2]) == []
+    assert [item.name for item in parser.feed(dump_data[first_class_end - 2:first_class_end])] == ["Instance"]
+    assert [item.name for item in parser.feed(dump_data[first_class_end:])] == [
+        "Workspace", "Part", "Material", "Large", "Empty"
+    ]
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1024 * 64])
+def test_parser_rejects_truncated_dumps(chunk_size):
+    dump_data = orjson.dumps(make_tricky_dump_json())
+    for end in (0, 1, len(dump_data) // 2, dump_data.index(b'"Plastic]}"') + 5, len(dump_data) - 1):
+        with pytest.raises(ValueError):
+            parse_in_chunks(dump_data[:end], chunk_size)
+
+
+@pytest.mark.parametrize("trailing_data", [b"{}", b"x", b',"Version":2'])
+def test_parser_rejects_data_after_the_dump(trailing_data):
+    with pytest.raises(ValueError, match="after the end of the dump"):
+        parse_in_chunks(orjson.dumps(make_dump_json()) + trailing_data, 1)
+
+
+def test_parser_allows_whitespace_after_the_dump():
+    _, items = parse_in_chunks(orjson.dumps(make_dump_json()) + b"\n \r\n", 1)
+    assert items == get_expected_items(make_dump_json())
+
+
+def test_iter_api_dump_file(tmp_path):
+    dump_json = make_tricky_dump_json()
+    dump_path = tmp_path / "API-Dump.json"
+    with open(dump_path, "wb") as dump_file:
+        dump_file.write(orjson.dumps(dump_json))
+
+    assert list(iter_api_dump_file(dump_path, chunk_size=3)) == get_expected_items(dump_json)
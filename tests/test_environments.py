@@ -0,0 +1,143 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from roblox_studio.dump import APIDump
+from roblox_studio.environments import APIDumpGenerationError, generate_api_dumps
+
+from .dump_data import make_dump_json
+from .fake_studio import create_fake_version, get_counts
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the Studio stand-in is a script with a shebang")
+
+
+@pytest.fixture
+def temp_folder(tmp_path, monkeypatch):
+    # temporary dumps are created in here, so tests can check that they are cleaned up
+    temp_folder = tmp_path / "temp"
+    temp_folder.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp_folder))
+    return temp_folder
+
+
+def test_generate_api_dump_async(tmp_path, temp_folder):
+    version = create_fake_version(tmp_path / "version", "dump", dump=make_dump_json())
+    dump = asyncio.run(version.generate_api_dump_async(timeout=30))
+    assert dump == APIDump(**make_dump_json())
+    assert os.listdir(temp_folder) == []
+
+
+@pytest.mark.parametrize("behaviour", ["fail", "empty"])
+def test_generate_api_dump_async_failure(tmp_path, temp_folder, behaviour):
+    version = create_fake_version(tmp_path / "version", behaviour, stderr="no dump for you", exit_code=3)
+    with pytest.raises(APIDumpGenerationError) as exception_info:
+        asyncio.run(version.generate_api_dump_async(timeout=30))
+
+    if behaviour == "fail":
+        assert exception_info.value.return_code == 3
+        assert exception_info.value.stderr == b"no dump for you"
+    else:
+        assert exception_info.value.return_code == 0
+    assert os.listdir(temp_folder) == []
+
+
+def test_generate_api_dump_async_timeout(tmp_path, temp_folder):
+    version = create_fake_version(tmp_path / "version", "hang")
+    start = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(version.generate_api_dump_async(timeout=0.5))
+    assert time.monotonic() - start < 10
+    assert os.listdir(temp_folder) == []
+
+
+def test_generate_api_dumps_concurrency_limit(tmp_path, temp_folder):
+    state_folder = tmp_path / "state"
+    state_folder.mkdir()
+    versions = [
+        create_fake_version(
+            tmp_path / f"version{index}",
+            "dump",
+            dump=make_dump_json(),
+            delay=0.3,
+            state_folder=str(state_folder)
+        )
+        for index in range(6)
+    ]
+
+    with ThreadPoolExecutor() as executor:
+        dumps = asyncio.run(generate_api_dumps(versions, concurrency=2, timeout=30, executor=executor))
+
+    assert dumps == [APIDump(**make_dump_json())] * 6
+    counts = get_counts(state_folder)
+    assert len(counts) == 6
+    assert max(counts) <= 2
+    assert os.listdir(temp_folder) == []
+
+
+def test_generate_api_dumps_propagates_errors(tmp_path, temp_folder):
+    versions = [
+        create_fake_version(tmp_path / "good", "dump", dump=make_dump_json()),
+        create_fake_version(tmp_path / "bad", "fail", stderr="broken"),
+        create_fake_version(tmp_path / "slow", "hang")
+    ]
+
+    with ThreadPoolExecutor() as executor:
+        with pytest.raises(APIDumpGenerationError) as exception_info:
+            asyncio.run(generate_api_dumps(versions, concurrency=3, timeout=30, executor=executor))
+        assert exception_info.value.version is versions[1]
+
+        results = asyncio.run(generate_api_dumps(
+            versions[:2],
+            concurrency=2,
+            timeout=30,
+            executor=executor,
+            return_exceptions=True
+        ))
+
+    assert results[0] == APIDump(**make_dump_json())
+    assert isinstance(results[1], APIDumpGenerationError)
+    # the hanging version was killed when the batch failed, and every temporary dump was removed
+    assert os.listdir(temp_folder) == []
+
+
+class _BlockingExecutor(ThreadPoolExecutor):
+    """
+    Runs each parse only once the condition is met or a few seconds have passed, recording whether it was met.
+    """
+
+    def __init__(self, condition):
+        super().__init__()
+        self.condition = condition
+        self.condition_results = []
+
+    def submit(self, function, *args, **kwargs):
+        def wait_then_run():
+            deadline = time.monotonic() + 5
+            while not self.condition() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.condition_results.append(self.condition())
+            return function(*args, **kwargs)
+
+        return super().submit(wait_then_run)
+
+
+def test_generate_api_dumps_releases_slot_before_parsing(tmp_path, temp_folder):
+    state_folder = tmp_path / "state"
+    state_folder.mkdir()
+    versions = [
+        create_fake_version(tmp_path / f"version{index}", "dump", dump=make_dump_json(), state_folder=str(state_folder))
+        for index in range(2)
+    ]
+
+    # the first dump's parse waits until the second Studio process has started, which only happens if the first
+    # process's slot was given up before parsing
+    with _BlockingExecutor(lambda: len(get_counts(state_folder)) == 2) as executor:
+        dumps = asyncio.run(generate_api_dumps(versions, concurrency=1, timeout=30, executor=executor))
+
+    assert len(dumps) == 2
+    assert executor.condition_results[0] is True
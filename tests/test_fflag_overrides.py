@@ -0,0 +1,102 @@
+import asyncio
+import os
+
+import orjson
+import pytest
+
+from roblox_studio import utilities
+from roblox_studio.environments import Version, VersionType, patch_fflag_overrides
+
+
+def make_version(path) -> Version:
+    os.makedirs(path)
+    return Version(path=path, version_type=VersionType.windows)
+
+
+def write_overrides(version: Version, overrides: dict):
+    os.makedirs(version.client_settings_folder_path, exist_ok=True)
+    with open(version.client_app_settings_file_path, "wb") as settings_file:
+        settings_file.write(orjson.dumps(overrides))
+
+
+def read_overrides(version: Version) -> dict:
+    with open(version.client_app_settings_file_path, "rb") as settings_file:
+        return orjson.loads(settings_file.read())
+
+
+def test_patch_keeps_other_overrides(tmp_path):
+    version = make_version(tmp_path / "version")
+    write_overrides(version, {"FFlagKept": "True", "FFlagChanged": "False", "FFlagRemoved": "True"})
+
+    assert version.patch_fflag_overrides({"FFlagChanged": "True", "FFlagAdded": 1}, remove=["FFlagRemoved", "Missing"])
+    assert read_overrides(version) == {"FFlagKept": "True", "FFlagChanged": "True", "FFlagAdded": 1}
+    assert version.get_fflag_overrides() == read_overrides(version)
+
+    # the file isn't written when nothing changes
+    modified_time = os.stat(version.client_app_settings_file_path).st_mtime_ns
+    assert not version.patch_fflag_overrides({"FFlagKept": "True"}, remove=["FFlagRemoved"])
+    assert os.stat(version.client_app_settings_file_path).st_mtime_ns == modified_time
+
+
+def test_patch_creates_missing_file(tmp_path):
+    version = make_version(tmp_path / "version")
+    assert version.get_fflag_overrides() == {}
+    assert not version.patch_fflag_overrides(remove=["FFlagMissing"])
+    assert not os.path.exists(version.client_settings_folder_path)
+
+    assert version.patch_fflag_overrides({"FFlagAdded": "True"})
+    assert read_overrides(version) == {"FFlagAdded": "True"}
+
+
+def test_patch_sees_changes_made_by_others(tmp_path):
+    version = make_version(tmp_path / "version")
+    write_overrides(version, {"FFlagFirst": "True"})
+    assert version.get_fflag_overrides() == {"FFlagFirst": "True"}
+
+    # written by something else, with a size change so the reader notices even if the modification time is the same
+    write_overrides(version, {"FFlagFirst": "True", "FFlagOther": "False"})
+    version.patch_fflag_overrides({"FFlagSecond": "True"})
+    assert read_overrides(version) == {"FFlagFirst": "True", "FFlagOther": "False", "FFlagSecond": "True"}
+
+
+def test_patch_replaces_file_atomically(tmp_path, monkeypatch):
+    version = make_version(tmp_path / "version")
+    write_overrides(version, {"FFlagKept": "True"})
+    settings_path = version.client_app_settings_file_path
+
+    # a reader that already has the file open keeps seeing the old file, since it is replaced rather than rewritten
+    with open(settings_path, "rb") as old_file:
+        version.patch_fflag_overrides({"FFlagAdded": "True"})
+        assert orjson.loads(old_file.read()) == {"FFlagKept": "True"}
+    assert read_overrides(version) == {"FFlagKept": "True", "FFlagAdded": "True"}
+
+    # a write that fails before the rename leaves the old file in place and no temporary files behind
+    def fail_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(utilities.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        version.patch_fflag_overrides({"FFlagLost": "True"})
+    monkeypatch.undo()
+
+    assert read_overrides(version) == {"FFlagKept": "True", "FFlagAdded": "True"}
+    assert os.listdir(version.client_settings_folder_path) == [settings_path.name]
+
+
+def test_patch_many_versions(tmp_path):
+    versions = [make_version(tmp_path / f"version{index}") for index in range(3)]
+    write_overrides(versions[0], {"FFlagKept": "True", "FFlagRemoved": "True"})
+    write_overrides(versions[1], {"FFlagAdded": "True"})
+    # a folder in place of the file, so reading it fails
+    os.makedirs(versions[2].client_app_settings_file_path)
+
+    results = asyncio.run(patch_fflag_overrides(
+        versions,
+        {"FFlagAdded": "True"},
+        remove=["FFlagRemoved"],
+        return_exceptions=True
+    ))
+    assert results[:2] == [True, False]
+    assert isinstance(results[2], OSError)
+    assert read_overrides(versions[0]) == {"FFlagKept": "True", "FFlagAdded": "True"}
+    assert read_overrides(versions[1]) == {"FFlagAdded": "True"}
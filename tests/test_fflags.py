@@ -0,0 +1,46 @@
+import os
+
+import orjson
+
+from roblox_studio import StudioClient
+from roblox_studio.fflags import FFlags
+
+
+def write_fflags(client: StudioClient, flags: dict):
+    os.makedirs(client.client_settings_folder_path, exist_ok=True)
+    with open(client.studio_app_settings_file_path, "wb") as file:
+        file.write(orjson.dumps(flags))
+
+
+def test_get_cached_fflags_returns_a_dict(tmp_path):
+    client = StudioClient(tmp_path)
+    write_fflags(client, {"FFlagDebugDisplayFPS": "True", "DFIntTaskSchedulerTargetFps": "60"})
+
+    flags = client.get_cached_fflags()
+    assert type(flags) is dict
+    assert orjson.loads(orjson.dumps(flags)) == flags
+
+    # modifying the returned dictionary doesn't change what other callers get
+    flags["FFlagDebugDisplayFPS"] = "False"
+    assert client.get_cached_fflags()["FFlagDebugDisplayFPS"] == "True"
+
+
+def test_shared_cached_fflags(tmp_path):
+    client = StudioClient(tmp_path)
+    write_fflags(client, {"FFlagDebugDisplayFPS": "True", "DFIntTaskSchedulerTargetFps": "60", "Other": 1})
+
+    flags = client.get_shared_cached_fflags()
+    assert isinstance(flags, FFlags)
+    assert client.get_shared_cached_fflags() is flags
+    assert flags.get_bool("DebugDisplayFPS") is True
+    assert flags.get_int("TaskSchedulerTargetFps") == 60
+    assert dict(flags.get_prefix(None)) == {"Other": 1}
+
+    changes = []
+    client.fflag_reader.add_callback(changes.append)
+    write_fflags(client, {"FFlagDebugDisplayFPS": "False", "DFIntTaskSchedulerTargetFps": "60", "Other": 1})
+
+    new_flags = client.get_shared_cached_fflags()
+    assert new_flags is not flags
+    assert new_flags.get_bool("DebugDisplayFPS") is False
+    assert changes == [new_flags]
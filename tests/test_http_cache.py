@@ -0,0 +1,95 @@
+import asyncio
+
+from roblox_studio.branches import RobloxBranch, roblox_branch_to_url
+from roblox_studio.deployments import DeploymentClient, OperatingSystem
+from roblox_studio.http_cache import FileHTTPCache, MemoryHTTPCache
+
+from .fake_cdn import FakeCDN, get_etag, make_history
+
+history_path = "DeployHistory.txt"
+
+
+def run_with_cdn(monkeypatch, test):
+    async def main():
+        async with FakeCDN() as cdn:
+            monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.production, cdn.url)
+            return await test(cdn)
+
+    return asyncio.run(main())
+
+
+def test_memory_cache_revalidates_history(monkeypatch):
+    async def test(cdn):
+        cdn.files[history_path] = make_history(range(1, 4))
+        async with DeploymentClient(cache=MemoryHTTPCache()) as client:
+            history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+            assert "If-None-Match" not in cdn.requests[0].headers
+
+            # the parsed history is reused when the server says it hasn't changed
+            assert await client.get_deployments(RobloxBranch.production, OperatingSystem.windows) is history
+            assert cdn.requests[1].headers["If-None-Match"] == get_etag(cdn.files[history_path])
+            assert cdn.responses == [200, 304]
+
+            # asking for a lazy history parses the cached body again instead of downloading it
+            lazy_history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows, lazy=True)
+            assert lazy_history is not history
+            assert len(lazy_history.history) == 3
+            assert cdn.responses == [200, 304, 304]
+
+            cdn.files[history_path] = make_history(range(1, 5))
+            new_history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+            assert new_history is not history
+            assert len(new_history.history) == 4
+            assert cdn.responses == [200, 304, 304, 200]
+
+    run_with_cdn(monkeypatch, test)
+
+
+def test_file_cache_survives_restarts(monkeypatch, tmp_path):
+    async def test(cdn):
+        cdn.files[history_path] = make_history(range(1, 4))
+        async with DeploymentClient(cache=FileHTTPCache(tmp_path)) as client:
+            history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+
+        # a new cache reads the body back from disk and only needs a 304 to reuse it
+        async with DeploymentClient(cache=FileHTTPCache(tmp_path)) as client:
+            cached_history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+            assert await client.get_deployments(RobloxBranch.production, OperatingSystem.windows) is cached_history
+
+        assert cdn.responses == [200, 304, 304]
+        assert [entry.version_hash for entry in cached_history.history] == [
+            entry.version_hash for entry in history.history
+        ]
+
+    run_with_cdn(monkeypatch, test)
+
+
+def test_not_modified_response_updates_validators(monkeypatch, tmp_path):
+    async def test(cdn):
+        cdn.files[history_path] = make_history(range(1, 4))
+        cdn.headers["Last-Modified"] = "Sun, 01 Jan 2023 00:00:00 GMT"
+        async with DeploymentClient(cache=FileHTTPCache(tmp_path)) as client:
+            history = await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+
+            # the server revalidated the history and sent a newer Last-Modified with its 304
+            cdn.headers["Last-Modified"] = "Mon, 02 Jan 2023 00:00:00 GMT"
+            assert await client.get_deployments(RobloxBranch.production, OperatingSystem.windows) is history
+            assert cdn.requests[1].headers["If-Modified-Since"] == "Sun, 01 Jan 2023 00:00:00 GMT"
+
+            assert await client.get_deployments(RobloxBranch.production, OperatingSystem.windows) is history
+            assert cdn.requests[2].headers["If-Modified-Since"] == "Mon, 02 Jan 2023 00:00:00 GMT"
+            assert cdn.responses == [200, 304, 304]
+
+        # the updated validators were saved
+        entry = FileHTTPCache(tmp_path).get(str(cdn.url / history_path))
+        assert entry.last_modified == "Mon, 02 Jan 2023 00:00:00 GMT"
+        assert entry.etag == get_etag(cdn.files[history_path])
+
+        # a new ETag from a 304 is sent with the next request
+        cdn.headers["ETag"] = '"replaced"'
+        async with DeploymentClient(cache=FileHTTPCache(tmp_path)) as client:
+            await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+            await client.get_deployments(RobloxBranch.production, OperatingSystem.windows)
+        assert cdn.requests[4].headers["If-None-Match"] == '"replaced"'
+
+    run_with_cdn(monkeypatch, test)
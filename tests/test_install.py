@@ -0,0 +1,149 @@
+import asyncio
+import io
+import struct
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zipfile import BadZipFile
+
+import pytest
+
+from roblox_studio.branches import RobloxBranch, roblox_branch_to_url
+from roblox_studio.deployments import Deployment, DeploymentClient, DeploymentType, OperatingSystem
+from roblox_studio import install as install_module
+from roblox_studio.install import DeploymentInstaller
+
+from .fake_cdn import FakeCDN
+
+version_hash = "version-0123456789abcdef"
+package_folders = {"RobloxStudio.zip": "", "content-fonts.zip": "content/fonts"}
+
+
+class _UnseekableStream(io.RawIOBase):
+    # zipfile writes data descriptors after each member when it can't seek back to the header
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+
+def make_zip(files, streamed: bool = False) -> bytes:
+    stream = _UnseekableStream() if streamed else io.BytesIO()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for name, data in files.items():
+            zip_file.writestr(name, data)
+    return bytes(stream.data) if streamed else stream.getvalue()
+
+
+def install(monkeypatch, packages, path, executor=None):
+    async def main():
+        async with FakeCDN() as cdn:
+            monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.production, cdn.url)
+            cdn.add_packages(version_hash, packages)
+            async with DeploymentClient() as client:
+                deployment = Deployment.from_fields(
+                    client=client,
+                    branch=RobloxBranch.production,
+                    operating_system=OperatingSystem.windows,
+                    deployment_type=DeploymentType.studio_64,
+                    version_hash=version_hash,
+                    timestamp=datetime(2023, 1, 1)
+                )
+                async with DeploymentInstaller(
+                        client,
+                        concurrency=2,
+                        chunk_size=1024,
+                        executor=executor,
+                        package_folders=package_folders
+                ) as installer:
+                    version = await installer.install(deployment, path)
+                return installer, version
+
+    return asyncio.run(main())
+
+
+def test_install(monkeypatch, tmp_path):
+    large_data = bytes(range(256)) * 1000
+    packages = {
+        "RobloxStudio.zip": make_zip({"RobloxStudioBeta.exe": large_data, "nested/readme.txt": b"hello"}),
+        "content-fonts.zip": make_zip({"arial.ttf": b"font", "empty.txt": b""}, streamed=True),
+        "Unknown.zip": make_zip({"unknown.txt": b"skipped"}),
+        "RobloxPlayerLauncher.exe": b"launcher"
+    }
+
+    installer, version = install(monkeypatch, packages, tmp_path / "version")
+
+    assert version.path == tmp_path / "version"
+    assert (version.path / "RobloxStudioBeta.exe").read_bytes() == large_data
+    assert (version.path / "nested" / "readme.txt").read_bytes() == b"hello"
+    assert (version.path / "content" / "fonts" / "arial.ttf").read_bytes() == b"font"
+    assert (version.path / "content" / "fonts" / "empty.txt").read_bytes() == b""
+    assert (version.path / "RobloxPlayerLauncher.exe").read_bytes() == b"launcher"
+    assert not (version.path / "unknown.txt").exists()
+    assert (version.path / "AppSettings.xml").exists()
+    # the thread pool the installer created for itself was shut down when it exited
+    assert installer.executor is None
+
+
+def test_install_over_partial_install(monkeypatch, tmp_path):
+    # an install that was interrupted left a truncated file behind
+    path = tmp_path / "version"
+    path.mkdir()
+    (path / "RobloxStudioBeta.exe").write_bytes(b"trunc")
+
+    packages = {"RobloxStudio.zip": make_zip({"RobloxStudioBeta.exe": b"complete binary"})}
+    _, version = install(monkeypatch, packages, path)
+    assert (version.path / "RobloxStudioBeta.exe").read_bytes() == b"complete binary"
+
+
+@pytest.mark.parametrize("name", ["../outside.txt", "nested/../../outside.txt"])
+def test_install_rejects_members_outside_folder(monkeypatch, tmp_path, name):
+    packages = {"RobloxStudio.zip": make_zip({"inside.txt": b"fine", name: b"evil"})}
+    with pytest.raises(BadZipFile, match="outside of the extraction folder"):
+        install(monkeypatch, packages, tmp_path / "version")
+    assert not (tmp_path / "outside.txt").exists()
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_install_rejects_bad_crc(monkeypatch, tmp_path, streamed):
+    zip_data = bytearray(make_zip({"RobloxStudioBeta.exe": b"binary data"}, streamed=streamed))
+    if streamed:
+        # the CRC is in the data descriptor after the member's data, which follows its signature
+        crc_offset = zip_data.index(struct.pack("<I", 0x08074b50)) + 4
+    else:
+        crc_offset = 14
+    zip_data[crc_offset:crc_offset + 4] = struct.pack("<I", 0x12345678)
+
+    with pytest.raises(BadZipFile, match="Bad CRC-32"):
+        install(monkeypatch, {"RobloxStudio.zip": bytes(zip_data)}, tmp_path / "version")
+
+
+def test_install_keeps_executor_passed_in(monkeypatch, tmp_path):
+    packages = {"RobloxStudio.zip": make_zip({"RobloxStudioBeta.exe": b"binary"})}
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        installer, _ = install(monkeypatch, packages, tmp_path / "version", executor=executor)
+        assert installer.executor is executor
+        # still usable
+        assert executor.submit(lambda: 1).result() == 1
+
+
+def test_install_writes_raw_packages_off_the_event_loop(monkeypatch, tmp_path):
+    launcher_data = bytes(range(256)) * 20
+    write_threads = set()
+    write_chunk = install_module._write_chunk
+
+    def recording_write_chunk(file, md5, chunk):
+        write_threads.add(threading.current_thread())
+        write_chunk(file, md5, chunk)
+
+    monkeypatch.setattr(install_module, "_write_chunk", recording_write_chunk)
+    _, version = install(monkeypatch, {"RobloxPlayerLauncher.exe": launcher_data}, tmp_path / "version")
+
+    assert (version.path / "RobloxPlayerLauncher.exe").read_bytes() == launcher_data
+    assert write_threads and threading.main_thread() not in write_threads
@@ -0,0 +1,38 @@
+from roblox_studio import StudioClient
+from roblox_studio.environments import Version, VersionType
+
+
+def install_version(client: StudioClient, version_hash: str) -> Version:
+    version = Version(path=client.versions_folder_path / version_hash, version_type=VersionType.windows)
+    version.path.mkdir(parents=True)
+    version.binary_file_path.write_bytes(b"binary")
+    return version
+
+
+def test_installed_versions_are_reused(tmp_path):
+    client = StudioClient(tmp_path)
+    install_version(client, "version-0123456789abcdef")
+
+    first_versions = client.get_installed_versions(version_type=VersionType.windows)
+    assert [installed_version.version_hash for installed_version in first_versions] == ["version-0123456789abcdef"]
+
+    # unchanged versions keep their metadata objects between calls, without a cache file
+    install_version(client, "version-fedcba9876543210")
+    second_versions = client.get_installed_versions(version_type=VersionType.windows)
+    assert [installed_version.version_hash for installed_version in second_versions] == [
+        "version-0123456789abcdef",
+        "version-fedcba9876543210"
+    ]
+    assert second_versions[0] is first_versions[0]
+
+
+def test_installed_versions_with_other_arguments(tmp_path):
+    client = StudioClient(tmp_path)
+    install_version(client, "version-0123456789abcdef")
+
+    versions = client.get_installed_versions(version_type=VersionType.windows)
+    cache_path = tmp_path / "inventory.json"
+    cached_versions = client.get_installed_versions(cache_path=cache_path, version_type=VersionType.windows)
+    assert cache_path.exists()
+    assert cached_versions[0] is not versions[0]
+    assert cached_versions[0].version_hash == versions[0].version_hash
@@ -0,0 +1,60 @@
+import os
+
+from roblox_studio.logs import LogTailer
+
+
+def make_log_line(second: int, message: str) -> str:
+    return f"2023-05-01T12:34:{second:02}.789Z,{second}.5,1a2b,6 [FLog::Output] {message}\n"
+
+
+def write_log(path, lines, mode="w"):
+    with open(path, mode) as log_file:
+        log_file.write("".join(lines))
+
+
+def poll_messages(tailer: LogTailer):
+    return [record.message for record in tailer.poll()]
+
+
+def test_tailer_reads_appended_records(tmp_path):
+    log_path = tmp_path / "studio.log"
+    write_log(log_path, [make_log_line(1, "one"), make_log_line(2, "two")])
+    tailer = LogTailer(tmp_path)
+
+    # the last record is held back until the file stops growing
+    assert poll_messages(tailer) == ["one"]
+    assert poll_messages(tailer) == ["two"]
+
+    write_log(log_path, [make_log_line(3, "three"), "continued\n", make_log_line(4, "four")], mode="a")
+    assert poll_messages(tailer) == ["three\ncontinued"]
+    assert poll_messages(tailer) == ["four"]
+    assert poll_messages(tailer) == []
+
+
+def test_tailer_ignores_touched_files(tmp_path):
+    log_path = tmp_path / "studio.log"
+    write_log(log_path, [make_log_line(1, "one"), make_log_line(2, "two")])
+    tailer = LogTailer(tmp_path)
+    assert poll_messages(tailer) + poll_messages(tailer) == ["one", "two"]
+
+    stat = os.stat(log_path)
+    os.utime(log_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert poll_messages(tailer) == []
+
+    write_log(log_path, [make_log_line(3, "three")], mode="a")
+    assert poll_messages(tailer) + poll_messages(tailer) == ["three"]
+
+
+def test_tailer_rereads_rewritten_files(tmp_path):
+    log_path = tmp_path / "studio.log"
+    write_log(log_path, [make_log_line(1, "one"), make_log_line(2, "two")])
+    tailer = LogTailer(tmp_path)
+    assert poll_messages(tailer) + poll_messages(tailer) == ["one", "two"]
+
+    # truncated and rewritten with less data
+    write_log(log_path, [make_log_line(5, "new")])
+    assert poll_messages(tailer) + poll_messages(tailer) == ["new"]
+
+    # truncated and rewritten with more data, without a line ending where reading stopped
+    write_log(log_path, [make_log_line(6, "rewritten with a much longer message"), make_log_line(7, "more")])
+    assert poll_messages(tailer) + poll_messages(tailer) == ["rewritten with a much longer message", "more"]
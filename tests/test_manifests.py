@@ -0,0 +1,115 @@
+import hashlib
+import os
+
+from roblox_studio import manifests
+from roblox_studio.manifests import FileHashCache, FileManifest, build_file_manifest, diff_file_manifests, hash_file
+
+
+def write_files(root, files: dict):
+    for relative_path, data in files.items():
+        path = root / relative_path
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_bytes(data)
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_hash_file(tmp_path):
+    small_path = tmp_path / "small.bin"
+    small_path.write_bytes(b"small file")
+    large_data = bytes(range(256)) * (manifests._mmap_threshold // 256 + 1)
+    large_path = tmp_path / "large.bin"
+    large_path.write_bytes(large_data)
+
+    assert hash_file(str(small_path)) == hashlib.sha256(b"small file").hexdigest()
+    assert hash_file(str(large_path)) == hashlib.sha256(large_data).hexdigest()
+
+
+def test_hash_file_with_stale_size(tmp_path):
+    # the file was emptied after its size was taken
+    path = tmp_path / "emptied.bin"
+    path.write_bytes(b"")
+    assert hash_file(str(path), size=manifests._mmap_threshold * 2) == hashlib.sha256(b"").hexdigest()
+
+    path.write_bytes(b"shrunk")
+    assert hash_file(str(path), size=manifests._mmap_threshold * 2) == hashlib.sha256(b"shrunk").hexdigest()
+
+
+def test_build_file_manifest(tmp_path):
+    write_files(tmp_path, {
+        "content/textures/face.png": b"face",
+        "content/sounds/click.ogg": b"click",
+        "PlatformContent/pc/fonts/arial.ttf": b"arial",
+        "ignored.txt": b"not in a manifest folder"
+    })
+
+    # overlapping and missing folders are fine
+    manifest = build_file_manifest(
+        root=tmp_path,
+        folders=[
+            tmp_path / "content",
+            tmp_path / "PlatformContent",
+            tmp_path / "PlatformContent" / "pc",
+            tmp_path / "missing"
+        ],
+        max_workers=2
+    )
+    assert {path: entry.sha256 for path, entry in manifest.entries.items()} == {
+        "PlatformContent/pc/fonts/arial.ttf": sha256(b"arial"),
+        "content/sounds/click.ogg": sha256(b"click"),
+        "content/textures/face.png": sha256(b"face")
+    }
+    assert list(manifest.entries) == sorted(manifest.entries)
+    assert manifest.entries["content/sounds/click.ogg"].size == 5
+
+    manifest_path = tmp_path / "manifests" / "manifest.json"
+    manifest.save(manifest_path)
+    loaded_manifest = FileManifest.load(manifest_path)
+    assert {path: entry.sha256 for path, entry in loaded_manifest.entries.items()} == {
+        path: entry.sha256 for path, entry in manifest.entries.items()
+    }
+
+
+def test_build_file_manifest_reuses_cached_hashes(tmp_path, monkeypatch):
+    write_files(tmp_path, {"content/a.bin": b"a", "content/b.bin": b"b"})
+    cache_path = tmp_path / "hashes.json"
+    build_file_manifest(tmp_path, [tmp_path / "content"], hash_cache=FileHashCache(cache_path))
+
+    hashed_paths = []
+
+    def counting_hash_file(path, size=None):
+        hashed_paths.append(os.path.basename(path))
+        return hash_file(path, size)
+
+    monkeypatch.setattr(manifests, "hash_file", counting_hash_file)
+    write_files(tmp_path, {"content/b.bin": b"changed"})
+    manifest = build_file_manifest(tmp_path, [tmp_path / "content"], hash_cache=FileHashCache(cache_path))
+
+    assert hashed_paths == ["b.bin"]
+    assert manifest.entries["content/b.bin"].sha256 == sha256(b"changed")
+
+
+def test_diff_file_manifests(tmp_path):
+    old_root = tmp_path / "old"
+    new_root = tmp_path / "new"
+    write_files(old_root, {"content/kept": b"kept", "content/modified": b"old", "content/removed": b"removed"})
+    write_files(new_root, {"content/kept": b"kept", "content/modified": b"new", "content/added": b"added"})
+    old_manifest = build_file_manifest(old_root, [old_root / "content"])
+    new_manifest = build_file_manifest(new_root, [new_root / "content"])
+
+    changes = diff_file_manifests(old_manifest, new_manifest)
+    assert [(change.change_type.value, change.path) for change in changes] == [
+        ("added", "content/added"),
+        ("changed", "content/modified"),
+        ("removed", "content/removed")
+    ]
+    assert (changes[0].old, changes[0].new.sha256) == (None, sha256(b"added"))
+    assert (changes[1].old.sha256, changes[1].new.sha256) == (sha256(b"old"), sha256(b"new"))
+    assert (changes[2].old.sha256, changes[2].new) == (sha256(b"removed"), None)
+
+    # touching a file without changing its contents isn't a change
+    stat = os.stat(new_root / "content" / "kept")
+    os.utime(new_root / "content" / "kept", ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert diff_file_manifests(new_manifest, build_file_manifest(new_root, [new_root / "content"])) == []
@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import itertools
+import os
+from datetime import datetime
+
+from roblox_studio import package_store
+from roblox_studio.branches import RobloxBranch, roblox_branch_to_url
+from roblox_studio.deployments import Deployment, DeploymentClient, DeploymentType, OperatingSystem
+from roblox_studio.downloads import PackageDownloader
+from roblox_studio.package_store import PackageStore
+
+from .fake_cdn import FakeCDN
+
+studio_data = bytes(range(256)) * 40
+fonts_data = b"fonts" * 1000
+sounds_data = b"sounds" * 2000
+
+versions = {
+    "version-0000000000000001": {"RobloxStudio.zip": studio_data, "content-fonts.zip": fonts_data},
+    # the same fonts under another name, and new sounds
+    "version-0000000000000002": {"content-fonts-copy.zip": fonts_data, "content-sounds.zip": sounds_data}
+}
+
+
+def md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+def run_with_store(monkeypatch, test):
+    # each use of the store is a second later than the last
+    clock = itertools.count(1)
+    monkeypatch.setattr(package_store.time, "time", lambda: next(clock))
+
+    async def main():
+        async with FakeCDN() as cdn:
+            monkeypatch.setitem(roblox_branch_to_url, RobloxBranch.production, cdn.url)
+            for version_hash, packages in versions.items():
+                cdn.add_packages(version_hash, packages)
+            async with DeploymentClient() as client:
+                async def get_packages(version_hash):
+                    deployment = Deployment.from_fields(
+                        client=client,
+                        branch=RobloxBranch.production,
+                        operating_system=OperatingSystem.windows,
+                        deployment_type=DeploymentType.studio_64,
+                        version_hash=version_hash,
+                        timestamp=datetime(2023, 1, 1)
+                    )
+                    return (await deployment.get_packages()).packages
+
+                return await test(cdn, PackageDownloader(client), get_packages)
+
+    return asyncio.run(main())
+
+
+def get_package_downloads(cdn: FakeCDN):
+    return sorted(
+        request.match_info["path"]
+        for request in cdn.requests
+        if not request.match_info["path"].endswith("rbxPkgManifest.txt")
+    )
+
+
+def test_store_keeps_one_copy_of_shared_packages(monkeypatch, tmp_path):
+    store = PackageStore(tmp_path / "store")
+
+    async def test(cdn, downloader, get_packages):
+        first_paths = await store.fetch_packages(downloader, await get_packages("version-0000000000000001"))
+        second_paths = await store.fetch_packages(downloader, await get_packages("version-0000000000000002"))
+
+        assert first_paths["content-fonts.zip"] == second_paths["content-fonts-copy.zip"] == store.get_blob_path(
+            md5(fonts_data)
+        )
+        assert get_package_downloads(cdn) == [
+            "version-0000000000000001-RobloxStudio.zip",
+            "version-0000000000000001-content-fonts.zip",
+            "version-0000000000000002-content-sounds.zip"
+        ]
+
+    run_with_store(monkeypatch, test)
+
+    blobs = [name for _, _, names in os.walk(tmp_path / "store" / "blobs") for name in names]
+    assert sorted(blobs) == sorted([md5(studio_data), md5(fonts_data), md5(sounds_data)])
+    assert store.get_size() == len(studio_data) + len(fonts_data) + len(sounds_data)
+    assert not os.listdir(tmp_path / "store" / "staging")
+
+
+def test_store_links_packages_into_folders(monkeypatch, tmp_path):
+    store = PackageStore(tmp_path / "store")
+
+    async def test(cdn, downloader, get_packages):
+        packages = await get_packages("version-0000000000000001")
+        await store.fetch_packages(downloader, packages)
+        first_paths = store.link_packages(packages, tmp_path / "first")
+        second_paths = store.link_packages(packages, tmp_path / "second")
+        return packages, first_paths, second_paths
+
+    packages, first_paths, second_paths = run_with_store(monkeypatch, test)
+
+    for package in packages:
+        blob_stat = os.stat(store.get_blob_path(package.md5))
+        for paths in (first_paths, second_paths):
+            assert os.path.samestat(os.stat(paths[package.name]), blob_stat)
+        assert blob_stat.st_nlink == 3
+    with open(first_paths["content-fonts.zip"], "rb") as package_file:
+        assert package_file.read() == fonts_data
+
+
+def test_store_evicts_least_recently_used_packages(monkeypatch, tmp_path):
+    store = PackageStore(tmp_path / "store")
+
+    async def test(cdn, downloader, get_packages):
+        first_packages = await get_packages("version-0000000000000001")
+        second_packages = await get_packages("version-0000000000000002")
+        await store.fetch_packages(downloader, first_packages)
+        await store.fetch_packages(downloader, second_packages)
+        # from least to most recently used: fonts, studio, sounds
+        store.link_packages([package for package in first_packages if package.name == "RobloxStudio.zip"], tmp_path)
+        store.link_packages([package for package in second_packages if package.name == "content-sounds.zip"], tmp_path)
+
+        assert store.evict() == []
+        assert store.evict(max_size=len(studio_data) + len(sounds_data)) == [md5(fonts_data)]
+        assert store.evict(max_size=len(sounds_data) + 1) == [md5(studio_data)]
+        assert store.get_size() == len(sounds_data)
+        assert store.evict(max_size=0, keep=[md5(sounds_data)]) == []
+
+        # packages being fetched are kept even when they don't fit on their own
+        store.max_size = 1
+        await store.fetch_packages(downloader, first_packages)
+        assert get_package_downloads(cdn).count("version-0000000000000001-content-fonts.zip") == 2
+
+    run_with_store(monkeypatch, test)
+
+    assert store.get_blob_path(md5(studio_data)).exists()
+    assert store.get_blob_path(md5(fonts_data)).exists()
+    assert not store.get_blob_path(md5(sounds_data)).exists()
+    # the index is saved, so it survives reopening the store
+    assert PackageStore(tmp_path / "store").get_size() == len(studio_data) + len(fonts_data)
@@ -0,0 +1,130 @@
+import asyncio
+import signal
+import sys
+import time
+
+import pytest
+
+from roblox_studio import processes
+from roblox_studio.processes import OutputStream, StudioProcessManager
+
+from .fake_studio import create_fake_version, get_counts
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the Studio stand-in is a script with a shebang")
+
+
+def test_output_is_streamed(tmp_path):
+    version = create_fake_version(tmp_path / "version", "output", lines=["one", "two"])
+    callback_lines = []
+
+    async def main():
+        async with StudioProcessManager(output_callback=lambda process, line: callback_lines.append(line)) as manager:
+            process = await manager.launch(version)
+            iterated_lines = [line async for line in process.iter_output()]
+            return process, iterated_lines, await process.wait()
+
+    process, iterated_lines, return_code = asyncio.run(main())
+
+    assert return_code == 0
+    assert not process.is_running
+    assert sorted(line.text for line in callback_lines) == ["error: one", "error: two", "one", "two"]
+    assert [line.text for line in callback_lines if line.stream == OutputStream.stdout] == ["one", "two"]
+    assert {line.text for line in iterated_lines} <= {line.text for line in callback_lines}
+
+
+def test_overlong_lines_are_dropped_whole(tmp_path, monkeypatch):
+    monkeypatch.setattr(processes, "_line_limit", 1024)
+    version = create_fake_version(
+        tmp_path / "version",
+        "output",
+        lines=["one", "x" * 5000],
+        # the limit is reached before the line's newline arrives
+        parts=["y" * 2000, "y" * 10 + "\ntwo\n"]
+    )
+
+    async def main():
+        async with StudioProcessManager() as manager:
+            process = await manager.launch(version)
+            return [line async for line in process.iter_output()]
+
+    lines = asyncio.run(main())
+    assert [line.text for line in lines if line.stream == OutputStream.stdout] == ["one", "two"]
+    assert [line.text for line in lines if line.stream == OutputStream.stderr] == ["error: one"]
+
+
+def test_timeout_stops_process(tmp_path):
+    version = create_fake_version(tmp_path / "version", "hang")
+
+    async def main():
+        async with StudioProcessManager(timeout=0.5, grace_period=5) as manager:
+            process = await manager.launch(version)
+            return process, await process.wait(timeout=30)
+
+    start = time.monotonic()
+    process, return_code = asyncio.run(main())
+
+    assert return_code == -signal.SIGTERM
+    assert 0.5 <= process.run_time < 10
+    assert time.monotonic() - start < 10
+
+
+def test_max_processes_limit(tmp_path):
+    state_folder = tmp_path / "state"
+    state_folder.mkdir()
+    versions = [
+        create_fake_version(tmp_path / f"version{index}", "output", delay=0.3, state_folder=str(state_folder))
+        for index in range(5)
+    ]
+
+    # the manager is created outside of the loop it's used in
+    process_manager = StudioProcessManager(max_processes=2)
+
+    async def main():
+        async with process_manager as manager:
+            processes = await asyncio.gather(*[manager.launch(version) for version in versions])
+            assert len(manager.running_processes) <= 2
+            return processes, await manager.wait_all()
+
+    processes, return_codes = asyncio.run(main())
+
+    assert return_codes == [0] * 5
+    counts = get_counts(state_folder)
+    assert len(counts) == 5
+    assert max(counts) <= 2
+
+
+def test_stop_kills_process_that_ignores_terminate(tmp_path):
+    version = create_fake_version(tmp_path / "version", "stubborn")
+
+    async def main():
+        ready = asyncio.Event()
+
+        def on_output(process, line):
+            if line.text == "ready":
+                ready.set()
+
+        async with StudioProcessManager(output_callback=on_output) as manager:
+            process = await manager.launch(version)
+            await asyncio.wait_for(ready.wait(), 30)
+            start = time.monotonic()
+            return_code = await process.stop(grace_period=0.5)
+            return return_code, time.monotonic() - start
+
+    return_code, stop_time = asyncio.run(main())
+
+    assert return_code == -signal.SIGKILL
+    assert 0.5 <= stop_time < 10
+
+
+def test_exiting_manager_stops_running_processes(tmp_path):
+    version = create_fake_version(tmp_path / "version", "hang")
+
+    async def main():
+        async with StudioProcessManager(grace_period=5) as manager:
+            process = await manager.launch(version)
+        return process
+
+    process = asyncio.run(main())
+
+    assert not process.is_running
+    assert process.return_code == -signal.SIGTERM
@@ -0,0 +1,125 @@
+import os
+import struct
+
+import orjson
+import pytest
+
+from roblox_studio import rbxm
+from roblox_studio.rbxm import ChunkCompression, RbxmFormatError, RbxmIndex, read_rbxm_info
+
+binary_magic = b"<roblox!\x89\xff\r\n\x1a\n"
+
+
+def make_chunk(name: bytes, data: bytes, compressed: bool = False) -> bytes:
+    size = len(data) * 2 if compressed else len(data)
+    return struct.pack("<4sII4x", name, len(data) if compressed else 0, size) + data
+
+
+def make_rbxm(instance_count: int = 2) -> bytes:
+    return b"".join([
+        struct.pack("<14sHii8x", binary_magic, 0, 1, instance_count),
+        make_chunk(b"META", b"meta"),
+        make_chunk(b"INST", b"\x00" * 20, compressed=True),
+        make_chunk(b"PROP", b"\x28\xb5\x2f\xfd" + b"\x00" * 10, compressed=True),
+        make_chunk(b"PROP", b"\x00" * 6),
+        make_chunk(b"END\x00", b"</roblox>")
+    ])
+
+
+def write_file(path, data: bytes):
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def test_read_rbxm_info(tmp_path):
+    path = tmp_path / "Plugin.rbxm"
+    write_file(path, make_rbxm(instance_count=5))
+
+    info = read_rbxm_info(path)
+    assert info.is_binary
+    assert (info.class_count, info.instance_count) == (1, 5)
+    assert [(chunk.name, chunk.compression) for chunk in info.chunks] == [
+        ("META", ChunkCompression.none),
+        ("INST", ChunkCompression.lz4),
+        ("PROP", ChunkCompression.zstd),
+        ("PROP", ChunkCompression.none),
+        ("END", ChunkCompression.none)
+    ]
+    assert info.get_chunk_counts() == {"META": 1, "INST": 1, "PROP": 2, "END": 1}
+    assert info.get_chunk_sizes()["PROP"] == 14 * 2 + 6
+
+    xml_path = tmp_path / "Plugin.rbxmx"
+    write_file(xml_path, b"<roblox version=\"4\"></roblox>")
+    assert not read_rbxm_info(xml_path).is_binary
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not a model file, but long enough to have a header",
+    make_rbxm()[:-20],
+    make_rbxm()[:-len(make_chunk(b"END\x00", b"</roblox>"))]
+])
+def test_read_rbxm_info_rejects_invalid_files(tmp_path, data):
+    path = tmp_path / "Plugin.rbxm"
+    write_file(path, data)
+    with pytest.raises(RbxmFormatError) as exception_info:
+        read_rbxm_info(path)
+    assert exception_info.value.path == path
+
+
+def test_scan_saves_cache_when_a_file_is_invalid(tmp_path):
+    folder = tmp_path / "plugins"
+    folder.mkdir()
+    write_file(folder / "A.rbxm", make_rbxm(instance_count=1))
+    write_file(folder / "B.rbxm", b"broken")
+    write_file(folder / "C.rbxm", make_rbxm(instance_count=3))
+    cache_path = tmp_path / "cache" / "plugins.json"
+
+    with pytest.raises(RbxmFormatError):
+        RbxmIndex(cache_path).scan([folder])
+    # the file read before the invalid one was still saved
+    with open(cache_path, "rb") as cache_file:
+        assert len(orjson.loads(cache_file.read())["files"]) == 1
+
+    results = RbxmIndex(cache_path).scan([tmp_path / "missing", folder], return_exceptions=True)
+    assert [result.path.name for result in results] == ["A.rbxm", "B.rbxm", "C.rbxm"]
+    assert isinstance(results[1], RbxmFormatError)
+    assert [results[0].instance_count, results[2].instance_count] == [1, 3]
+    with open(cache_path, "rb") as cache_file:
+        assert len(orjson.loads(cache_file.read())["files"]) == 2
+
+
+def test_index_only_reads_changed_files(tmp_path, monkeypatch):
+    folder = tmp_path / "plugins"
+    folder.mkdir()
+    write_file(folder / "A.rbxm", make_rbxm(instance_count=1))
+    write_file(folder / "B.rbxm", make_rbxm(instance_count=2))
+    cache_path = tmp_path / "plugins.json"
+
+    read_paths = []
+
+    def counting_read_rbxm_info(path):
+        read_paths.append(path.name)
+        return read_rbxm_info(path)
+
+    monkeypatch.setattr(rbxm, "read_rbxm_info", counting_read_rbxm_info)
+
+    RbxmIndex(cache_path).scan([folder])
+    assert read_paths == ["A.rbxm", "B.rbxm"]
+
+    # a new index with the same cache file reads nothing
+    read_paths.clear()
+    assert [info.instance_count for info in RbxmIndex(cache_path).scan([folder])] == [1, 2]
+    assert read_paths == []
+
+    # a file replaced with one of the same size and modification time is a different file
+    stat = os.stat(folder / "B.rbxm")
+    write_file(tmp_path / "B.rbxm", make_rbxm(instance_count=7))
+    os.replace(tmp_path / "B.rbxm", folder / "B.rbxm")
+    os.utime(folder / "B.rbxm", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    # and so is an identical copy at another path
+    write_file(folder / "C.rbxm", make_rbxm(instance_count=1))
+    os.utime(folder / "C.rbxm", ns=(stat.st_atime_ns, os.stat(folder / "A.rbxm").st_mtime_ns))
+
+    assert [info.instance_count for info in RbxmIndex(cache_path).scan([folder])] == [1, 7, 1]
+    assert read_paths == ["B.rbxm", "C.rbxm"]